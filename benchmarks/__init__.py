@@ -0,0 +1,4 @@
+"""
+Stock Management System - Benchmarks
+Reproducible performance measurements, run as `python -m benchmarks.<name>`
+"""
@@ -0,0 +1,410 @@
+"""
+Forecasting Benchmark Suite
+Measures fit time, predict time per horizon, peak memory and holdout accuracy
+of every forecasting model on seeded synthetic demand, and flags regressions
+against a stored baseline
+
+Usage (from the repository root):
+    python -m benchmarks.forecast_benchmark                        # full run
+    python -m benchmarks.forecast_benchmark --quick                # smaller grid
+    python -m benchmarks.forecast_benchmark --save-baseline        # record baseline
+    python -m benchmarks.forecast_benchmark --models xgboost,tsb   # subset
+
+Results are written as JSON (--output). When the baseline file exists, the run
+is compared against it and the exit code is 1 if anything regressed. Timings
+are hardware dependent, so record the baseline on the machine that runs the
+comparison.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.forecasting.backtest import calculate_errors
+from src.forecasting.models import IntermittentDemandModel
+from src.forecasting.selection import CANDIDATE_MODELS
+
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(BENCHMARK_DIR, 'results', 'forecast_latest.json')
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'forecast_baseline.json')
+
+SERIES_KINDS = ['seasonal', 'intermittent']
+SERIES_END = pd.Timestamp('2024-12-31')
+
+FULL_GRID = {
+    'lengths': [90, 365, 1095],
+    'horizons': [7, 30, 90],
+    'batch_sizes': [1, 10, 50],
+    'batch_length': 365,
+    'holdout': 28,
+    'repeats': 3
+}
+
+QUICK_GRID = {
+    'lengths': [90, 365],
+    'horizons': [7, 30],
+    'batch_sizes': [1, 10],
+    'batch_length': 180,
+    'holdout': 28,
+    'repeats': 1
+}
+
+# A metric regresses when it exceeds the baseline by the relative tolerance
+# AND by the absolute floor (keeps timer noise on tiny values out of reports)
+TOLERANCES = {
+    'seconds': (0.30, 0.005),
+    'peak_memory_mb': (0.20, 0.5),
+    'scaled_mae': (0.05, 0.01)
+}
+
+
+def synthetic_series(kind: str, length: int, index: int = 0, seed: int = 42) -> pd.DataFrame:
+    """
+    Generate a reproducible daily demand series
+
+    Args:
+        kind: 'seasonal' (trend, weekly and yearly cycles, Poisson noise) or
+              'intermittent' (sparse demand occurrences with gamma sizes)
+        length: Number of days, ending at SERIES_END
+        index: Series number, so batches contain distinct series
+        seed: Base random seed
+
+    Returns:
+        DataFrame with 'ds' and 'y' columns
+    """
+    rng = np.random.default_rng([seed, SERIES_KINDS.index(kind), length, index])
+    dates = pd.date_range(end=SERIES_END, periods=length, freq='D')
+    t = np.arange(length)
+
+    if kind == 'seasonal':
+        level = rng.uniform(10, 50)
+        trend = rng.uniform(-0.01, 0.03) * level * t / 30
+        weekly = 0.25 * level * np.where(dates.dayofweek >= 5, 1.0, -0.4)
+        yearly = 0.3 * level * np.sin(2 * np.pi * (dates.dayofyear.values + rng.uniform(0, 365)) / 365.25)
+        y = rng.poisson(np.maximum(level + trend + weekly + yearly, 0.1)).astype(np.float64)
+    elif kind == 'intermittent':
+        occurs = rng.random(length) < rng.uniform(0.05, 0.3)
+        y = np.where(occurs, np.ceil(rng.gamma(2.0, rng.uniform(2, 10), size=length)), 0.0)
+    else:
+        raise ValueError(f"Unknown series kind: {kind}. Choose from {SERIES_KINDS}")
+
+    return pd.DataFrame({'ds': dates, 'y': y})
+
+
+def _median(values: List[float]) -> float:
+    return round(statistics.median(values), 6)
+
+
+def _dependency_versions() -> Dict[str, Optional[str]]:
+    versions = {'numpy': np.__version__, 'pandas': pd.__version__}
+    for module in ('xgboost', 'prophet', 'sklearn'):
+        try:
+            versions[module] = __import__(module).__version__
+        except ImportError:
+            versions[module] = None
+    return versions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARK_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark_model(name: str,
+                    model_class: Callable,
+                    kind: str,
+                    length: int,
+                    horizons: List[int],
+                    holdout: int,
+                    repeats: int,
+                    seed: int) -> Dict:
+    """
+    Benchmark one model on one series
+
+    The model is fitted on the first `length` days; the following `holdout`
+    days are hidden and used for accuracy. Timings are medians over `repeats`
+    fresh fits, after one untimed warm-up fit (lazy imports, native library
+    initialization). Peak memory is measured in a separate traced run
+    (tracemalloc sees Python and NumPy allocations, not memory held inside
+    native libraries).
+    """
+    series = synthetic_series(kind, length + holdout, seed=seed)
+    train, actual = series.iloc[:length], series['y'].values[length:]
+
+    model_class().fit(train)
+
+    fit_times, predict_times = [], {h: [] for h in horizons}
+    model = None
+    for _ in range(repeats):
+        model = model_class()
+        start = time.perf_counter()
+        model.fit(train)
+        fit_times.append(time.perf_counter() - start)
+
+        for horizon in horizons:
+            start = time.perf_counter()
+            model.predict(horizon)
+            predict_times[horizon].append(time.perf_counter() - start)
+
+    errors = calculate_errors(actual, model.predict(holdout)['forecast'].values)
+    train_scale = max(float(np.mean(np.abs(train['y'].values))), 1e-9)
+
+    tracemalloc.start()
+    try:
+        traced = model_class()
+        traced.fit(train)
+        traced.predict(max(horizons))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    result = {
+        'model': name,
+        'kind': kind,
+        'length': length,
+        'fit_seconds': _median(fit_times),
+        'predict_seconds': {str(h): _median(times) for h, times in predict_times.items()},
+        'peak_memory_mb': round(peak / 1024 / 1024, 3),
+        'mae': errors['mae'],
+        'rmse': errors['rmse'],
+        'scaled_mae': round(errors['mae'] / train_scale, 4)
+    }
+    if hasattr(model, 'available_models'):
+        result['members'] = list(model.available_models)
+    return result
+
+
+def benchmark_batch(name: str,
+                    model_class: Callable,
+                    kind: str,
+                    batch_size: int,
+                    length: int,
+                    horizon: int,
+                    seed: int) -> Dict:
+    """
+    Time fitting and forecasting `batch_size` distinct series
+
+    Intermittent-demand models use their vectorized fit_many() path; other
+    models are fitted one series at a time.
+    """
+    series = {i: synthetic_series(kind, length, index=i, seed=seed) for i in range(batch_size)}
+
+    start = time.perf_counter()
+    if issubclass(model_class, IntermittentDemandModel):
+        mode = 'fit_many'
+        models = model_class.fit_many(series)
+    else:
+        mode = 'loop'
+        models = {}
+        for key, df in series.items():
+            models[key] = model_class()
+            models[key].fit(df)
+    for model in models.values():
+        model.predict(horizon)
+    seconds = time.perf_counter() - start
+
+    return {
+        'model': name,
+        'kind': kind,
+        'batch_size': batch_size,
+        'length': length,
+        'horizon': horizon,
+        'mode': mode,
+        'seconds': round(seconds, 6),
+        'series_per_second': round(batch_size / seconds, 2) if seconds > 0 else None
+    }
+
+
+def run_benchmarks(models: List[str], grid: Dict, seed: int = 42) -> Dict:
+    """
+    Run the benchmark grid
+
+    Models whose optional dependency is missing are listed under 'skipped'
+    instead of failing the run.
+
+    Returns:
+        {'meta', 'results', 'batch', 'skipped'}
+    """
+    results, batch, skipped = [], [], {}
+
+    for name in models:
+        model_class = CANDIDATE_MODELS[name]
+        print(f"⏱️ Benchmarking {name}...")
+        try:
+            for kind in SERIES_KINDS:
+                for length in grid['lengths']:
+                    result = benchmark_model(name, model_class, kind, length, grid['horizons'],
+                                             grid['holdout'], grid['repeats'], seed)
+                    results.append(result)
+                    print(f"  ✓ {kind:<12} n={length:<5} fit {result['fit_seconds']:.4f}s  "
+                          f"peak {result['peak_memory_mb']:.1f} MB  scaled MAE {result['scaled_mae']:.3f}")
+
+                for batch_size in grid['batch_sizes']:
+                    entry = benchmark_batch(name, model_class, kind, batch_size, grid['batch_length'],
+                                            max(grid['horizons']), seed)
+                    batch.append(entry)
+                    print(f"  ✓ {kind:<12} batch={batch_size:<4} {entry['seconds']:.4f}s ({entry['mode']})")
+        except ImportError as e:
+            print(f"  ⚠ {name} skipped: {e}")
+            skipped[name] = str(e)
+            results = [r for r in results if r['model'] != name]
+            batch = [b for b in batch if b['model'] != name]
+
+    return {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'dependencies': _dependency_versions(),
+            'seed': seed,
+            'grid': grid
+        },
+        'results': results,
+        'batch': batch,
+        'skipped': skipped
+    }
+
+
+def _metrics(report: Dict) -> Dict[tuple, float]:
+    """Flatten a report into {(section, model, kind, size, metric): value}"""
+    metrics = {}
+    for r in report.get('results', []):
+        key = ('results', r['model'], r['kind'], r['length'])
+        metrics[key + ('fit_seconds',)] = r['fit_seconds']
+        for horizon, seconds in r['predict_seconds'].items():
+            metrics[key + (f'predict_seconds[{horizon}]',)] = seconds
+        metrics[key + ('peak_memory_mb',)] = r['peak_memory_mb']
+        metrics[key + ('scaled_mae',)] = r['scaled_mae']
+    for b in report.get('batch', []):
+        metrics[('batch', b['model'], b['kind'], b['batch_size'], 'seconds')] = b['seconds']
+    return metrics
+
+
+def _tolerance(metric: str, tolerances: Dict) -> tuple:
+    if 'seconds' in metric:
+        return tolerances['seconds']
+    return tolerances[metric]
+
+
+def compare_to_baseline(report: Dict, baseline: Dict, tolerances: Optional[Dict] = None) -> Dict:
+    """
+    Compare a report with a baseline report
+
+    Only measurements present in both are compared; all metrics are
+    lower-is-better.
+
+    Returns:
+        {'compared', 'missing', 'regressions': [...], 'improvements': [...]}
+    """
+    tolerances = tolerances or TOLERANCES
+    current, reference = _metrics(report), _metrics(baseline)
+    regressions, improvements = [], []
+
+    for key in sorted(set(current) & set(reference), key=str):
+        value, base = current[key], reference[key]
+        relative, absolute = _tolerance(key[-1], tolerances)
+        change = {
+            'section': key[0], 'model': key[1], 'kind': key[2], 'size': key[3], 'metric': key[4],
+            'baseline': base, 'current': value,
+            'ratio': round(value / base, 3) if base else None
+        }
+        if value > base * (1 + relative) and value - base > absolute:
+            regressions.append(change)
+        elif value < base * (1 - relative) and base - value > absolute:
+            improvements.append(change)
+
+    return {
+        'compared': len(set(current) & set(reference)),
+        'missing': len(set(reference) - set(current)),
+        'regressions': regressions,
+        'improvements': improvements
+    }
+
+
+def _write_json(path: str, payload: Dict) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+
+
+def _parse_ints(value: str) -> List[int]:
+    return [int(v) for v in value.split(',') if v]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark forecasting models on synthetic demand')
+    parser.add_argument('--models', default=','.join(CANDIDATE_MODELS),
+                        help=f"Comma-separated models (default: all of {','.join(CANDIDATE_MODELS)})")
+    parser.add_argument('--quick', action='store_true', help='Use the smaller grid')
+    parser.add_argument('--lengths', type=_parse_ints, help='Series lengths in days, e.g. 90,365')
+    parser.add_argument('--horizons', type=_parse_ints, help='Forecast horizons in days, e.g. 7,30')
+    parser.add_argument('--batch-sizes', type=_parse_ints, help='Series per batch, e.g. 1,10,50')
+    parser.add_argument('--repeats', type=int, help='Timed repetitions per measurement')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for synthetic series')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Results JSON path')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the baseline')
+    args = parser.parse_args(argv)
+
+    models = [m.strip() for m in args.models.split(',') if m.strip()]
+    unknown = [m for m in models if m not in CANDIDATE_MODELS]
+    if unknown:
+        parser.error(f"Unknown models: {unknown}. Choose from {list(CANDIDATE_MODELS)}")
+
+    grid = dict(QUICK_GRID if args.quick else FULL_GRID)
+    for option in ('lengths', 'horizons', 'batch_sizes', 'repeats'):
+        if getattr(args, option) is not None:
+            grid[option] = getattr(args, option)
+
+    report = run_benchmarks(models, grid, seed=args.seed)
+    _write_json(args.output, report)
+    print(f"✅ Results written to {args.output}")
+
+    if args.save_baseline:
+        _write_json(args.baseline, report)
+        print(f"✅ Baseline stored at {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"ℹ️ No baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+
+    with open(args.baseline) as f:
+        comparison = compare_to_baseline(report, json.load(f))
+    report['comparison'] = comparison
+    _write_json(args.output, report)
+
+    print(f"📊 Compared {comparison['compared']} measurements with the baseline "
+          f"({comparison['missing']} baseline measurements not run)")
+    for marker, changes in (('↓', comparison['improvements']), ('❌', comparison['regressions'])):
+        for change in changes:
+            size = f"batch={change['size']}" if change['section'] == 'batch' else f"n={change['size']}"
+            print(f"  {marker} {change['model']} {change['kind']} {size} "
+                  f"{change['metric']}: {change['baseline']} → {change['current']}")
+
+    if comparison['regressions']:
+        print(f"❌ {len(comparison['regressions'])} regression(s) beyond tolerance")
+        return 1
+    print("✅ No regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
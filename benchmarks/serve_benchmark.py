@@ -0,0 +1,261 @@
+"""
+Serving Benchmark
+Compares request throughput and latency of the Flask development server and
+the gunicorn entry point (src.api.serve) under concurrent keep-alive clients,
+with the data API fed seeded synthetic stock instead of the database
+
+Usage (from the repository root):
+    python -m benchmarks.serve_benchmark                              # dev vs prod
+    python -m benchmarks.serve_benchmark --modes prod --workers 4     # prod only
+    python -m benchmarks.serve_benchmark --concurrency 64 --duration 20
+
+Results are written as JSON (--output). The load generator runs on the same
+machine as the server, so compare modes within one run and record cpu_count
+with the numbers; on a single core the servers and the clients share it.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARK_DIR)
+DEFAULT_OUTPUT = os.path.join(BENCHMARK_DIR, 'results', 'serve_latest.json')
+
+DEFAULT_PATHS = ['/api/health', '/api/views/overview', '/api/views/kpis',
+                 '/api/stock?limit=50&sort=-Total_Value', '/api/stock?q=prod 1&limit=50']
+MODES = ['dev', 'prod']
+
+
+def synthetic_stock(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Stock summary frame shaped like DashboardDataAPI.get_stock_summary()"""
+    rng = np.random.default_rng(seed)
+    quantity = rng.integers(0, 500, rows)
+    unit_price = np.round(rng.gamma(2.0, 15.0, rows), 2)
+    return pd.DataFrame({
+        'product_id': np.arange(rows) // 2,
+        'sku': [f"SKU{i // 2:05d}" for i in range(rows)],
+        'Product': [f"Prod {i // 2}" for i in range(rows)],
+        'Warehouse': np.where(np.arange(rows) % 2 == 0, 'WH-A', 'WH-B'),
+        'Quantity': quantity,
+        'Reserved': rng.integers(0, 20, rows),
+        'Available': quantity,
+        'Reorder_Level': 50,
+        'Unit_Price': unit_price,
+        'Selling_Price': np.round(unit_price * 1.4, 2),
+        'Total_Value': np.round(quantity * unit_price, 2),
+        'Last_Restocked': pd.Timestamp('2024-01-01') - pd.to_timedelta(rng.integers(0, 400, rows), unit='D'),
+        'Days_In_Stock': rng.integers(0, 400, rows),
+        'Stock_Status': rng.choice(['Critical', 'Low', 'Adequate', 'Overstock'], rows),
+        'Category': rng.choice(['Electronics', 'Food', 'Tools', 'Apparel'], rows),
+        'Supplier': rng.choice(['Acme', 'Globex', 'Initech'], rows)
+    })
+
+
+def synthetic_transactions(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Transaction frame shaped like DashboardDataAPI.get_transactions()"""
+    rng = np.random.default_rng(seed + 1)
+    quantity = rng.integers(1, 50, rows)
+    return pd.DataFrame({
+        'transaction_id': np.arange(rows),
+        'Type': rng.choice(['In', 'Out'], rows),
+        'Date': pd.Timestamp('2024-12-31') - pd.to_timedelta(rng.integers(0, 90 * 24, rows), unit='h'),
+        'Quantity': quantity,
+        'Product': [f"Prod {i}" for i in rng.integers(0, 500, rows)],
+        'Unit_Cost': 10.0,
+        'Total_Value': quantity * 10.0,
+        'Warehouse': rng.choice(['WH-A', 'WH-B'], rows)
+    })
+
+
+def serve(mode: str, port: int, workers: int, threads: int, rows: int) -> int:
+    """Run a server on synthetic data (the --serve child process)"""
+    from src.api.data_api import DashboardDataAPI
+    from src.api import serve as entry_point
+
+    stock, transactions = synthetic_stock(rows), synthetic_transactions(rows)
+    DashboardDataAPI.get_stock_summary = lambda self: stock.copy()
+    DashboardDataAPI.get_transactions = lambda self, days=None: transactions.copy()
+
+    argv = ['--port', str(port)]
+    if mode == 'dev':
+        argv.append('--dev')
+    else:
+        argv += ['--workers', str(workers), '--threads', str(threads)]
+    return entry_point.main(argv)
+
+
+def _wait_ready(port: int, process: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            connection.request('GET', '/api/views/overview')
+            if connection.getresponse().status == 200:
+                connection.close()
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} not ready after {timeout}s")
+
+
+def _client(port: int, paths: List[str], deadline: float, offset: int,
+            latencies: List[float], errors: List[str]) -> None:
+    """Issue requests over one keep-alive connection until the deadline"""
+    connection = None
+    index = offset
+    while time.monotonic() < deadline:
+        path = paths[index % len(paths)].replace(' ', '%20')
+        index += 1
+        started = time.perf_counter()
+        try:
+            if connection is None:
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            connection.request('GET', path, headers={'Accept-Encoding': 'gzip'})
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(f"{path}: HTTP {response.status}")
+            else:
+                latencies.append(time.perf_counter() - started)
+            if response.will_close:
+                connection.close()
+                connection = None
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(f"{path}: {type(e).__name__}")
+            if connection is not None:
+                connection.close()
+            connection = None
+    if connection is not None:
+        connection.close()
+
+
+def load_test(port: int, paths: List[str], concurrency: int, duration: float) -> Dict:
+    """
+    Drive the server with `concurrency` client threads for `duration` seconds
+
+    Returns:
+        Request count, throughput, latency percentiles (ms) and error summary
+    """
+    latencies, errors = [], []
+    deadline = time.monotonic() + duration
+    clients = [threading.Thread(target=_client, args=(port, paths, deadline, i, latencies, errors))
+               for i in range(concurrency)]
+    started = time.perf_counter()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - started
+
+    result = {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'seconds': round(elapsed, 2),
+        'requests_per_second': round(len(latencies) / elapsed, 1)
+    }
+    if latencies:
+        percentiles = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+        result.update({'p50_ms': round(float(percentiles[0]), 2),
+                       'p95_ms': round(float(percentiles[1]), 2),
+                       'p99_ms': round(float(percentiles[2]), 2),
+                       'mean_ms': round(statistics.fmean(latencies) * 1000, 2)})
+    if errors:
+        result['error_samples'] = sorted(set(errors))[:5]
+    return result
+
+
+def benchmark_mode(mode: str, args: argparse.Namespace, paths: List[str]) -> Dict:
+    """Start one server in a child process, warm it up, and load test it"""
+    env = dict(os.environ, SERVER_DEBUG='false', SERVER_ACCESS_LOG='false',
+               DASHBOARD_MIN_REFRESH_INTERVAL='3600')
+    command = [sys.executable, '-m', 'benchmarks.serve_benchmark', '--serve', mode,
+               '--port', str(args.port), '--workers', str(args.workers),
+               '--threads', str(args.threads), '--rows', str(args.rows)]
+    process = subprocess.Popen(command, cwd=REPO_ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_ready(args.port, process)
+        load_test(args.port, paths, args.concurrency, min(args.duration, 2))
+        print(f"⏱️ {mode}: {args.concurrency} clients for {args.duration}s...")
+        result = load_test(args.port, paths, args.concurrency, args.duration)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=35)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    result['mode'] = mode
+    if mode == 'prod':
+        result.update({'workers': args.workers, 'threads': args.threads})
+    print(f"  ✓ {result['requests_per_second']} req/s  p50 {result.get('p50_ms')} ms  "
+          f"p99 {result.get('p99_ms')} ms  errors {result['errors']}")
+    return result
+
+
+def _write_json(path: str, payload: Dict) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the development server against gunicorn')
+    parser.add_argument('--modes', default=','.join(MODES), help=f"Comma-separated of {','.join(MODES)}")
+    parser.add_argument('--paths', default=','.join(DEFAULT_PATHS), help='Comma-separated request paths (round robin)')
+    parser.add_argument('--concurrency', type=int, default=32, help='Concurrent keep-alive clients')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds of load per mode')
+    parser.add_argument('--workers', type=int, default=(os.cpu_count() or 1) * 2 + 1, help='gunicorn workers')
+    parser.add_argument('--threads', type=int, default=16, help='Threads per gunicorn worker')
+    parser.add_argument('--rows', type=int, default=10000, help='Synthetic stock rows')
+    parser.add_argument('--port', type=int, default=5077, help='Port the servers bind to')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Results JSON path')
+    parser.add_argument('--serve', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        return serve(args.serve, args.port, args.workers, args.threads, args.rows)
+
+    modes = [m.strip() for m in args.modes.split(',') if m.strip()]
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        parser.error(f"Unknown modes: {unknown}. Choose from {MODES}")
+    paths = [p.strip() for p in args.paths.split(',') if p.strip()]
+
+    report = {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'concurrency': args.concurrency,
+            'duration': args.duration,
+            'rows': args.rows,
+            'paths': paths
+        },
+        'results': [benchmark_mode(mode, args, paths) for mode in modes]
+    }
+    _write_json(args.output, report)
+    print(f"✅ Results written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Columnar Snapshot Tables
+Read-only NumPy column store for snapshot tables, rendered to JSON records,
+column JSON or Arrow IPC per request
+"""
+
+import hashlib
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+ARROW_STREAM_MIMETYPE = 'application/vnd.apache.arrow.stream'
+
+
+class ColumnarTable:
+    """
+    Immutable table of equal-length NumPy columns
+
+    Numeric columns are stored as contiguous typed arrays and text as object
+    arrays of the original strings; datetimes become 'YYYY-MM-DD HH:MM:SS'
+    strings as in the JSON payload. Arrays are marked read-only, so a snapshot
+    can be shared by every request thread, and slice() returns views of the
+    same buffers. Row dicts are only built for the rows a response contains.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns differ in length: {sorted(lengths)}")
+        for values in columns.values():
+            values.flags.writeable = False
+        self.columns = columns
+        self.size = lengths.pop() if lengths else 0
+        self._row_hashes = None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'ColumnarTable':
+        """Build a table from a DataFrame (its data is copied once)"""
+        columns = {}
+        for name in df.columns:
+            series = df[name]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                series = series.dt.strftime('%Y-%m-%d %H:%M:%S').astype(object)
+            columns[str(name)] = np.array(series.to_numpy(), copy=True)
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.columns)
+
+    def column(self, name: str) -> Optional[np.ndarray]:
+        return self.columns.get(name)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns (object arrays count their pointers only)"""
+        return sum(values.nbytes for values in self.columns.values())
+
+    def slice(self, start: int, stop: int) -> 'ColumnarTable':
+        """Rows [start, stop) as views of this table's buffers (no copy)"""
+        return ColumnarTable({name: values[start:stop] for name, values in self.columns.items()})
+
+    def take(self, indices: Sequence[int]) -> 'ColumnarTable':
+        """Rows at `indices` (gathered into new arrays)"""
+        indices = np.asarray(indices, dtype=np.intp)
+        return ColumnarTable({name: values[indices] for name, values in self.columns.items()})
+
+    def to_frame(self, copy: bool = True) -> pd.DataFrame:
+        """
+        DataFrame of the table
+
+        Args:
+            copy: Copy the data; with False the frame shares the read-only
+                  buffers and must not be modified in place
+        """
+        return pd.DataFrame({name: pd.Series(values, copy=False) for name, values in self.columns.items()},
+                            copy=copy)
+
+    def to_records(self, indices: Optional[Sequence[int]] = None) -> List[Dict]:
+        """Rows as dicts of Python values (all rows, or those at `indices`)"""
+        columns = self.columns if indices is None else self.take(indices).columns
+        names = list(columns)
+        return [dict(zip(names, values)) for values in zip(*(columns[name].tolist() for name in names))]
+
+    def to_columns(self) -> Dict[str, List]:
+        """Column name -> list of values (compact JSON representation)"""
+        return {name: values.tolist() for name, values in self.columns.items()}
+
+    def row_keys(self, key_columns: List[str]) -> List[str]:
+        """'|'-joined key column values of every row (as the frontend builds row keys)"""
+        parts = [self.columns[name].tolist() if name in self.columns else [None] * self.size
+                 for name in key_columns]
+        return ['|'.join(map(str, values)) for values in zip(*parts)]
+
+    def row_hashes(self) -> np.ndarray:
+        """64-bit content hash of every row (computed once)"""
+        if self._row_hashes is None:
+            if self.size and self.columns:
+                hashes = pd.util.hash_pandas_object(self.to_frame(copy=False), index=False).to_numpy()
+            else:
+                hashes = np.zeros(self.size, dtype=np.uint64)
+            hashes.flags.writeable = False
+            self._row_hashes = hashes
+        return self._row_hashes
+
+    def digest(self) -> str:
+        """Content hash of the whole table (column names and row contents)"""
+        sha = hashlib.sha1('\x00'.join(self.names).encode('utf-8'))
+        sha.update(self.row_hashes().tobytes())
+        return sha.hexdigest()[:20]
+
+    def to_arrow(self):
+        """
+        Arrow table of the columns (numeric buffers are shared, not copied)
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for Arrow output (pip install pyarrow)")
+        return pa.table({name: pa.array(values, from_pandas=True) for name, values in self.columns.items()})
+
+    def to_arrow_ipc(self) -> bytes:
+        """Arrow IPC stream of the table"""
+        table = self.to_arrow()
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+
+def render_records(data: Dict) -> Dict:
+    """Copy of a snapshot payload with its tables expanded to lists of row dicts"""
+    return {key: value.to_records() if isinstance(value, ColumnarTable) else value
+            for key, value in data.items()}
@@ -7,14 +7,32 @@ import pandas as pd
 from datetime import datetime
 from src.database.connection import DatabaseConnection, StockDataAccess
 from src.kpi.calculator import InventoryKPICalculator
+from src.api.snapshot import SnapshotManager
+from src.api.shared_snapshot import SharedSnapshotReader
+from src.api.columnar import ColumnarTable, render_records
+from src.api.responses import content_hash
+from src.api.delta import DeltaHistory
+from src.api.events import EventBroadcaster
+from src.api.stock_query import StockIndex
+from src.api.views import TAB_VIEWS, ViewCache
+from src.forecasting.reorder import last_complete_day, sync_sketches
+from src.forecasting.sketches import get_demand_sketches
+from src.config import DASHBOARD_CONFIG, FORECAST_CONFIG
 import os
 
 
 class DashboardDataAPI:
     """API for dashboard data operations - no UI logic"""
     
-    def __init__(self, db_config=None):
-        """Initialize data API with database connection"""
+    def __init__(self, db_config=None, snapshot_dir=None):
+        """
+        Initialize data API with database connection
+        
+        Args:
+            db_config: Database settings (default: DB_* environment variables)
+            snapshot_dir: Map the snapshots a refresher process publishes there
+                          instead of building them in this process (optional)
+        """
         if db_config is None:
             db_config = {
                 'host': os.getenv('DB_HOST', 'localhost'),
@@ -26,8 +44,31 @@ class DashboardDataAPI:
         
         self.db_connection = DatabaseConnection(db_config)
         self.stock_data_access = StockDataAccess(self.db_connection)
-        self._cache = {}
-        self._last_refresh = None
+        self.deltas = DeltaHistory(max_versions=DASHBOARD_CONFIG['delta_history'])
+        # While clients are subscribed, the heartbeat keeps the snapshot revalidating
+        # once it is older than snapshot_max_age (shared mode: polls for new versions)
+        self.events = EventBroadcaster(
+            heartbeat_interval=DASHBOARD_CONFIG['stream_heartbeat'],
+            max_clients=DASHBOARD_CONFIG['stream_max_clients'],
+            on_tick=lambda: self.snapshots.get()
+        )
+        if snapshot_dir:
+            self.snapshots = SharedSnapshotReader(
+                snapshot_dir,
+                poll_interval=DASHBOARD_CONFIG['snapshot_poll_interval'],
+                min_refresh_interval=DASHBOARD_CONFIG['min_refresh_interval'],
+                on_change=self._on_new_snapshot
+            )
+        else:
+            self.snapshots = SnapshotManager(
+                self._build_dashboard_data,
+                max_age=DASHBOARD_CONFIG['snapshot_max_age'],
+                min_refresh_interval=DASHBOARD_CONFIG['min_refresh_interval'],
+                fingerprint=self._dashboard_fingerprint,
+                on_change=self._on_new_snapshot
+            )
+        self.views = ViewCache()
+        self._sketches_synced = None
     
     def get_stock_summary(self):
         """Get current stock summary data"""
@@ -62,6 +103,50 @@ class DashboardDataAPI:
         """Get items below reorder point"""
         return self.stock_data_access.get_low_stock_items()
     
+    def get_reorder_positions(self):
+        """Get stock positions with supplier lead times"""
+        df = self.stock_data_access.get_reorder_positions()
+        
+        for col in ['Quantity', 'Reserved', 'Reorder_Quantity', 'Unit_Price', 'Lead_Time']:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+        df[['Quantity', 'Reserved']] = df[['Quantity', 'Reserved']].fillna(0)
+        
+        return df
+    
+    def get_daily_demand(self, days=90):
+        """Get daily sales per product per warehouse"""
+        df = self.stock_data_access.get_daily_demand(days=days)
+        df['Quantity'] = pd.to_numeric(df['Quantity'], errors='coerce').fillna(0)
+        df['Date'] = pd.to_datetime(df['Date'])
+        return df
+    
+    def sync_demand_sketches(self):
+        """
+        Feed newly completed sales days into the demand quantile sketches
+        
+        Runs at most once per day; after downtime the history fetched covers
+        the days since the least recently synced position (up to
+        sketch_max_backfill_days), so no complete day is skipped.
+        
+        Returns:
+            Number of position-days ingested
+        """
+        today = pd.Timestamp.now().normalize()
+        if self._sketches_synced == today:
+            return 0
+        
+        sketches = get_demand_sketches()
+        backlog = sketches.backlog_days(today)
+        days = FORECAST_CONFIG['sketch_history_days']
+        if backlog is not None:
+            days = min(max(days, backlog), FORECAST_CONFIG['sketch_max_backfill_days'])
+        
+        ingested = sync_sketches(self.get_reorder_positions(), self.get_daily_demand(days=days), days,
+                                 sketches=sketches, end_date=last_complete_day(today))
+        self._sketches_synced = today
+        return ingested
+    
     def get_stock_by_warehouse(self):
         """Get stock grouped by warehouse"""
         return self.stock_data_access.get_stock_by_warehouse()
@@ -72,18 +157,81 @@ class DashboardDataAPI:
     
     def calculate_kpis(self, stock_df, transactions_df):
         """Calculate all KPIs"""
-        kpi_calc = InventoryKPICalculator(stock_df, transactions_df)
+        kpi_calc = InventoryKPICalculator(stock_df, transactions_df,
+                                          random_state=DASHBOARD_CONFIG['kpi_random_state'])
         return kpi_calc.get_all_kpis()
     
+    def classify_stock(self, stock_df):
+        """Add each item's ABC class and dead stock flag (the KPI member lists filter on them)"""
+        if stock_df.empty:
+            return stock_df
+        classification = InventoryKPICalculator(stock_df, pd.DataFrame()).stock_classification()
+        return stock_df.assign(**{column: classification[column].to_numpy() for column in classification})
+    
     def get_dashboard_data(self, refresh=False):
-        """Get all dashboard data in one call"""
-        if not refresh and self._cache.get('data') and self._last_refresh:
-            # Return cached data if available and not expired (< 60 seconds)
-            elapsed = (datetime.now() - self._last_refresh).total_seconds()
-            if elapsed < 60:
-                print(f"📦 Returning cached data (age: {elapsed:.1f}s)")
-                return self._cache['data']
+        """
+        Get all dashboard data in one call
+        
+        Served from the current snapshot; stale snapshots and refresh requests
+        trigger a single rate-limited background rebuild.
+        """
+        return self.snapshots.get(force=refresh).data
+    
+    def get_dashboard_delta(self, since):
+        """
+        Get dashboard changes since a snapshot version
         
+        Args:
+            since: Snapshot ETag the client last loaded
+        
+        Returns:
+            (snapshot, delta); delta is None when `since` is too old or unknown
+        """
+        snapshot = self.snapshots.get()
+        return snapshot, self.deltas.since(since)
+    
+    def get_stock_index(self):
+        """Get the query index of the current stock snapshot (built once per version)"""
+        snapshot = self.snapshots.get()
+        return snapshot.etag, self.views.get('stock_index', snapshot, lambda data: StockIndex(data['stock']))
+    
+    def get_tab_view(self, name):
+        """
+        Get the aggregates one dashboard tab renders
+        
+        Args:
+            name: View name (see TAB_VIEWS)
+        
+        Returns:
+            (snapshot, view); each view is computed on first request per snapshot version
+        """
+        snapshot = self.snapshots.get()
+        return snapshot, self.views.get(name, snapshot, TAB_VIEWS[name])
+    
+    def _on_new_snapshot(self, snapshot):
+        """Record row changes of a new snapshot version and announce it to subscribers"""
+        previous = self.deltas.current
+        self.deltas.record(snapshot)
+        if previous is None or not self.events.client_count:
+            return
+        
+        # Subscribers fetch the rows they need from /api/dashboard/delta
+        self.events.publish('snapshot', {
+            'version': snapshot.version,
+            'etag': snapshot.etag,
+            'since': previous
+        }, event_id=snapshot.etag)
+    
+    @staticmethod
+    def _dashboard_fingerprint(data):
+        """Content version of a dashboard payload (ignores the build time in 'summary')"""
+        return content_hash({
+            key: value.digest() if isinstance(value, ColumnarTable) else value
+            for key, value in data.items() if key != 'summary'
+        })
+    
+    def _build_dashboard_data(self):
+        """Fetch and compute a fresh dashboard payload"""
         print("🔄 Fetching fresh data from database...")
         
         # Fetch fresh data
@@ -92,19 +240,19 @@ class DashboardDataAPI:
         
         print(f"✅ Loaded {len(stock_df)} products and {len(transactions_df)} transactions")
         
-        kpis = self.calculate_kpis(stock_df, transactions_df)
+        try:
+            self.sync_demand_sketches()
+        except Exception as e:
+            # Sketches catch up on a later build; the dashboard does not depend on them
+            print(f"⚠️ Demand sketch sync failed: {e}")
         
-        # Convert DataFrames to dict with proper date handling
-        def convert_df(df):
-            # Convert dates to strings
-            for col in df.columns:
-                if df[col].dtype == 'datetime64[ns]':
-                    df[col] = df[col].dt.strftime('%Y-%m-%d %H:%M:%S')
-            return df.to_dict('records')
+        kpis = self.calculate_kpis(stock_df, transactions_df)
+        stock_df = self.classify_stock(stock_df)
         
+        # Tables are kept columnar (dates as strings); rows are rendered per response
         data = {
-            'stock': convert_df(stock_df.copy()),
-            'transactions': convert_df(transactions_df.copy()),
+            'stock': ColumnarTable.from_frame(stock_df),
+            'transactions': ColumnarTable.from_frame(transactions_df),
             'kpis': kpis,
             'summary': {
                 'total_products': len(stock_df),
@@ -113,12 +261,6 @@ class DashboardDataAPI:
             }
         }
         
-        # Cache the data
-        self._cache['data'] = data
-        self._last_refresh = datetime.now()
-        
-        print(f"💾 Data cached at {self._last_refresh.strftime('%H:%M:%S')}")
-        
         return data
     
     def get_kpi_details(self, kpi_id):
@@ -133,7 +275,7 @@ class DashboardDataAPI:
     def export_to_json(self, filename='dashboard_data.json'):
         """Export dashboard data to JSON file"""
         import json
-        data = self.get_dashboard_data()
+        data = render_records(self.get_dashboard_data())
         
         with open(filename, 'w') as f:
             json.dump(data, f, indent=2, default=str)
@@ -180,9 +322,9 @@ class DashboardDataAPI:
 
 # Standalone API functions for external use
 def get_api_instance():
-    """Get a singleton instance of the data API"""
+    """Get a singleton instance of the data API (shared by every blueprint of the process)"""
     if not hasattr(get_api_instance, 'instance'):
-        get_api_instance.instance = DashboardDataAPI()
+        get_api_instance.instance = DashboardDataAPI(snapshot_dir=DASHBOARD_CONFIG['snapshot_dir'])
     return get_api_instance.instance
 
 
@@ -0,0 +1,178 @@
+"""
+Dashboard Delta Sync
+Row-level change history between dashboard snapshot versions, so polling
+clients download only the rows that were inserted, updated or deleted
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from src.api.columnar import ColumnarTable
+
+
+# Columns identifying a row of each dashboard table
+TABLE_KEYS = {
+    'stock': ['product_id', 'Warehouse'],
+    'transactions': ['transaction_id']
+}
+
+# Small payload parts sent whole whenever the version changed
+REPLACED_PARTS = ['kpis', 'summary']
+
+
+def _index_rows(table: ColumnarTable, columns: List[str]) -> Dict[str, tuple]:
+    """Map row key -> (row content hash, row position)"""
+    return {key: (row_hash, position)
+            for position, (key, row_hash) in enumerate(zip(table.row_keys(columns), table.row_hashes().tolist()))}
+
+
+class DeltaHistory:
+    """
+    Changes between consecutive dashboard snapshots
+
+    Each recorded snapshot (identified by its ETag) is diffed against the
+    previous one table by table. since() merges the changes following a
+    client's version into a single delta; clients whose version is older than
+    the kept history (or unknown, e.g. after a restart) get None and must
+    reload the full payload.
+    """
+
+    def __init__(self, table_keys: Optional[Dict[str, List[str]]] = None, max_versions: int = 50):
+        """
+        Initialize history
+
+        Args:
+            table_keys: Table name -> key columns (default: TABLE_KEYS)
+            max_versions: Number of version changes kept
+        """
+        self.table_keys = table_keys or TABLE_KEYS
+        self.max_versions = max_versions
+        self._lock = threading.Lock()
+        self._changes = OrderedDict()  # base etag -> change to the next version
+        self._current = None
+        self._indexes = {}
+
+    @property
+    def current(self) -> Optional[str]:
+        """ETag of the last recorded snapshot"""
+        with self._lock:
+            return self._current
+
+    def record(self, snapshot) -> None:
+        """Diff a new snapshot against the previous one and remember the change"""
+        tables = {table: snapshot.data.get(table) or ColumnarTable({}) for table in self.table_keys}
+        indexes = {
+            table: _index_rows(tables[table], columns)
+            for table, columns in self.table_keys.items()
+        }
+
+        with self._lock:
+            previous, previous_indexes = self._current, self._indexes
+            self._current, self._indexes = snapshot.etag, indexes
+            if previous is None or previous == snapshot.etag:
+                return
+
+            changes = {}
+            for table, index in indexes.items():
+                old = previous_indexes.get(table, {})
+                inserted = [(key, position) for key, (_, position) in index.items() if key not in old]
+                updated = [(key, position) for key, (row_hash, position) in index.items()
+                           if key in old and old[key][0] != row_hash]
+                # Only changed rows are materialized as dicts
+                changes[table] = {
+                    'inserts': self._rows(tables[table], inserted),
+                    'updates': self._rows(tables[table], updated),
+                    'deletes': [key for key in old if key not in index]
+                }
+
+            self._changes[previous] = {
+                'etag': snapshot.etag,
+                'tables': changes,
+                'parts': {part: snapshot.data.get(part) for part in REPLACED_PARTS}
+            }
+            # Content can return to an earlier ETag: its link is now the newest
+            self._changes.move_to_end(previous)
+            while len(self._changes) > self.max_versions:
+                self._changes.popitem(last=False)
+
+    @staticmethod
+    def _rows(table: ColumnarTable, keyed_positions: List[tuple]) -> Dict[str, Dict]:
+        if not keyed_positions:
+            return {}
+        keys, positions = zip(*keyed_positions)
+        return dict(zip(keys, table.to_records(positions)))
+
+    def _chain(self, etag: str) -> Optional[List[Dict]]:
+        """Changes leading from `etag` to the current version (caller holds the lock)"""
+        if etag == self._current:
+            return []
+        changes, cursor = [], etag
+        while cursor != self._current:
+            change = self._changes.get(cursor)
+            if change is None:
+                # Unknown version, or a later link was evicted
+                return None
+            changes.append(change)
+            cursor = change['etag']
+        return changes
+
+    def covers(self, etag: str) -> bool:
+        """Whether since(etag) can produce a delta (without building it)"""
+        with self._lock:
+            return self._chain(etag) is not None
+
+    def since(self, etag: str) -> Optional[Dict]:
+        """
+        Merged changes from version `etag` to the current version
+
+        Returns:
+            {'tables': {name: {'key', 'inserts', 'updates', 'deletes'}}, **REPLACED_PARTS}
+            (parts only when the version changed), or None if `etag` is not in the history
+        """
+        with self._lock:
+            changes = self._chain(etag)
+        if changes is None:
+            return None
+
+        tables = {}
+        for table, columns in self.table_keys.items():
+            inserts, updates, deletes = {}, {}, set()
+            for change in changes:
+                diff = change['tables'][table]
+                for key, row in diff['inserts'].items():
+                    if key in deletes:
+                        # Deleted then re-inserted: the client still has the old row
+                        deletes.discard(key)
+                        updates[key] = row
+                    else:
+                        inserts[key] = row
+                for key, row in diff['updates'].items():
+                    if key in inserts:
+                        inserts[key] = row
+                    else:
+                        updates[key] = row
+                for key in diff['deletes']:
+                    if inserts.pop(key, None) is None:
+                        updates.pop(key, None)
+                        deletes.add(key)
+
+            tables[table] = {
+                'key': columns,
+                'inserts': list(inserts.values()),
+                'updates': list(updates.values()),
+                'deletes': sorted(deletes)
+            }
+
+        delta = {'tables': tables}
+        if changes:
+            delta.update(changes[-1]['parts'])
+        return delta
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'versions': len(self._changes),
+                'current': self._current,
+                'oldest': next(iter(self._changes), self._current)
+            }
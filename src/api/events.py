@@ -0,0 +1,188 @@
+"""
+Dashboard Event Stream
+Server-Sent Events fan-out: each event is encoded once and queued to every
+connected client, with a shared heartbeat and bounded per-client backlog
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from src.api.responses import encode_json
+
+
+def format_event(event: str, data: Any, event_id: Optional[str] = None) -> bytes:
+    """Encode one SSE frame (data is JSON encoded)"""
+    frame = f"event: {event}\n"
+    if event_id is not None:
+        frame += f"id: {event_id}\n"
+    return frame.encode('utf-8') + b'data: ' + encode_json(data) + b'\n\n'
+
+
+HEARTBEAT = b': heartbeat\n\n'
+
+
+class Subscription:
+    """Queue of encoded frames for one connected client"""
+
+    def __init__(self, max_pending: int):
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.resets = 0
+
+
+class EventBroadcaster:
+    """
+    One-to-many SSE broadcaster
+
+    publish() encodes an event once and puts the bytes on every subscriber's
+    queue. A single ticker thread, running only while clients are connected,
+    sends heartbeats (which also surface closed connections) and calls
+    `on_tick`, e.g. to revalidate the data being broadcast. A client that
+    falls `max_pending` frames behind has its backlog replaced by one 'reset'
+    event telling it to resynchronize.
+    """
+
+    def __init__(self,
+                 heartbeat_interval: float = 15,
+                 max_clients: int = 100,
+                 max_pending: int = 20,
+                 on_tick: Optional[Callable[[], None]] = None):
+        """
+        Initialize broadcaster
+
+        Args:
+            heartbeat_interval: Seconds between heartbeats (and on_tick calls)
+            max_clients: Maximum concurrent subscribers
+            max_pending: Frames queued per subscriber before it is reset
+            on_tick: Called every heartbeat while clients are connected (optional)
+        """
+        self.heartbeat_interval = heartbeat_interval
+        self.max_clients = max_clients
+        self.max_pending = max_pending
+        self.on_tick = on_tick
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._ticker = None
+        self._stop = threading.Event()
+
+        self.events_published = 0
+        self.resets = 0
+        self.connections = 0
+
+    def subscribe(self) -> Optional[Subscription]:
+        """Register a client (None when max_clients are already connected)"""
+        with self._lock:
+            if len(self._subscribers) >= self.max_clients:
+                return None
+            subscription = Subscription(self.max_pending)
+            self._subscribers.add(subscription)
+            self.connections += 1
+            if self._ticker is None:
+                self._ticker = threading.Thread(target=self._tick_loop, name='event-heartbeat', daemon=True)
+                self._ticker.start()
+            return subscription
+
+    @property
+    def client_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def _deliver(self, subscription: Subscription, frame: bytes) -> None:
+        try:
+            subscription.queue.put_nowait(frame)
+        except queue.Full:
+            # Slow client: drop its backlog, it resynchronizes from its own version
+            while True:
+                try:
+                    subscription.queue.get_nowait()
+                except queue.Empty:
+                    break
+            subscription.queue.put_nowait(format_event('reset', {'reason': 'backlog'}))
+            subscription.resets += 1
+            with self._lock:
+                self.resets += 1
+
+    def broadcast(self, frame: bytes) -> int:
+        """Queue an encoded frame to every subscriber"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            self._deliver(subscription, frame)
+        return len(subscribers)
+
+    def publish(self, event: str, data: Any, event_id: Optional[str] = None) -> int:
+        """
+        Send an event to all connected clients
+
+        Returns:
+            Number of clients it was queued to
+        """
+        with self._lock:
+            self.events_published += 1
+        return self.broadcast(format_event(event, data, event_id))
+
+    def _tick_loop(self) -> None:
+        while not self._stop.wait(self.heartbeat_interval):
+            with self._lock:
+                if not self._subscribers:
+                    self._ticker = None
+                    return
+            self.broadcast(HEARTBEAT)
+            if self.on_tick:
+                try:
+                    self.on_tick()
+                except Exception as e:
+                    print(f"⚠️ Event stream tick failed: {e}")
+
+    def stream(self, initial: Optional[Callable[[], Iterable[bytes]]] = None,
+               retry_ms: int = 5000) -> Iterator[bytes]:
+        """
+        Generate the response body for one client
+
+        The client is subscribed when the body starts streaming, then `initial`
+        is called for its first frames, so no event published in between is
+        missed. Yields the reconnection delay, the initial frames, then every
+        queued frame until the client disconnects or close() is called.
+        """
+        subscription = self.subscribe()
+        if subscription is None:
+            yield format_event('reset', {'reason': 'too many clients'})
+            return
+
+        try:
+            yield f"retry: {retry_ms}\n\n".encode('utf-8')
+            for frame in (initial() if initial else ()):
+                yield frame
+            while True:
+                frame = subscription.queue.get()
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            self.unsubscribe(subscription)
+
+    def close(self) -> None:
+        """End all streams and stop the ticker"""
+        self._stop.set()
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(None)
+            except queue.Full:
+                subscription.queue.get_nowait()
+                subscription.queue.put_nowait(None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'clients': len(self._subscribers),
+                'connections': self.connections,
+                'events_published': self.events_published,
+                'resets': self.resets,
+                'heartbeat_interval': self.heartbeat_interval
+            }
@@ -0,0 +1,68 @@
+"""
+Dashboard Snapshot Refresher
+Single process that builds dashboard snapshots and publishes them for the
+server workers to map (run with DASHBOARD_SNAPSHOT_DIR set on the workers)
+"""
+
+import argparse
+import signal
+import sys
+import threading
+import time
+from typing import List, Optional
+
+from src.api.data_api import DashboardDataAPI
+from src.api.shared_snapshot import SnapshotPublisher
+from src.config import DASHBOARD_CONFIG
+
+
+def run(directory: str, keep: int = 3, poll_interval: float = 1.0,
+        stop: Optional[threading.Event] = None) -> None:
+    """
+    Build and publish snapshots until `stop` is set
+
+    Rebuilds follow the usual snapshot policy (max_age, min_refresh_interval);
+    a worker's forced refresh arrives as a refresh request. Only versions
+    whose content changed are published.
+    """
+    stop = stop or threading.Event()
+    api = DashboardDataAPI()
+    publisher = SnapshotPublisher(directory, keep=keep)
+    print(f"🔄 Publishing dashboard snapshots to {directory}")
+
+    last_check = 0.0
+    while not stop.is_set():
+        forced = publisher.refresh_requested(since=last_check)
+        last_check = time.time()
+        try:
+            snapshot = api.snapshots.get(force=forced)
+            if snapshot.etag != publisher.published:
+                name = publisher.publish(snapshot)
+                print(f"📤 Published {name}")
+        except Exception as e:
+            print(f"⚠️ Snapshot refresh failed: {e}")
+        stop.wait(poll_interval)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Build dashboard snapshots for shared-memory server workers')
+    parser.add_argument('--directory', default=DASHBOARD_CONFIG['snapshot_dir'],
+                        help='Publish directory (default: DASHBOARD_SNAPSHOT_DIR)')
+    parser.add_argument('--keep', type=int, default=DASHBOARD_CONFIG['snapshot_keep'],
+                        help='Published versions kept on disk')
+    parser.add_argument('--poll-interval', type=float, default=1.0,
+                        help='Seconds between snapshot and refresh request checks')
+    args = parser.parse_args(argv)
+
+    if not args.directory:
+        parser.error('--directory or DASHBOARD_SNAPSHOT_DIR is required')
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    run(args.directory, keep=args.keep, poll_interval=args.poll_interval, stop=stop)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
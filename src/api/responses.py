@@ -0,0 +1,146 @@
+"""
+Cacheable API Responses
+Content hashing for ETags, conditional GET (304) handling and per-client
+gzip/brotli compression of snapshot-backed JSON responses
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Union
+
+from flask import Response, request
+
+from src.config import DASHBOARD_CONFIG
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+ENCODINGS = ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def _default(obj):
+    if hasattr(obj, 'item'):  # NumPy scalars
+        return obj.item()
+    if hasattr(obj, 'tolist'):  # NumPy arrays
+        return obj.tolist()
+    return str(obj)
+
+
+def encode_json(payload: Any, sort_keys: bool = False) -> bytes:
+    """Encode JSON with orjson when available"""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(payload, default=_default, option=option)
+    return json.dumps(payload, separators=(',', ':'), sort_keys=sort_keys, default=_default).encode('utf-8')
+
+
+def content_hash(payload: Any) -> str:
+    """Stable hash of a JSON-serializable payload (used as ETag value)"""
+    return hashlib.sha1(encode_json(payload, sort_keys=True)).hexdigest()[:20]
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a response body with 'br' or 'gzip'"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+class EncodedBodyCache:
+    """
+    Small LRU of encoded response bodies keyed by (ETag, encoding)
+
+    Every client polling the same snapshot gets the same bytes, so each
+    representation is serialized and compressed once per content version.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+encoded_bodies = EncodedBodyCache()
+
+
+def cached_response(render: Callable[[], bytes], etag: str, mimetype: str = 'application/json') -> Response:
+    """
+    Response with a weak ETag, honoring If-None-Match and Accept-Encoding
+
+    The body must be fully determined by `etag` (no per-request fields), since
+    it is rendered once and reused for every request carrying the same ETag.
+
+    Args:
+        render: Callable producing the response body (only called on a cache miss)
+        etag: Content version of the body
+        mimetype: Content type of the body
+
+    Returns:
+        304 when the client already has this version, otherwise the (possibly
+        compressed) body
+    """
+    headers = {'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304, headers=headers)
+        response.set_etag(etag, weak=True)
+        return response
+
+    body = encoded_bodies.get((etag, 'identity'))
+    if body is None:
+        body = render()
+        encoded_bodies.put((etag, 'identity'), body)
+
+    encoding = None
+    if len(body) >= DASHBOARD_CONFIG['compress_min_bytes']:
+        encoding = request.accept_encodings.best_match(ENCODINGS)
+    if encoding:
+        compressed = encoded_bodies.get((etag, encoding))
+        if compressed is None:
+            compressed = compress(body, encoding)
+            encoded_bodies.put((etag, encoding), compressed)
+        body = compressed
+        headers['Content-Encoding'] = encoding
+
+    response = Response(body, mimetype=mimetype, headers=headers)
+    response.set_etag(etag, weak=True)
+    return response
+
+
+def cached_json_response(payload: Union[Any, Callable[[], Any]], etag: str) -> Response:
+    """
+    JSON response cached by ETag (see cached_response)
+
+    Args:
+        payload: JSON-serializable body, or a callable building it when the
+                 encoded body is not cached yet
+        etag: Content version of the payload
+    """
+    return cached_response(lambda: encode_json(payload() if callable(payload) else payload), etag)
@@ -0,0 +1,128 @@
+"""
+API Server Entry Point
+Runs the API under gunicorn with SERVER_CONFIG (preforked threaded workers,
+app and first snapshot preloaded before fork), or the Flask dev server
+
+Usage:
+    python -m src.api.serve          # Production: gunicorn gthread workers
+    python -m src.api.serve --dev    # Development: Flask server (SERVER_DEBUG=true for the debugger)
+
+gunicorn signals: HUP gracefully replaces the workers (forked again from the
+preloaded master, so code changes need a restart), TTIN/TTOU add or remove a
+worker, TERM finishes in-flight requests within graceful_timeout and exits.
+
+With several workers, set DASHBOARD_SNAPSHOT_DIR so one refresher process
+builds snapshots for all of them; otherwise every worker queries the database.
+"""
+
+import argparse
+import atexit
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+from src.config import DASHBOARD_CONFIG, SERVER_CONFIG
+
+
+def gunicorn_options(config: Dict) -> Dict:
+    """Translate SERVER_CONFIG into gunicorn settings"""
+    return {
+        'bind': f"{config['host']}:{config['port']}",
+        'workers': config['workers'],
+        # gthread: a slow client or an event stream holds one thread, not a whole worker
+        'worker_class': 'gthread',
+        'threads': config['threads'],
+        'keepalive': config['keepalive'],
+        'timeout': config['timeout'],
+        'graceful_timeout': config['graceful_timeout'],
+        'max_requests': config['max_requests'],
+        'max_requests_jitter': config['max_requests_jitter'],
+        'backlog': config['backlog'],
+        'preload_app': config['preload'],
+        'accesslog': '-' if config['access_log'] else None,
+        'when_ready': lambda server: print(
+            f"🚀 Serving on http://{config['host']}:{config['port']} "
+            f"({config['workers']} workers x {config['threads']} threads)"
+        )
+    }
+
+
+def load_app(warm_snapshot: bool = True):
+    """Import the Flask app and, unless disabled, load the dashboard snapshot"""
+    from src.api.server import app, data_api
+
+    if warm_snapshot:
+        try:
+            snapshot = data_api.snapshots.get()
+            print(f"💾 Preloaded dashboard snapshot v{snapshot.version}")
+        except Exception as e:
+            # Workers retry on their first request
+            print(f"⚠️ Snapshot preload failed: {e}")
+    return app
+
+
+def create_application(options: Dict):
+    """
+    gunicorn application serving the API
+
+    Raises:
+        ImportError: If gunicorn is not installed
+    """
+    from gunicorn.app.base import BaseApplication
+
+    class DashboardApplication(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                if value is not None:
+                    self.cfg.set(key, value)
+
+        def load(self):
+            # With preload_app this runs once in the master, so workers are
+            # forked with the snapshot already in (copy-on-write) memory
+            return load_app(warm_snapshot=options['preload_app'])
+
+    return DashboardApplication()
+
+
+def start_refresher() -> Optional[subprocess.Popen]:
+    """Spawn the snapshot refresher when workers map shared snapshots"""
+    if not (SERVER_CONFIG['start_refresher'] and DASHBOARD_CONFIG['snapshot_dir']):
+        return None
+    process = subprocess.Popen([sys.executable, '-m', 'src.api.refresher'])
+    atexit.register(process.terminate)
+    print(f"🔄 Started snapshot refresher (pid {process.pid})")
+    return process
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Run the Stock Dashboard API server')
+    parser.add_argument('--dev', action='store_true', help='Use the Flask development server')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: SERVER_CONFIG)')
+    parser.add_argument('--threads', type=int, help='Threads per worker (default: SERVER_CONFIG)')
+    parser.add_argument('--port', type=int, help='Port (default: SERVER_CONFIG)')
+    args = parser.parse_args(argv)
+
+    config = dict(SERVER_CONFIG)
+    for key in ('workers', 'threads', 'port'):
+        if getattr(args, key) is not None:
+            config[key] = getattr(args, key)
+
+    if args.dev:
+        load_app(warm_snapshot=False).run(host=config['host'], port=config['port'], debug=config['debug'])
+        return 0
+
+    try:
+        application = create_application(gunicorn_options(config))
+    except ImportError:
+        print("❌ gunicorn is not installed (pip install -r requirements_flask.txt), or use --dev")
+        return 1
+
+    if config['workers'] > 1 and not DASHBOARD_CONFIG['snapshot_dir']:
+        print("⚠️ DASHBOARD_SNAPSHOT_DIR is not set: each worker builds its own snapshots")
+    start_refresher()
+    application.run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
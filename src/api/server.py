@@ -3,9 +3,15 @@ Flask API Server - Provides data endpoints for the dashboard
 Pure backend - no UI rendering
 """
 
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, Response, jsonify, render_template, request, stream_with_context
 from flask_cors import CORS
-from .data_api import DashboardDataAPI
+from .data_api import get_api_instance
+from ..config import SERVER_CONFIG
+from .responses import cached_json_response, cached_response, content_hash
+from .columnar import ARROW_STREAM_MIMETYPE, render_records
+from .events import format_event
+from .views import TAB_VIEWS
+from .stock_query import FILTER_COLUMNS, KPI_MEMBERS, MAX_LIMIT, decode_cursor, parse_sort, sort_keys
 from datetime import datetime
 import traceback
 import os
@@ -19,8 +25,8 @@ app = Flask(__name__,
             template_folder=os.path.join(BASE_DIR, 'templates'))
 CORS(app)
 
-# Initialize data API
-data_api = DashboardDataAPI()
+# Initialize data API (shared with the forecasting blueprint)
+data_api = get_api_instance()
 
 # Register forecasting blueprint
 try:
@@ -45,21 +51,16 @@ def get_dashboard_data():
     """Get all dashboard data"""
     try:
         refresh = request.args.get('refresh', 'false').lower() == 'true'
-        data = data_api.get_dashboard_data(refresh=refresh)
+        snapshot = data_api.snapshots.get(force=refresh)
         
-        # Convert to JSON-serializable format
-        response_data = {
-            'stock': data['stock'],
-            'transactions': data['transactions'],
-            'kpis': data['kpis'],
-            'summary': data['summary']
-        }
-        
-        return jsonify({
+        # Body depends only on the snapshot, so it is rendered once per version
+        # and revalidated with its ETag
+        return cached_json_response(lambda: {
             'success': True,
-            'data': response_data,
-            'timestamp': datetime.now().isoformat()
-        })
+            'data': render_records(snapshot.data),
+            'snapshot': {'version': snapshot.version, 'etag': snapshot.etag},
+            'timestamp': datetime.fromtimestamp(snapshot.built_at).isoformat()
+        }, snapshot.etag)
     except Exception as e:
         print(f"Error in /api/dashboard: {str(e)}")
         print(traceback.format_exc())
@@ -69,22 +70,251 @@ def get_dashboard_data():
             'trace': traceback.format_exc()
         }), 500
 
-@app.route('/api/stock')
-def get_stock():
-    """Get stock summary"""
+@app.route('/api/dashboard/delta')
+def get_dashboard_delta():
+    """
+    Get dashboard changes since a snapshot version
+    
+    Query params:
+        since: Snapshot ETag the client has (from 'snapshot.etag')
+    
+    Returns row-level inserts/updates/deletes per table plus the current KPIs and
+    summary, or the full payload ('full': true) when `since` is no longer in history
+    """
+    try:
+        since = request.args.get('since', '')
+        if not since.isalnum():
+            return jsonify({
+                'success': False,
+                'error': 'since must be a snapshot etag'
+            }), 400
+        
+        snapshot, delta = data_api.get_dashboard_delta(since)
+        
+        def payload():
+            data = {'full': True, **render_records(snapshot.data)} if delta is None else {'full': False, **delta}
+            data['snapshot'] = {'version': snapshot.version, 'etag': snapshot.etag, 'since': since}
+            return {'success': True, 'data': data}
+        
+        return cached_json_response(payload, f"{snapshot.etag}-delta-{since}")
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/stream')
+def stream_dashboard():
+    """
+    Server-Sent Events stream of dashboard snapshot versions
+    
+    Events:
+        hello: {version, etag} of the current snapshot on connect
+        snapshot: {version, etag, since} when the data changed (id = etag); the
+                  rows changed since `since` are at /api/dashboard/delta?since=
+        reset: client should resynchronize through /api/dashboard/delta
+    
+    Reconnecting clients resume from Last-Event-ID (or ?since=<etag>): a
+    snapshot event from that version is sent first, or a reset if it is too old.
+    """
+    if data_api.events.client_count >= data_api.events.max_clients:
+        return jsonify({
+            'success': False,
+            'error': 'Too many stream clients, poll /api/dashboard/delta instead'
+        }), 503
+    
+    try:
+        data_api.snapshots.get()
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+    
+    since = request.headers.get('Last-Event-ID') or request.args.get('since')
+    
+    def initial_events():
+        snapshot = data_api.snapshots.get()
+        version = {'version': snapshot.version, 'etag': snapshot.etag}
+        if not since or since == snapshot.etag:
+            return [format_event('hello', version, event_id=snapshot.etag)]
+        if not data_api.deltas.covers(since):
+            return [format_event('reset', {**version, 'reason': 'unknown version'})]
+        return [format_event('snapshot', {**version, 'since': since}, event_id=snapshot.etag)]
+    
+    return Response(
+        stream_with_context(data_api.events.stream(initial_events)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/dashboard/status')
+def get_dashboard_status():
+    """Get dashboard snapshot age and refresh statistics"""
+    return jsonify({
+        'success': True,
+        'data': {
+            **data_api.snapshots.stats(),
+            'deltas': data_api.deltas.stats(),
+            'stream': data_api.events.stats(),
+            'views': data_api.views.stats()
+        }
+    })
+
+@app.route('/api/tables/<name>')
+def get_table(name):
+    """
+    Get a snapshot table in columnar form
+    
+    Query params:
+        format: 'json' ({columns: {name: [values]}}, default) or 'arrow' (Arrow IPC stream, needs pyarrow)
+        offset, limit: Row range (default: all rows)
+    """
+    if name not in ('stock', 'transactions'):
+        return jsonify({
+            'success': False,
+            'error': f'Unknown table: {name}. Choose from stock, transactions'
+        }), 404
+    
+    output = request.args.get('format', 'json')
     try:
-        df = data_api.get_stock_summary()
+        offset = int(request.args.get('offset', 0))
+        limit = int(request.args['limit']) if 'limit' in request.args else None
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError('offset and limit must not be negative')
+        if output not in ('json', 'arrow'):
+            raise ValueError('format must be json or arrow')
+    except ValueError as e:
         return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    try:
+        snapshot = data_api.snapshots.get()
+        table = snapshot.data[name]
+        # Row ranges are views of the snapshot's column buffers
+        rows = table.slice(offset, len(table) if limit is None else offset + limit)
+        etag = f"{snapshot.etag}-table-{name}-{offset}-{limit}-{output}"
+        if output == 'arrow':
+            return cached_response(rows.to_arrow_ipc, etag, mimetype=ARROW_STREAM_MIMETYPE)
+        return cached_json_response(lambda: {
             'success': True,
-            'data': df.to_dict('records'),
-            'count': len(df)
-        })
+            'data': {'columns': rows.to_columns()},
+            'count': len(rows),
+            'total': len(table)
+        }, etag)
+    except ImportError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 406
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+@app.route('/api/views/<name>')
+def get_tab_view(name):
+    """
+    Get the data of one dashboard tab
+    
+    Views: overview, kpis, analytics, forecasting (the details tab pages /api/stock)
+    """
+    if name not in TAB_VIEWS:
+        return jsonify({
+            'success': False,
+            'error': f'Unknown view: {name}. Choose from {list(TAB_VIEWS)}'
+        }), 404
+    
+    try:
+        snapshot, view = data_api.get_tab_view(name)
+        return cached_json_response({
+            'success': True,
+            'data': view,
+            'snapshot': {
+                'version': snapshot.version,
+                'etag': snapshot.etag,
+                'last_updated': snapshot.data['summary']['last_updated']
+            }
+        }, f"{snapshot.etag}-view-{name}")
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def _stock_page(filters, tag, default_sort=None):
+    """
+    Answer a paged stock query from the current snapshot's index
+    
+    Reads q, sort, limit, cursor and facets from the query string; `filters`
+    are the exact-match filters to apply and `tag` names the endpoint in the ETag.
+    """
+    try:
+        sort = parse_sort(request.args.get('sort'), default=default_sort)
+        limit = int(request.args.get('limit', 50))
+        cursor = request.args.get('cursor') or None
+        if cursor and len(decode_cursor(cursor)) != len(sort_keys(sort)):
+            raise ValueError('Cursor does not match the sort order')
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    if not 1 <= limit <= MAX_LIMIT:
+        return jsonify({
+            'success': False,
+            'error': f'limit must be between 1 and {MAX_LIMIT}'
+        }), 400
+    
+    try:
+        etag, index = data_api.get_stock_index()
+        page = index.query(
+            search=request.args.get('q', ''),
+            filters=filters,
+            sort=sort,
+            limit=limit,
+            cursor=cursor
+        )
+        payload = {
+            'success': True,
+            'data': page['rows'],
+            'count': len(page['rows']),
+            'total': page['total'],
+            'next_cursor': page['next_cursor'],
+            'snapshot': {'etag': etag}
+        }
+        if request.args.get('facets', 'false').lower() == 'true':
+            payload['facets'] = index.facets()
+        
+        # Pages are fully determined by the snapshot and the query string
+        return cached_json_response(payload, f"{etag}-{tag}-{content_hash(sorted(request.args.items()))}")
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/stock')
+def get_stock():
+    """
+    Query stock rows (one page at a time)
+    
+    Query params:
+        q: Search text (product, SKU or category)
+        status, warehouse, category, abc, dead_stock: Exact-match filters (comma-separated for several values)
+        sort: Comma-separated columns, '-' prefix for descending (default: sku,Warehouse)
+        limit: Page size (default: 50, max: 1000)
+        cursor: next_cursor from the previous page
+        facets: 'true' to include the distinct values of each filter
+    
+    The response's snapshot.etag is the version the page was read from, for
+    applying /api/dashboard/delta?since= changes to the loaded rows
+    """
+    return _stock_page({name: request.args.get(name) for name in FILTER_COLUMNS if request.args.get(name)}, 'stock')
+
 @app.route('/api/transactions')
 def get_transactions():
     """Get transaction history"""
@@ -108,13 +338,11 @@ def get_transactions():
 def get_kpis():
     """Get all KPIs"""
     try:
-        stock_df = data_api.get_stock_summary()
-        trans_df = data_api.get_transactions()
-        kpis = data_api.calculate_kpis(stock_df, trans_df)
-        return jsonify({
+        snapshot = data_api.snapshots.get()
+        return cached_json_response({
             'success': True,
-            'data': kpis
-        })
+            'data': snapshot.data['kpis']
+        }, f"{snapshot.etag}-kpis")
     except Exception as e:
         return jsonify({
             'success': False,
@@ -125,12 +353,13 @@ def get_kpis():
 def get_kpi_detail(kpi_id):
     """Get specific KPI details"""
     try:
-        data = data_api.get_kpi_details(kpi_id)
+        snapshot = data_api.snapshots.get()
+        data = snapshot.data['kpis'].get(kpi_id)
         if data:
-            return jsonify({
+            return cached_json_response({
                 'success': True,
                 'data': data
-            })
+            }, f"{snapshot.etag}-kpi-{kpi_id}")
         return jsonify({
             'success': False,
             'error': 'KPI not found'
@@ -141,6 +370,31 @@ def get_kpi_detail(kpi_id):
             'error': str(e)
         }), 500
 
+@app.route('/api/kpi/<kpi_id>/products')
+def get_kpi_products(kpi_id):
+    """
+    Page through the items behind a list KPI (abc_analysis, dead_stock_percentage)
+    
+    Query params:
+        class: ABC class, A, B or C (abc_analysis only)
+        q, sort, limit, cursor: As for /api/stock (default sort: highest value first)
+    """
+    if kpi_id not in KPI_MEMBERS:
+        return jsonify({
+            'success': False,
+            'error': f'KPI {kpi_id} has no product list. Choose from {list(KPI_MEMBERS)}'
+        }), 404
+    
+    name, values = KPI_MEMBERS[kpi_id]
+    value = values[0] if len(values) == 1 else request.args.get('class', '').upper()
+    if value not in values:
+        return jsonify({
+            'success': False,
+            'error': f'class must be one of {values}'
+        }), 400
+    
+    return _stock_page({name: value}, f'kpi-{kpi_id}', default_sort=[('Total_Value', False)])
+
 @app.route('/api/stock/low')
 def get_low_stock():
     """Get low stock items"""
@@ -221,14 +475,20 @@ if __name__ == '__main__':
     print("=" * 70)
     print("🚀 Starting Flask API Server for Stock Dashboard")
     print("=" * 70)
-    print("📊 Dashboard URL: http://127.0.0.1:5000")
+    print(f"📊 Dashboard URL: http://{SERVER_CONFIG['host']}:{SERVER_CONFIG['port']}")
     print("🔌 API Endpoints:")
     print("   GET  /api/health              - Health check")
     print("   GET  /api/dashboard           - All dashboard data")
-    print("   GET  /api/stock               - Stock summary")
+    print("   GET  /api/dashboard/delta     - Changes since a snapshot version")
+    print("   GET  /api/dashboard/status    - Snapshot age and refresh stats")
+    print("   GET  /api/stream              - Server-Sent Events dashboard updates")
+    print("   GET  /api/views/<tab>         - Data of one dashboard tab")
+    print("   GET  /api/tables/<name>       - Snapshot table as column JSON or Arrow IPC")
+    print("   GET  /api/stock               - Stock query (search, filters, sort, pages)")
     print("   GET  /api/transactions        - Transaction history")
     print("   GET  /api/kpis                - All KPIs")
     print("   GET  /api/kpi/<id>            - Specific KPI details")
+    print("   GET  /api/kpi/<id>/products   - Items behind ABC / dead stock KPIs (paged)")
     print("   GET  /api/stock/low           - Low stock items")
     print("   GET  /api/stock/by-warehouse  - Stock by warehouse")
     print("   GET  /api/stock/by-category   - Stock by category")
@@ -238,8 +498,9 @@ if __name__ == '__main__':
     print("\n✨ Features:")
     print("  • Pure REST API - No server-side rendering")
     print("  • HTML/CSS/JS frontend - Client-side rendering")
-    print("  • Auto-refresh every 60 seconds")
+    print("  • Live updates over Server-Sent Events (60 s polling fallback)")
     print("  • Responsive design")
     print("=" * 70)
+    print("ℹ️  Development server - use 'python -m src.api.serve' for multi-worker serving")
     
-    app.run(host='127.0.0.1', port=5000, debug=True)
+    app.run(host=SERVER_CONFIG['host'], port=SERVER_CONFIG['port'], debug=SERVER_CONFIG['debug'])
@@ -0,0 +1,288 @@
+"""
+Shared Dashboard Snapshots
+One refresher process publishes each snapshot version as memory-mappable
+column files; server worker processes map the current version read-only
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from src.api.columnar import ColumnarTable
+from src.api.responses import encode_json
+from src.api.snapshot import Snapshot
+
+
+CURRENT_FILE = 'CURRENT'
+REFRESH_REQUEST_FILE = 'REFRESH_REQUEST'
+META_FILE = 'meta.json'
+VERSION_DIR = re.compile(r'^v(\d{8,})-')
+
+
+def _shareable_column(values: np.ndarray):
+    """
+    Column as a fixed-layout array that can be memory-mapped
+
+    Object columns become fixed-width unicode arrays (None stored as ''), with
+    a null mask when they contain missing values.
+
+    Returns:
+        (array, null mask or None)
+    """
+    if values.dtype != object:
+        return values, None
+    nulls = np.array([value is None or (isinstance(value, float) and value != value) for value in values.tolist()],
+                     dtype=bool)
+    text = np.array(['' if null else str(value) for value, null in zip(values.tolist(), nulls)], dtype=str)
+    return text, nulls if nulls.any() else None
+
+
+class SnapshotPublisher:
+    """
+    Writes snapshot versions to a directory (refresher side)
+
+    Each version is written to a temporary directory - one .npy file per
+    table column plus meta.json with the KPIs and summary - then renamed into
+    place, and the CURRENT file is atomically replaced to point at it. Readers
+    therefore only ever see complete versions. The newest `keep` versions are
+    kept; readers still mapping an older one keep their mapping after deletion.
+
+    Published versions are numbered by the publisher, continuing from the
+    highest version already in the directory, so they keep increasing when the
+    refresher restarts (the builder's own counter starts again at 1).
+    """
+
+    def __init__(self, directory: str, keep: int = 3):
+        self.directory = directory
+        self.keep = keep
+        os.makedirs(directory, exist_ok=True)
+        self.published = None
+        self.version = self._latest_version()
+
+    def _latest_version(self) -> int:
+        versions = [int(match.group(1)) for match in map(VERSION_DIR.match, os.listdir(self.directory)) if match]
+        return max(versions, default=0)
+
+    def publish(self, snapshot: Snapshot) -> str:
+        """
+        Publish a snapshot version
+
+        Returns:
+            Name of the version directory
+        """
+        version = self.version + 1
+        name = f"v{version:08d}-{snapshot.etag}"
+        staging = tempfile.mkdtemp(prefix='.staging-', dir=self.directory)
+        try:
+            tables, meta = {}, {}
+            for key, value in snapshot.data.items():
+                if isinstance(value, ColumnarTable):
+                    columns = []
+                    for column, values in value.columns.items():
+                        array, nulls = _shareable_column(values)
+                        index = len(columns)
+                        np.save(os.path.join(staging, f"{key}.{index}.npy"), array, allow_pickle=False)
+                        if nulls is not None:
+                            np.save(os.path.join(staging, f"{key}.{index}.nulls.npy"), nulls, allow_pickle=False)
+                        columns.append({'name': column, 'nulls': nulls is not None})
+                    tables[key] = {'rows': len(value), 'columns': columns}
+                else:
+                    meta[key] = value
+
+            with open(os.path.join(staging, META_FILE), 'wb') as f:
+                f.write(encode_json({
+                    'version': version,
+                    'etag': snapshot.etag,
+                    'built_at': snapshot.built_at,
+                    'build_seconds': snapshot.build_seconds,
+                    'tables': tables,
+                    'data': meta
+                }))
+            os.rename(staging, os.path.join(self.directory, name))
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        # Switch readers over in one atomic rename
+        pointer = os.path.join(self.directory, f".{CURRENT_FILE}.tmp")
+        with open(pointer, 'w') as f:
+            f.write(name)
+        os.replace(pointer, os.path.join(self.directory, CURRENT_FILE))
+        self.published = snapshot.etag
+        self.version = version
+
+        self._prune(name)
+        return name
+
+    def _prune(self, current: str) -> None:
+        versions = sorted((entry for entry in os.listdir(self.directory) if VERSION_DIR.match(entry)),
+                          key=lambda entry: int(VERSION_DIR.match(entry).group(1)))
+        for entry in versions[:-self.keep] if self.keep > 0 else []:
+            if entry != current:
+                shutil.rmtree(os.path.join(self.directory, entry), ignore_errors=True)
+
+    def refresh_requested(self, since: float) -> bool:
+        """Whether a reader asked for a rebuild after time `since`"""
+        try:
+            return os.stat(os.path.join(self.directory, REFRESH_REQUEST_FILE)).st_mtime > since
+        except FileNotFoundError:
+            return False
+
+
+def load_snapshot(directory: str, name: str) -> Snapshot:
+    """Map a published version read-only (table columns are not read until used)"""
+    path = os.path.join(directory, name)
+    with open(os.path.join(path, META_FILE), 'rb') as f:
+        meta = json.load(f)
+
+    data = dict(meta['data'])
+    for key, table in meta['tables'].items():
+        columns = {}
+        for index, column in enumerate(table['columns']):
+            values = np.load(os.path.join(path, f"{key}.{index}.npy"), mmap_mode='r', allow_pickle=False)
+            if column['nulls']:
+                # Columns with missing values are rebuilt as object arrays (copied)
+                nulls = np.load(os.path.join(path, f"{key}.{index}.nulls.npy"), allow_pickle=False)
+                values = values.astype(object)
+                values[nulls] = None
+            columns[column['name']] = values
+        data[key] = ColumnarTable(columns)
+
+    snapshot = Snapshot(data, meta['version'], meta['build_seconds'], etag=meta['etag'])
+    snapshot.built_at = snapshot.checked_at = meta['built_at']
+    return snapshot
+
+
+class SharedSnapshotReader:
+    """
+    Worker-side view of the published snapshots
+
+    Drop-in for SnapshotManager: get() returns the current mapped version,
+    re-checking the CURRENT pointer at most every `poll_interval` seconds and
+    swapping in a newer version by replacing one reference. Nothing is
+    rebuilt in the worker; get(force=True) asks the refresher for a rebuild
+    by touching the refresh request file (rate-limited).
+    """
+
+    def __init__(self,
+                 directory: str,
+                 poll_interval: float = 0.5,
+                 wait_timeout: float = 30,
+                 min_refresh_interval: float = 15,
+                 on_change: Optional[Callable[[Snapshot], None]] = None,
+                 name: str = 'dashboard'):
+        """
+        Initialize reader
+
+        Args:
+            directory: Directory the refresher publishes to
+            poll_interval: Seconds between checks of the CURRENT pointer
+            wait_timeout: Seconds the first get() waits for a published version
+            min_refresh_interval: Minimum seconds between two refresh requests
+            on_change: Called with each newly mapped version before it is served (optional)
+            name: Label used in log messages
+        """
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self.wait_timeout = wait_timeout
+        self.min_refresh_interval = min_refresh_interval
+        self.on_change = on_change
+        self.name = name
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._current = None
+        self._checked = None
+        self._last_request = None
+
+        self.loads = 0
+        self.refresh_requests = 0
+        self.failures = 0
+        self.last_error = None
+
+    def _check(self) -> None:
+        """Map the published version if it changed (caller holds the lock)"""
+        self._checked = time.monotonic()
+        try:
+            with open(os.path.join(self.directory, CURRENT_FILE)) as f:
+                current = f.read().strip()
+        except FileNotFoundError:
+            return
+        if current == self._current:
+            return
+
+        try:
+            snapshot = load_snapshot(self.directory, current)
+        except (OSError, ValueError, KeyError) as e:
+            # Version pruned between reading CURRENT and mapping it: retry next poll
+            self.failures += 1
+            self.last_error = str(e)
+            return
+
+        print(f"💾 {self.name} snapshot v{snapshot.version} mapped from {current}")
+        if self.on_change:
+            self.on_change(snapshot)
+        self._snapshot, self._current = snapshot, current
+        self.loads += 1
+        self.last_error = None
+
+    def _request_refresh(self) -> None:
+        now = time.monotonic()
+        if self._last_request is not None and now - self._last_request < self.min_refresh_interval:
+            return
+        self._last_request = now
+        self.refresh_requests += 1
+        with open(os.path.join(self.directory, REFRESH_REQUEST_FILE), 'a'):
+            os.utime(os.path.join(self.directory, REFRESH_REQUEST_FILE))
+
+    def get(self, force: bool = False) -> Snapshot:
+        """
+        Get the current snapshot
+
+        Args:
+            force: Ask the refresher for a rebuild (the current snapshot is still returned)
+
+        Raises:
+            RuntimeError: If nothing is published within wait_timeout
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            with self._lock:
+                if self._checked is None or time.monotonic() - self._checked >= self.poll_interval \
+                        or self._snapshot is None:
+                    self._check()
+                if force:
+                    self._request_refresh()
+                if self._snapshot is not None:
+                    return self._snapshot
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"No {self.name} snapshot published in {self.directory} - is the refresher running?")
+            time.sleep(self.poll_interval)
+
+    def peek(self) -> Optional[Snapshot]:
+        """Get the current snapshot without checking for a new version"""
+        with self._lock:
+            return self._snapshot
+
+    def stats(self) -> Dict:
+        """Get the mapped version and reader counters"""
+        with self._lock:
+            snapshot = self._snapshot
+            return {
+                'mode': 'shared',
+                'directory': self.directory,
+                'version': snapshot.version if snapshot else None,
+                'etag': snapshot.etag if snapshot else None,
+                'age_seconds': round(snapshot.age(), 1) if snapshot else None,
+                'build_seconds': round(snapshot.build_seconds, 3) if snapshot else None,
+                'loads': self.loads,
+                'refresh_requests': self.refresh_requests,
+                'failures': self.failures,
+                'last_error': self.last_error
+            }
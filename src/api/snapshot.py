@@ -0,0 +1,215 @@
+"""
+Dashboard Snapshot Manager
+Serves the current dashboard snapshot immediately and rebuilds it in a single
+background thread (stale-while-revalidate), with rate-limited forced refreshes
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+
+class Snapshot:
+    """
+    One build of the dashboard data
+
+    `version` and `etag` only change when the content changes; `checked_at`
+    moves forward whenever a rebuild confirms the content is still current.
+    """
+
+    def __init__(self, data: Any, version: int, build_seconds: float, etag: Optional[str] = None):
+        self.data = data
+        self.version = version
+        self.build_seconds = build_seconds
+        self.etag = etag or str(version)
+        self.built_at = time.time()
+        self.checked_at = self.built_at
+
+    def age(self) -> float:
+        """Seconds since the snapshot was last built or confirmed"""
+        return time.time() - self.checked_at
+
+
+class SnapshotManager:
+    """
+    Stale-while-revalidate snapshot cache
+
+    Only the very first request waits for a build; concurrent first requests
+    share it. Afterwards requests always get the current snapshot right away.
+    Once it is older than `max_age`, or a client forces a refresh, one
+    background thread rebuilds it while requests keep being served the old
+    one. Refresh demands arriving during a rebuild are coalesced into it, and
+    no rebuild starts within `min_refresh_interval` of the previous one, so
+    database load is independent of the number of viewers.
+
+    With a `fingerprint` function, a rebuild producing identical content keeps
+    the current snapshot (same version and ETag) and only renews its age.
+    """
+
+    def __init__(self,
+                 build: Callable[[], Any],
+                 max_age: float = 60,
+                 min_refresh_interval: float = 15,
+                 fingerprint: Optional[Callable[[Any], str]] = None,
+                 on_change: Optional[Callable[[Snapshot], None]] = None,
+                 name: str = 'dashboard'):
+        """
+        Initialize snapshot manager
+
+        Args:
+            build: Callable producing fresh snapshot data
+            max_age: Seconds after which a snapshot is rebuilt in the background
+            min_refresh_interval: Minimum seconds between two rebuild starts
+            fingerprint: Content hash of snapshot data, used as ETag (optional)
+            on_change: Called with each new snapshot version before it is served (optional)
+            name: Label used in log messages
+        """
+        self.build = build
+        self.max_age = max_age
+        self.min_refresh_interval = min_refresh_interval
+        self.fingerprint = fingerprint
+        self.on_change = on_change
+        self.name = name
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._initial = None
+        self._refresh_thread = None
+        self._last_build_started = None
+
+        self.builds = 0
+        self.unchanged_builds = 0
+        self.failures = 0
+        self.last_error = None
+        self.fresh_served = 0
+        self.stale_served = 0
+        self.coalesced = 0
+        self.rate_limited = 0
+
+    def _build_snapshot(self) -> Snapshot:
+        start = time.perf_counter()
+        data = self.build()
+        etag = self.fingerprint(data) if self.fingerprint else None
+        seconds = time.perf_counter() - start
+
+        with self._lock:
+            self.builds += 1
+            current = self._snapshot
+            if current is not None and etag is not None and etag == current.etag:
+                self.unchanged_builds += 1
+                current.checked_at = time.time()
+                return current
+            version = current.version + 1 if current else 1
+
+        print(f"💾 {self.name} snapshot v{version} built in {seconds:.2f}s")
+        snapshot = Snapshot(data, version, seconds, etag=etag)
+        if self.on_change:
+            self.on_change(snapshot)
+        return snapshot
+
+    def _refresh(self) -> None:
+        """Background rebuild; on failure the previous snapshot stays in service"""
+        try:
+            snapshot = self._build_snapshot()
+        except Exception as e:
+            print(f"⚠️ {self.name} snapshot refresh failed: {e}")
+            with self._lock:
+                self.failures += 1
+                self.last_error = str(e)
+                self._refresh_thread = None
+            return
+
+        with self._lock:
+            self._snapshot = snapshot
+            self.last_error = None
+            self._refresh_thread = None
+
+    def _start_refresh(self, forced: bool) -> None:
+        """Start a background rebuild unless one is running or one started too recently (caller holds the lock)"""
+        if self._refresh_thread is not None:
+            self.coalesced += 1
+            return
+        now = time.monotonic()
+        if self._last_build_started is not None and now - self._last_build_started < self.min_refresh_interval:
+            if forced:
+                self.rate_limited += 1
+            return
+
+        self._last_build_started = now
+        self._refresh_thread = threading.Thread(target=self._refresh, name=f'{self.name}-snapshot', daemon=True)
+        self._refresh_thread.start()
+
+    def get(self, force: bool = False) -> Snapshot:
+        """
+        Get the current snapshot
+
+        Args:
+            force: Ask for a rebuild (rate-limited; the current snapshot is still returned)
+
+        Returns:
+            Current snapshot (built synchronously only if none exists yet)
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None:
+                stale = snapshot.age() >= self.max_age
+                if stale or force:
+                    self._start_refresh(forced=force)
+                if stale:
+                    self.stale_served += 1
+                else:
+                    self.fresh_served += 1
+                return snapshot
+
+            future = self._initial
+            owner = future is None
+            if owner:
+                future = self._initial = Future()
+                self._last_build_started = time.monotonic()
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            snapshot = self._build_snapshot()
+        except BaseException as e:
+            with self._lock:
+                self.failures += 1
+                self.last_error = str(e)
+                self._initial = None
+                self._last_build_started = None
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._snapshot = snapshot
+            self._initial = None
+        future.set_result(snapshot)
+        return snapshot
+
+    def peek(self) -> Optional[Snapshot]:
+        """Get the current snapshot without triggering any build"""
+        with self._lock:
+            return self._snapshot
+
+    def stats(self) -> Dict:
+        """Get snapshot age and refresh counters"""
+        with self._lock:
+            snapshot = self._snapshot
+            return {
+                'version': snapshot.version if snapshot else None,
+                'etag': snapshot.etag if snapshot else None,
+                'age_seconds': round(snapshot.age(), 1) if snapshot else None,
+                'build_seconds': round(snapshot.build_seconds, 3) if snapshot else None,
+                'refreshing': self._refresh_thread is not None,
+                'builds': self.builds,
+                'unchanged_builds': self.unchanged_builds,
+                'failures': self.failures,
+                'last_error': self.last_error,
+                'fresh_served': self.fresh_served,
+                'stale_served': self.stale_served,
+                'coalesced': self.coalesced,
+                'rate_limited': self.rate_limited
+            }
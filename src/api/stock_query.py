@@ -0,0 +1,257 @@
+"""
+Stock Table Queries
+Search, filters, multi-column sort and keyset pagination over an index of
+the dashboard stock snapshot, so browsers only receive the visible page
+"""
+
+import base64
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.api.columnar import ColumnarTable
+
+
+SORTABLE_COLUMNS = ['sku', 'Product', 'Category', 'Quantity', 'Reserved', 'Available', 'Reorder_Level',
+                    'Unit_Price', 'Selling_Price', 'Total_Value', 'Stock_Status', 'Warehouse', 'Supplier',
+                    'Last_Restocked']
+SEARCH_COLUMNS = ['Product', 'sku', 'Category']
+FILTER_COLUMNS = {'status': 'Stock_Status', 'warehouse': 'Warehouse', 'category': 'Category',
+                  'abc': 'ABC_Class', 'dead_stock': 'Dead_Stock'}
+
+# Filters listing the items behind list KPIs: KPI id -> (filter, allowed values)
+KPI_MEMBERS = {
+    'abc_analysis': ('abc', ['A', 'B', 'C']),
+    'dead_stock_percentage': ('dead_stock', ['true'])
+}
+
+# Appended to every sort so rows have a total order (and cursors are unambiguous)
+TIEBREAK = [('product_id', True), ('Warehouse', True)]
+
+DEFAULT_SORT = [('sku', True), ('Warehouse', True)]
+MAX_LIMIT = 1000
+
+
+def parse_sort(value: Optional[str], default: Optional[List[Tuple[str, bool]]] = None) -> List[Tuple[str, bool]]:
+    """
+    Parse a sort parameter like '-Total_Value,Product' into [(column, ascending)]
+    (`default`, or DEFAULT_SORT, when empty)
+
+    Raises:
+        ValueError: For columns that cannot be sorted on
+    """
+    if not value:
+        return list(default or DEFAULT_SORT)
+    sort = []
+    for part in value.split(','):
+        part = part.strip()
+        column, ascending = (part[1:], False) if part.startswith('-') else (part, True)
+        if column not in SORTABLE_COLUMNS:
+            raise ValueError(f"Cannot sort by {column!r}. Choose from {SORTABLE_COLUMNS}")
+        if column not in [c for c, _ in sort]:
+            sort.append((column, ascending))
+    return sort
+
+
+def sort_keys(sort: Optional[List[Tuple[str, bool]]]) -> Tuple:
+    """Full sort key: the requested columns followed by the tiebreak columns"""
+    sort = list(sort or DEFAULT_SORT)
+    return tuple(sort + [key for key in TIEBREAK if key[0] not in dict(sort)])
+
+
+def encode_cursor(values: List) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> List:
+    """
+    Raises:
+        ValueError: For malformed cursors
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+class StockIndex:
+    """
+    Query index over one stock snapshot
+
+    Every sortable column is stored as dense ranks (nulls last in either
+    direction), so a multi-column sort is an integer lexsort and a cursor -
+    the sort-key values of the last row returned - is located by comparing
+    ranks. Sorted orders and filter masks are cached per index. The index
+    reads the snapshot's columns in place; only returned rows become dicts.
+    """
+
+    def __init__(self, table: ColumnarTable):
+        self.table = table
+        self.frame = table.to_frame(copy=False)
+        self.size = len(table)
+
+        text = pd.Series([''] * self.size, index=self.frame.index)
+        for column in SEARCH_COLUMNS:
+            if column in self.frame:
+                text = text + '\x00' + self.frame[column].fillna('').astype(str).str.lower()
+        self.search_text = text
+
+        self._uniques = {}
+        self._codes = {}
+        self._orders = OrderedDict()
+        self._masks = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _column(self, column: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Dense ascending ranks of a column (nulls = number of distinct values) and its sorted distinct values"""
+        if column not in self._codes:
+            values = self.frame[column] if column in self.frame else pd.Series([None] * self.size)
+            if values.dtype == object or pd.api.types.is_datetime64_any_dtype(values):
+                # Dates from the database sort (and travel in cursors) as ISO strings
+                values = values.map(lambda v: v.isoformat() if hasattr(v, 'isoformat') and pd.notna(v) else v)
+            codes, uniques = pd.factorize(values, sort=True)
+            codes = np.where(codes < 0, len(uniques), codes)
+            self._codes[column], self._uniques[column] = codes, np.asarray(uniques)
+        return self._codes[column], self._uniques[column]
+
+    def _ranks(self, column: str, ascending: bool) -> np.ndarray:
+        codes, uniques = self._column(column)
+        if ascending:
+            return codes
+        return np.where(codes == len(uniques), len(uniques), len(uniques) - 1 - codes)
+
+    def _value_rank(self, column: str, ascending: bool, value) -> float:
+        """Rank of an arbitrary value (between neighbours when it is not in the snapshot)"""
+        _, uniques = self._column(column)
+        if value is None:
+            return float(len(uniques))
+        # NumPy would otherwise compare mismatched types as strings
+        numeric = uniques.dtype.kind in 'biuf'
+        if numeric != (isinstance(value, (int, float)) and not isinstance(value, bool)):
+            raise ValueError(f"Invalid cursor value for {column}")
+        try:
+            position = np.searchsorted(uniques, value)
+        except TypeError:
+            raise ValueError(f"Invalid cursor value for {column}")
+        exact = position < len(uniques) and uniques[position] == value
+        rank = float(position) if exact else position - 0.5
+        if ascending:
+            return rank
+        return len(uniques) - 1 - rank
+
+    def _cached(self, cache: OrderedDict, key, compute, max_size: int = 32):
+        with self._lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+        value = compute()
+        with self._lock:
+            cache[key] = value
+            while len(cache) > max_size:
+                cache.popitem(last=False)
+        return value
+
+    def _order(self, keys: Tuple) -> np.ndarray:
+        # np.lexsort sorts by its last key first
+        return self._cached(self._orders, keys, lambda: np.lexsort(
+            [self._ranks(column, ascending) for column, ascending in reversed(keys)]
+        ))
+
+    def _mask(self, search: str, filters: Tuple) -> np.ndarray:
+        def compute():
+            mask = np.ones(self.size, dtype=bool)
+            if search:
+                mask &= self.search_text.str.contains(search.lower(), regex=False).values
+            for column, values in filters:
+                if column not in self.frame:
+                    mask &= False
+                    continue
+                column_values = self.frame[column]
+                if pd.api.types.is_bool_dtype(column_values):
+                    column_values = column_values.map({True: 'true', False: 'false'})
+                mask &= column_values.isin(values.split(',')).values
+            return mask
+        return self._cached(self._masks, (search, filters), compute)
+
+    def facets(self) -> Dict[str, List]:
+        """Distinct values of the filterable columns"""
+        return {
+            name: sorted(self.frame[column].dropna().unique().tolist()) if column in self.frame else []
+            for name, column in FILTER_COLUMNS.items()
+        }
+
+    def query(self,
+              search: str = '',
+              filters: Optional[Dict[str, str]] = None,
+              sort: Optional[List[Tuple[str, bool]]] = None,
+              limit: int = 50,
+              cursor: Optional[str] = None) -> Dict:
+        """
+        Get one page of matching stock rows
+
+        Args:
+            search: Case-insensitive substring of product, SKU or category
+            filters: {'status' | 'warehouse' | 'category': exact value, or comma-separated values}
+            sort: [(column, ascending)] (default: SKU, warehouse)
+            limit: Page size (at most MAX_LIMIT)
+            cursor: next_cursor of the previous page
+
+        Returns:
+            {'rows', 'total' (matching rows), 'next_cursor' (None on the last page)}
+
+        Raises:
+            ValueError: For unknown filters or malformed cursors
+        """
+        filters = filters or {}
+        unknown = set(filters) - set(FILTER_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown filters: {sorted(unknown)}. Choose from {list(FILTER_COLUMNS)}")
+
+        keys = sort_keys(sort)
+        mask = self._mask(search.strip(), tuple(sorted((FILTER_COLUMNS[k], v) for k, v in filters.items() if v)))
+        total = int(mask.sum())
+
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != len(keys):
+                raise ValueError("Cursor does not match the sort order")
+            # Rows strictly after the cursor in (ranked) lexicographic order
+            after = np.zeros(self.size, dtype=bool)
+            equal = np.ones(self.size, dtype=bool)
+            for (column, ascending), value in zip(keys, values):
+                ranks = self._ranks(column, ascending)
+                target = self._value_rank(column, ascending, value)
+                after |= equal & (ranks > target)
+                equal &= ranks == target
+            mask = mask & after
+
+        order = self._order(keys)
+        limit = max(1, min(int(limit), MAX_LIMIT))
+        selected = order[mask[order]][:limit + 1]
+        page = selected[:limit]
+
+        next_cursor = None
+        if len(selected) > limit:
+            last = page[-1]
+            next_cursor = encode_cursor([self._cursor_value(column, last) for column, _ in keys])
+
+        return {
+            'rows': self.table.to_records(page),
+            'total': total,
+            'next_cursor': next_cursor
+        }
+
+    def _cursor_value(self, column: str, row: int):
+        codes, uniques = self._column(column)
+        code = codes[row]
+        if code == len(uniques):
+            return None
+        value = uniques[code]
+        return value.item() if hasattr(value, 'item') else value
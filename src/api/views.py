@@ -0,0 +1,173 @@
+"""
+Dashboard Tab Views
+Aggregates each dashboard tab renders, derived lazily from the current
+snapshot and cached per snapshot version
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+
+# KPI cards of the KPI Metrics tab (the analytics KPIs live in the analytics view)
+KPI_TAB_IDS = ['inventory_turnover', 'days_sales_inventory', 'carrying_cost', 'dead_stock_percentage',
+               'inventory_shrinkage', 'stock_accuracy', 'stockout_rate', 'order_fulfillment',
+               'backorder_rate', 'fill_rate', 'lead_time']
+
+TOP_PRODUCTS = 10
+
+
+def _value_sums(df: pd.DataFrame, by: str, column: str) -> Dict[str, float]:
+    """Sum of `column` per value of `by` (missing labels grouped as 'Unknown')"""
+    if df.empty:
+        return {}
+    sums = df.groupby(df[by].fillna('Unknown'), sort=True)[column].sum()
+    return {str(key): round(float(value), 2) for key, value in sums.items()}
+
+
+def overview_view(data: Dict) -> Dict:
+    """Stock Overview tab: quick stats and the four chart series"""
+    stock = data['stock'].to_frame(copy=False)
+    if stock.empty:
+        stock = pd.DataFrame(columns=['Product', 'Quantity', 'Total_Value', 'Stock_Status',
+                                      'Category', 'Warehouse', 'Supplier'])
+    status = stock['Stock_Status'].fillna('Unknown')
+    top = stock.nlargest(TOP_PRODUCTS, 'Total_Value') if len(stock) else stock
+
+    return {
+        'stats': {
+            'total_products': len(stock),
+            'total_quantity': round(float(stock['Quantity'].sum()), 2),
+            'total_value': round(float(stock['Total_Value'].sum()), 2),
+            'low_stock_count': int(status.isin(['Low', 'Critical']).sum()),
+            'critical_count': int((status == 'Critical').sum()),
+            'warehouses': int(stock['Warehouse'].nunique(dropna=False)),
+            'suppliers': int(stock['Supplier'].nunique(dropna=False))
+        },
+        'status_counts': {str(key): int(value) for key, value in status.value_counts().items()},
+        'quantity_by_category': _value_sums(stock, 'Category', 'Quantity'),
+        'value_by_warehouse': _value_sums(stock, 'Warehouse', 'Total_Value'),
+        'top_products': top[['Product', 'Total_Value']].to_dict('records')
+    }
+
+
+def kpis_view(data: Dict) -> Dict:
+    """KPI Metrics tab: KPI cards plus the totals used in calculation steps"""
+    stock = data['stock']
+    values = stock.column('Total_Value')
+    return {
+        'kpis': {kpi_id: data['kpis'][kpi_id] for kpi_id in KPI_TAB_IDS if kpi_id in data['kpis']},
+        'totals': {
+            'total_items': len(stock),
+            'total_value': round(float(np.nansum(values.astype(float))), 2) if values is not None else 0
+        }
+    }
+
+
+def analytics_view(data: Dict) -> Dict:
+    """Analytics tab: ABC summary, valuation, supplier and aging KPIs, daily transaction value"""
+    kpis = data['kpis']
+    transactions = data['transactions'].to_frame(copy=False)
+
+    trends = {}
+    if not transactions.empty:
+        # Dates are 'YYYY-MM-DD HH:MM:SS' strings in the snapshot
+        day = transactions['Date'].astype(str).str[:10]
+        trends = {key: round(float(value), 2)
+                  for key, value in transactions.groupby(day)['Total_Value'].sum().items()}
+
+    return {
+        'abc_analysis': kpis.get('abc_analysis'),
+        'inventory_valuation': kpis.get('inventory_valuation'),
+        'supplier_performance': kpis.get('supplier_performance'),
+        'item_aging': kpis.get('item_aging'),
+        'transaction_trends': trends
+    }
+
+
+def forecasting_view(data: Dict) -> Dict:
+    """Forecasting tab: product selector options (ids as the forecast API filters on)"""
+    stock = data['stock']
+    products = {}
+    if len(stock):
+        for product_id, name in zip(stock.column('product_id').tolist(), stock.column('Product').tolist()):
+            products.setdefault(product_id, name)
+    return {'products': [{'id': product_id, 'name': name} for product_id, name in products.items()]}
+
+
+TAB_VIEWS = {
+    'overview': overview_view,
+    'kpis': kpis_view,
+    'analytics': analytics_view,
+    'forecasting': forecasting_view
+}
+
+
+class ViewCache:
+    """
+    Values derived from a snapshot, each built on first use
+
+    Entries are keyed by name and snapshot ETag; concurrent requests for the
+    same entry share one build, and entries of older snapshots are dropped
+    once a newer snapshot is seen. Requests still holding an older snapshot
+    get their value built but not cached.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._etag = None
+        self._version = None
+        self._entries = {}
+
+        self.builds = 0
+        self.hits = 0
+
+    def get(self, name: str, snapshot, build: Callable[[Dict], Any]) -> Any:
+        """
+        Get a derived value of a snapshot
+
+        Args:
+            name: Name of the derived value
+            snapshot: Snapshot it is derived from
+            build: Callable computing it from the snapshot data
+        """
+        with self._lock:
+            if self._version is None or snapshot.version > self._version:
+                self._etag, self._version, self._entries = snapshot.etag, snapshot.version, {}
+            outdated = snapshot.etag != self._etag
+            if not outdated:
+                future = self._entries.get(name)
+                owner = future is None
+                if owner:
+                    future = self._entries[name] = Future()
+                    self.builds += 1
+                else:
+                    self.hits += 1
+
+        if outdated:
+            return build(snapshot.data)
+        if not owner:
+            return future.result()
+
+        try:
+            value = build(snapshot.data)
+        except BaseException as e:
+            with self._lock:
+                if self._entries.get(name) is future:
+                    del self._entries[name]
+            future.set_exception(e)
+            raise
+        future.set_result(value)
+        return value
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'etag': self._etag,
+                'entries': sorted(self._entries),
+                'builds': self.builds,
+                'hits': self.hits
+            }
@@ -3,6 +3,8 @@ Configuration file for dashboard settings and color schemes.
 Handles: Application colors, themes, and global settings
 """
 
+import os
+
 # Dark Theme Color Scheme
 COLORS = {
     'background': '#0d1117',  # Dark background
@@ -23,3 +25,46 @@ APP_CONFIG = {
     'debug': True,
     'title': 'Advanced Stock Management Dashboard with KPIs'
 }
+
+# Dashboard Snapshot Configuration
+DASHBOARD_CONFIG = {
+    'snapshot_max_age': int(os.getenv('DASHBOARD_SNAPSHOT_MAX_AGE', 60)),  # Seconds before a background rebuild
+    'min_refresh_interval': int(os.getenv('DASHBOARD_MIN_REFRESH_INTERVAL', 15)),  # Seconds between rebuilds (forced refreshes included)
+    'kpi_random_state': int(os.getenv('KPI_RANDOM_STATE', 42)),  # Seed for simulated KPI terms, keeps unchanged data on the same ETag
+    'compress_min_bytes': 1024,  # Smaller responses are sent uncompressed
+    'delta_history': 50,  # Snapshot versions clients can sync deltas from
+    'stream_heartbeat': 15,  # Seconds between event stream heartbeats (and snapshot staleness checks)
+    'stream_max_clients': 100,  # Concurrent /api/stream connections
+    'snapshot_dir': os.getenv('DASHBOARD_SNAPSHOT_DIR') or None,  # Set to map snapshots published by src.api.refresher instead of building per process
+    'snapshot_keep': 3,  # Published versions kept on disk
+    'snapshot_poll_interval': 0.5  # Seconds between worker checks for a newer published version
+}
+
+# API Server Configuration (python -m src.api.serve; --dev for the Flask development server)
+SERVER_CONFIG = {
+    'host': os.getenv('SERVER_HOST', '127.0.0.1'),
+    'port': int(os.getenv('SERVER_PORT', 5000)),
+    'workers': int(os.getenv('SERVER_WORKERS', (os.cpu_count() or 1) * 2 + 1)),  # Worker processes
+    'threads': int(os.getenv('SERVER_THREADS', 16)),  # Threads per worker; each open /api/stream holds one
+    'keepalive': int(os.getenv('SERVER_KEEPALIVE', 5)),  # Seconds an idle keep-alive connection stays open
+    'timeout': 60,  # Seconds before a silent worker is restarted
+    'graceful_timeout': 30,  # Seconds workers get to finish requests on reload/shutdown
+    'max_requests': int(os.getenv('SERVER_MAX_REQUESTS', 0)),  # Recycle workers after this many requests (0 = never)
+    'max_requests_jitter': 100,
+    'backlog': 2048,
+    'preload': os.getenv('SERVER_PRELOAD', 'true').lower() == 'true',  # Load the app and first snapshot before forking
+    'start_refresher': True,  # Spawn src.api.refresher when DASHBOARD_SNAPSHOT_DIR is set
+    'access_log': os.getenv('SERVER_ACCESS_LOG', 'false').lower() == 'true',
+    'debug': os.getenv('SERVER_DEBUG', 'false').lower() == 'true'  # Werkzeug debugger (development server only)
+}
+
+# Forecasting Configuration
+FORECAST_CONFIG = {
+    'registry_path': os.getenv('FORECAST_REGISTRY_PATH', 'model_registry.json'),  # Learned model choices
+    'selection_sample_size': 5,  # Series profiled per demand profile
+    'default_time_budget': None,  # Seconds per fit+predict; None keeps rule-based selection
+    'sketch_path': os.getenv('FORECAST_SKETCH_PATH', 'demand_sketches.json'),  # Demand quantile sketches
+    'sketch_compression': 50,  # t-digest compression per SKU (higher = more accurate, larger)
+    'sketch_history_days': 90,  # Days of sales fed to the sketches on the first snapshot build of a day
+    'sketch_max_backfill_days': 365  # Longest gap since the last sync that is backfilled from history
+}
@@ -168,12 +168,14 @@ class StockDataAccess:
         """Get transaction history for specified period"""
         query = """
         SELECT 
+            th.transaction_id,
             th.transaction_date as "Date",
             CASE 
                 WHEN th.transaction_type = 'purchase' THEN 'In'
                 WHEN th.transaction_type = 'sale' THEN 'Out'
                 ELSE 'Adjustment'
             END as "Type",
+            p.product_id,
             p.product_name as "Product",
             c.category_name as "Category",
             w.warehouse_name as "Warehouse",
@@ -233,6 +235,49 @@ class StockDataAccess:
         """
         return self.db.execute_query(query)
     
+    def get_reorder_positions(self):
+        """Get stock positions with supplier lead times - one row per product per warehouse"""
+        query = """
+        SELECT 
+            p.product_id,
+            p.sku,
+            p.product_name as "Product",
+            c.category_name as "Category",
+            w.warehouse_id,
+            w.warehouse_name as "Warehouse",
+            SUM(COALESCE(i.quantity_on_hand, 0)) as "Quantity",
+            SUM(COALESCE(i.quantity_reserved, 0)) as "Reserved",
+            p.reorder_quantity as "Reorder_Quantity",
+            p.cost_price as "Unit_Price",
+            MAX(s.supplier_name) as "Supplier",
+            MAX(s.lead_time_days) as "Lead_Time"
+        FROM inventory i
+        JOIN products p ON i.product_id = p.product_id
+        JOIN warehouses w ON i.warehouse_id = w.warehouse_id
+        LEFT JOIN categories c ON p.category_id = c.category_id
+        LEFT JOIN suppliers s ON s.supplier_id = i.supplier_id
+        WHERE p.is_active = TRUE AND w.is_active = TRUE
+        GROUP BY p.product_id, p.sku, p.product_name, c.category_name,
+                 w.warehouse_id, w.warehouse_name, p.reorder_quantity, p.cost_price
+        ORDER BY p.sku, w.warehouse_name;
+        """
+        return self.db.execute_query(query)
+    
+    def get_daily_demand(self, days=90):
+        """Get daily sales quantity per product per warehouse"""
+        query = """
+        SELECT 
+            th.product_id,
+            th.warehouse_id,
+            th.transaction_date::date as "Date",
+            SUM(ABS(th.quantity_change)) as "Quantity"
+        FROM transaction_history th
+        WHERE th.transaction_type = 'sale'
+          AND th.transaction_date >= CURRENT_DATE - CAST(%s || ' days' AS INTERVAL)
+        GROUP BY th.product_id, th.warehouse_id, th.transaction_date::date
+        """
+        return self.db.execute_query(query, (days,))
+    
     def get_expiring_products(self, days=90):
         """Get products expiring within specified days - Not available in minimal schema"""
         # Return empty dataframe as minimal schema doesn't track expiry dates
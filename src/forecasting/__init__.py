@@ -4,6 +4,13 @@ Provides inventory demand forecasting using ML models optimized for medium-sized
 """
 
 from .predictor import InventoryForecaster
-from .models import ProphetModel, XGBoostModel, EnsembleModel
+from .models import ProphetModel, XGBoostModel, EnsembleModel, CrostonModel, SBAModel, TSBModel
+from .backtest import BacktestEngine
+from .selection import CostAwareSelector
+from .registry import ModelRegistry
+from .features import FeatureStore
+from .tuning import XGBoostTuner
 
-__all__ = ['InventoryForecaster', 'ProphetModel', 'XGBoostModel', 'EnsembleModel']
+__all__ = ['InventoryForecaster', 'ProphetModel', 'XGBoostModel', 'EnsembleModel',
+           'CrostonModel', 'SBAModel', 'TSBModel', 'BacktestEngine', 'CostAwareSelector',
+           'ModelRegistry', 'FeatureStore', 'XGBoostTuner']
@@ -3,16 +3,238 @@ Forecasting API Endpoints
 Provides REST API for inventory forecasting
 """
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
+import json
+import numpy as np
 import pandas as pd
+from typing import Dict, Optional
 from ..forecasting import InventoryForecaster
-from ..api.data_api import DashboardDataAPI
+from ..forecasting.jobs import ForecastJob, ForecastJobQueue, QueueFullError
+from ..forecasting.models import data_fingerprint, prophet_state
+from ..forecasting.cache import get_forecast_cache
+from ..forecasting.hierarchy import LEVELS, forecast_hierarchy
+from ..forecasting.registry import get_model_registry
+from ..forecasting.tuning import ALL_CATEGORIES, XGBoostTuner
+from ..forecasting.simulation import StockoutSimulator, stockout_risk
+from ..forecasting.serialization import columnar_forecasts, dumps
+from ..forecasting.reorder import PANEL_MODELS, SORT_KEYS, reorder_plan, sort_plan
+from ..api.data_api import get_api_instance
 
 # Create blueprint
 forecast_bp = Blueprint('forecast', __name__, url_prefix='/api/forecast')
 
-# Initialize data API
-data_api = DashboardDataAPI()
+# Shared data API (one dashboard snapshot for the whole server)
+data_api = get_api_instance()
+
+# Finished demand forecasts, shared by concurrent identical requests
+forecast_cache = get_forecast_cache()
+
+
+def _load_transactions() -> pd.DataFrame:
+    """Get transaction history from the dashboard data"""
+    dashboard_data = data_api.get_dashboard_data()
+    return dashboard_data['transactions'].to_frame()
+
+
+def _demand_params(params: Dict) -> Dict:
+    """
+    Normalize demand forecast parameters from a JSON body
+    
+    prepare_data matches ids as strings, so 5 and "5" must share one cache
+    entry and one deduplicated job.
+    
+    Raises:
+        ValueError: For non-numeric periods or time_budget
+    """
+    params = dict(params)
+    if params.get('product_id') is not None:
+        params['product_id'] = str(params['product_id'])
+    params['periods'] = int(params.get('periods', 30))
+    if params.get('time_budget') is not None:
+        params['time_budget'] = float(params['time_budget'])
+    return params
+
+
+def _run_demand_forecast(params: Dict, transactions: pd.DataFrame, job: Optional[ForecastJob] = None) -> Dict:
+    """Prepare, fit and predict a single demand forecast (cached per data version)"""
+    params = _demand_params(params)
+    product_id = params.get('product_id')
+    periods = params['periods']
+    model_type = params.get('model', 'auto')
+    time_budget = params.get('time_budget')
+    
+    # Initialize forecaster (accuracy backtest runs in the background)
+    forecaster = InventoryForecaster(model_type=model_type, metrics_mode='background',
+                                     time_budget=time_budget)
+    
+    # Prepare data; its fingerprint is the cache's data version
+    if job:
+        job.update_progress(1, 4, 'Preparing data')
+    forecaster.prepare_data(
+        transactions,
+        product_id=product_id,
+        date_col='Date',
+        quantity_col='Quantity',
+        product_col='product_id'
+    )
+    
+    def _fit_and_predict():
+        if job:
+            job.update_progress(2, 4, 'Training model')
+        forecaster.fit()
+        
+        # Generate forecast
+        if job:
+            job.update_progress(3, 4, 'Generating forecast')
+        forecast = forecaster.predict(periods)
+        
+        return forecaster, {
+            'product_id': product_id,
+            'periods': periods,
+            'model': forecaster.model.name,
+            'selection': forecaster.selection,
+            'forecast': forecaster.to_dict(forecast)
+        }
+    
+    (fitted, result), source = forecast_cache.get_or_compute(
+        (product_id, periods, model_type, time_budget),
+        data_fingerprint(forecaster.data),
+        _fit_and_predict
+    )
+    
+    return {
+        **result,
+        'metrics': fitted.get_metrics(wait=job is not None),
+        'cache': source
+    }
+
+
+def _run_batch_forecast(params: Dict, transactions: pd.DataFrame, job: Optional[ForecastJob] = None) -> Dict:
+    """Generate forecasts for multiple products"""
+    periods = params.get('periods', 30)
+    top_n = params.get('top_n')
+    
+    # Initialize forecaster (simple by default; 'auto' with a time budget is cost-aware)
+    forecaster = InventoryForecaster(model_type=params.get('model', 'simple'),
+                                     time_budget=params.get('time_budget'))
+    
+    # Generate forecasts
+    forecasts = forecaster.forecast_all_products(
+        transactions,
+        periods=periods,
+        top_n=top_n,
+        product_col='product_id',
+        progress_callback=job.update_progress if job else None
+    )
+    
+    # Convert to serializable format
+    if params.get('format') == 'columnar':
+        result = columnar_forecasts(forecasts)
+    else:
+        result = {product_id: forecaster.to_dict(forecast) for product_id, forecast in forecasts.items()}
+    
+    return {
+        'products_forecasted': len(forecasts),
+        'periods': periods,
+        'format': params.get('format', 'rows'),
+        'forecasts': result
+    }
+
+
+def _run_tuning(params: Dict, transactions: pd.DataFrame, job: Optional[ForecastJob] = None) -> Dict:
+    """Tune XGBoost settings for a category on its most active products"""
+    category = params.get('category')
+    product_col = params.get('product_col', 'product_id')
+    
+    if job:
+        job.update_progress(1, 3, 'Preparing series')
+    if category:
+        transactions = transactions[transactions['Category'] == category]
+    if transactions.empty:
+        raise ValueError(f"No transactions for category: {category}")
+    
+    forecaster = InventoryForecaster(model_type='xgboost')
+    products = transactions[product_col].value_counts().index[:params.get('max_series', 20)]
+    series = [
+        forecaster.prepare_data(transactions, product_id=product_id, product_col=product_col)
+        for product_id in products
+    ]
+    
+    if job:
+        job.update_progress(2, 3, 'Searching hyperparameters')
+    tuner = XGBoostTuner(n_configs=params.get('n_configs', 18))
+    result = tuner.tune(category, series, time_budget=params.get('time_budget', 60))
+    
+    return {'category': category or ALL_CATEGORIES, **result}
+
+
+def _run_stockout_risk(params: Dict, job: Optional[ForecastJob] = None) -> Dict:
+    """Simulate lead-time stockout risk for every stock position"""
+    history_days = params.get('history_days', 90)
+    
+    positions = data_api.get_reorder_positions()
+    if params.get('warehouse'):
+        positions = positions[positions['Warehouse'] == params['warehouse']]
+    
+    simulator = StockoutSimulator(
+        n_scenarios=params.get('scenarios', 10000),
+        lead_time_cv=params.get('lead_time_cv', 0.2),
+        memory_budget_mb=params.get('memory_mb', 256),
+        seed=params.get('seed', 42)
+    )
+    risk = stockout_risk(
+        positions,
+        data_api.get_daily_demand(days=history_days),
+        history_days=history_days,
+        model=params.get('model', 'tsb'),
+        default_lead_time=params.get('default_lead_time', 7),
+        simulator=simulator,
+        progress_callback=job.update_progress if job else None
+    )
+    risk = risk.sort_values(['stockout_probability', 'expected_shortfall'], ascending=False)
+    
+    summary = {
+        'positions': len(risk),
+        'scenarios': simulator.n_scenarios,
+        'at_risk': int((risk['stockout_probability'] >= params.get('risk_threshold', 0.05)).sum()),
+        'expected_shortfall_units': round(float(risk['expected_shortfall'].sum()), 2)
+    }
+    if params.get('limit'):
+        risk = risk.head(params['limit'])
+    
+    return {
+        'summary': summary,
+        'items': risk.to_dict('records')
+    }
+
+
+def _json_response(payload: Dict, status: int = 200) -> Response:
+    """JSON response through the fast encoder (for large forecast payloads)"""
+    return Response(dumps(payload), status=status, mimetype='application/json')
+
+
+def _submit_job(kind: str, params: Dict):
+    """Queue a forecast job and return the 202 response"""
+    try:
+        job, created = job_queue.submit(kind, params)
+    except QueueFullError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 503
+    
+    return jsonify({
+        'success': True,
+        'data': {**job.to_dict(), 'deduplicated': not created}
+    }), 202
+
+
+# Background job queue for long-running forecasts
+job_queue = ForecastJobQueue()
+job_queue.register('demand', lambda params, job: _run_demand_forecast(params, _load_transactions(), job))
+job_queue.register('batch', lambda params, job: _run_batch_forecast(params, _load_transactions(), job))
+job_queue.register('stockout_risk', lambda params, job: _run_stockout_risk(params, job))
+job_queue.register('tune', lambda params, job: _run_tuning(params, _load_transactions(), job))
 
 
 @forecast_bp.route('/demand', methods=['POST'])
@@ -20,20 +242,71 @@ def forecast_demand():
     """
     Generate demand forecast for a product
     
+    Results are cached per product, horizon, model and transaction data; identical
+    concurrent requests share one computation.
+    
     Request body:
         product_id: Product ID to forecast (optional, forecasts all if not provided)
         periods: Number of days to forecast (default: 30)
-        model: Model type - 'auto', 'prophet', 'xgboost', 'simple' (default: 'auto')
+        model: Model type - 'auto', 'prophet', 'xgboost', 'simple', 'croston', 'sba', 'tsb' (default: 'auto')
+        time_budget: Seconds allowed for fit + predict when model is 'auto' (optional)
+        async: Run as a background job and return its id (default: false)
+    """
+    try:
+        params = request.get_json() or {}
+        run_async = params.pop('async', False)
+        
+        try:
+            params = _demand_params(params)
+        except (TypeError, ValueError) as e:
+            return jsonify({
+                'success': False,
+                'error': f"Invalid parameters: {e}"
+            }), 400
+        
+        if run_async:
+            return _submit_job('demand', params)
+        
+        # Get transaction data
+        transactions = _load_transactions()
+        
+        if transactions.empty:
+            return jsonify({
+                'success': False,
+                'error': 'No transaction data available'
+            }), 400
+        
+        return jsonify({
+            'success': True,
+            'data': _run_demand_forecast(params, transactions)
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@forecast_bp.route('/backtest', methods=['POST'])
+def backtest_model():
+    """
+    Run a rolling-origin backtest for a product and model on demand
+    
+    Request body:
+        product_id: Product ID to evaluate (optional, aggregate if not provided)
+        model: Model type - 'auto', 'prophet', 'xgboost', 'simple', 'croston', 'sba', 'tsb' (default: 'auto')
+        horizon: Test window per fold in days (optional)
     """
     try:
         params = request.get_json() or {}
         product_id = params.get('product_id')
-        periods = params.get('periods', 30)
         model_type = params.get('model', 'auto')
+        horizon = params.get('horizon')
         
         # Get transaction data
         dashboard_data = data_api.get_dashboard_data()
-        transactions = pd.DataFrame(dashboard_data['transactions'])
+        transactions = dashboard_data['transactions'].to_frame()
         
         if transactions.empty:
             return jsonify({
@@ -41,30 +314,195 @@ def forecast_demand():
                 'error': 'No transaction data available'
             }), 400
         
-        # Initialize forecaster
         forecaster = InventoryForecaster(model_type=model_type)
-        
-        # Prepare and fit
-        forecaster.prepare_data(
+        data = forecaster.prepare_data(
             transactions,
             product_id=product_id,
             date_col='Date',
             quantity_col='Quantity',
-            product_col='Product_ID'
+            product_col='product_id'
         )
-        forecaster.fit()
-        
-        # Generate forecast
-        forecast = forecaster.predict(periods)
+        model = forecaster._select_model(data)
+        metrics = forecaster.backtest_engine.evaluate(model, data, horizon=horizon)
         
         return jsonify({
             'success': True,
             'data': {
                 'product_id': product_id,
-                'periods': periods,
-                'model': forecaster.model.name,
-                'metrics': forecaster.get_metrics(),
-                'forecast': forecaster.to_dict(forecast)
+                'model': model.name,
+                'metrics': metrics
+            }
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@forecast_bp.route('/timings', methods=['GET'])
+def get_model_timings():
+    """Get per-series Prophet fit/predict wall times and warm-start counts"""
+    return jsonify({
+        'success': True,
+        'data': {
+            'prophet': prophet_state.stats()
+        }
+    })
+
+
+@forecast_bp.route('/tune', methods=['POST'])
+def tune_xgboost():
+    """
+    Tune XGBoost hyperparameters for a category and store the winner
+    
+    Later XGBoost fits for products of that category use the stored settings.
+    
+    Request body:
+        category: Category to tune (optional, all categories if not provided)
+        time_budget: Wall-clock seconds for the search (default: 60)
+        n_configs: Configurations in the first rung (default: 18)
+        max_series: Most active products used for tuning (default: 20)
+        async: Run as a background job and return its id (default: false)
+    """
+    try:
+        params = request.get_json() or {}
+        run_async = params.pop('async', False)
+        
+        if run_async:
+            return _submit_job('tune', params)
+        
+        return jsonify({
+            'success': True,
+            'data': _run_tuning(params, _load_transactions())
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@forecast_bp.route('/tune', methods=['GET'])
+def get_tuned_params():
+    """Get the stored XGBoost settings per category"""
+    return jsonify({
+        'success': True,
+        'data': get_model_registry().section(XGBoostTuner.SECTION)
+    })
+
+
+@forecast_bp.route('/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Get forecast cache hit ratio and compute time saved"""
+    return jsonify({
+        'success': True,
+        'data': forecast_cache.stats()
+    })
+
+
+@forecast_bp.route('/cache/invalidate', methods=['POST'])
+def invalidate_cache():
+    """
+    Drop cached forecasts, e.g. after new transactions were recorded
+    
+    Forecasts are also invalidated automatically the next time a request sees
+    changed transaction data for the product.
+    
+    Request body:
+        product_id: Product whose forecasts are dropped (optional, all if not provided)
+    """
+    params = request.get_json(silent=True) or {}
+    product_id = params.get('product_id')
+    # Cache keys hold ids as strings (see _demand_params)
+    removed = forecast_cache.invalidate(None if product_id is None else str(product_id))
+    return jsonify({
+        'success': True,
+        'data': {'removed': removed}
+    })
+
+
+@forecast_bp.route('/reorder', methods=['GET'])
+def get_reorder_plan():
+    """
+    Get reorder recommendations for every SKU x warehouse
+    
+    Stock, reserved quantity and supplier lead times come from the database;
+    demand is forecast for all positions in one vectorized pass.
+    
+    Query params:
+        history_days: Days of sales history used (default: 90)
+        model: Panel model - croston, sba, tsb (default: tsb)
+        sort: urgency, days_until_stockout, order_value, order_qty (default: urgency)
+        warehouse: Only this warehouse name (optional)
+        only_reorder: Only positions that should be reordered (default: false)
+        limit: Maximum items returned (optional)
+        safety_stock_multiplier: Safety stock factor (default: 1.5)
+        service_level: Service level for quantile-based safety stock, e.g. 0.95 (optional)
+        review_days: Days of demand covered beyond the reorder point (default: 14)
+        default_lead_time: Lead time for positions without a supplier (default: 7)
+    """
+    try:
+        history_days = request.args.get('history_days', 90, type=int)
+        warehouse = request.args.get('warehouse')
+        only_reorder = request.args.get('only_reorder', 'false').lower() == 'true'
+        limit = request.args.get('limit', type=int)
+        model = request.args.get('model', 'tsb')
+        sort = request.args.get('sort', 'urgency')
+        service_level = request.args.get('service_level', type=float)
+        
+        if model not in PANEL_MODELS or sort not in SORT_KEYS:
+            return jsonify({
+                'success': False,
+                'error': f"model must be one of {list(PANEL_MODELS)} and sort one of {list(SORT_KEYS)}"
+            }), 400
+        
+        if service_level is not None and not 0 < service_level < 1:
+            return jsonify({
+                'success': False,
+                'error': 'service_level must be between 0 and 1'
+            }), 400
+        
+        positions = data_api.get_reorder_positions()
+        if warehouse:
+            positions = positions[positions['Warehouse'] == warehouse]
+        demand = data_api.get_daily_demand(days=history_days)
+        
+        plan = reorder_plan(
+            positions,
+            demand,
+            history_days=history_days,
+            model=model,
+            safety_stock_multiplier=request.args.get('safety_stock_multiplier', 1.5, type=float),
+            review_days=request.args.get('review_days', 14, type=int),
+            default_lead_time=request.args.get('default_lead_time', 7, type=int),
+            service_level=service_level
+        )
+        plan = sort_plan(plan, sort)
+        
+        summary = {
+            'positions': len(plan),
+            'should_reorder': int(plan['should_reorder'].sum()),
+            'by_status': plan['status'].value_counts().to_dict(),
+            'total_order_value': round(float(plan['order_value'].sum()), 2)
+        }
+        
+        if only_reorder:
+            plan = plan[plan['should_reorder']]
+        if limit:
+            plan = plan.head(limit)
+        
+        # No demand means no stockout: infinite cover is reported as null
+        plan = plan.replace([np.inf, -np.inf], np.nan).astype(object)
+        items = plan.where(plan.notna(), None).to_dict('records')
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'summary': summary,
+                'items': items
             }
         })
         
@@ -75,6 +513,93 @@ def forecast_demand():
         }), 500
 
 
+@forecast_bp.route('/hierarchy', methods=['POST'])
+def hierarchical_forecast():
+    """
+    Generate coherent forecasts for total, category, product and product x warehouse
+    
+    Request body:
+        periods: Days to forecast (default: 30)
+        history_days: Days of sales history used (default: 90)
+        model: Bottom-level panel model - croston, sba, tsb (default: tsb)
+        levels: Levels to return (default: ['total', 'category', 'product'])
+    """
+    try:
+        params = request.get_json() or {}
+        model = params.get('model', 'tsb')
+        levels = params.get('levels', ['total', 'category', 'product'])
+        history_days = params.get('history_days', 90)
+        
+        unknown = [level for level in levels if level not in LEVELS]
+        if model not in PANEL_MODELS or unknown:
+            return jsonify({
+                'success': False,
+                'error': f"model must be one of {list(PANEL_MODELS)} and levels within {LEVELS}"
+            }), 400
+        
+        result = forecast_hierarchy(
+            data_api.get_reorder_positions(),
+            data_api.get_daily_demand(days=history_days),
+            periods=params.get('periods', 30),
+            history_days=history_days,
+            model=model,
+            levels=levels
+        )
+        
+        return jsonify({
+            'success': True,
+            'data': result
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@forecast_bp.route('/stockout-risk', methods=['POST'])
+def simulate_stockout_risk():
+    """
+    Monte Carlo stockout probability and expected shortfall during lead time
+    
+    Request body:
+        scenarios: Scenarios per position (default: 10000)
+        lead_time_cv: Lead-time variability relative to its mean (default: 0.2)
+        memory_mb: Memory budget for scenario arrays (default: 256)
+        seed: Random seed (default: 42)
+        history_days: Days of sales history used (default: 90)
+        model: Panel model - croston, sba, tsb (default: tsb)
+        warehouse: Only this warehouse name (optional)
+        risk_threshold: Probability counted as at risk in the summary (default: 0.05)
+        limit: Maximum items returned, riskiest first (optional)
+        async: Run as a background job and return its id (default: false)
+    """
+    try:
+        params = request.get_json() or {}
+        run_async = params.pop('async', False)
+        
+        if params.get('model', 'tsb') not in PANEL_MODELS:
+            return jsonify({
+                'success': False,
+                'error': f"model must be one of {list(PANEL_MODELS)}"
+            }), 400
+        
+        if run_async:
+            return _submit_job('stockout_risk', params)
+        
+        return jsonify({
+            'success': True,
+            'data': _run_stockout_risk(params)
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @forecast_bp.route('/reorder/<product_id>', methods=['GET'])
 def get_reorder_recommendation(product_id: str):
     """
@@ -83,10 +608,15 @@ def get_reorder_recommendation(product_id: str):
     Query params:
         current_stock: Current inventory level
         lead_time: Supplier lead time in days (default: 7)
+        service_level: Service level for quantile-based safety stock, e.g. 0.95 (optional)
+        warehouse_id: Warehouse whose demand sketch sizes the safety stock (optional;
+                      without it, or without a sketch, the multiplier is used)
     """
     try:
         current_stock = request.args.get('current_stock', type=int)
         lead_time = request.args.get('lead_time', 7, type=int)
+        service_level = request.args.get('service_level', type=float)
+        warehouse_id = request.args.get('warehouse_id')
         
         if current_stock is None:
             return jsonify({
@@ -94,9 +624,15 @@ def get_reorder_recommendation(product_id: str):
                 'error': 'current_stock parameter required'
             }), 400
         
+        if service_level is not None and not 0 < service_level < 1:
+            return jsonify({
+                'success': False,
+                'error': 'service_level must be between 0 and 1'
+            }), 400
+        
         # Get transaction data
         dashboard_data = data_api.get_dashboard_data()
-        transactions = pd.DataFrame(dashboard_data['transactions'])
+        transactions = dashboard_data['transactions'].to_frame()
         
         # Generate forecast
         forecaster = InventoryForecaster(model_type='auto')
@@ -105,7 +641,7 @@ def get_reorder_recommendation(product_id: str):
             product_id=product_id,
             date_col='Date',
             quantity_col='Quantity',
-            product_col='Product_ID'
+            product_col='product_id'
         )
         forecaster.fit()
         forecast = forecaster.predict(lead_time + 14)  # Lead time + buffer
@@ -114,7 +650,9 @@ def get_reorder_recommendation(product_id: str):
         recommendation = forecaster.get_reorder_recommendations(
             forecast,
             current_stock=current_stock,
-            lead_time_days=lead_time
+            lead_time_days=lead_time,
+            service_level=service_level,
+            sketch_key=f"{product_id}:{warehouse_id}" if warehouse_id else None
         )
         
         return jsonify({
@@ -137,39 +675,28 @@ def batch_forecast():
     Request body:
         periods: Days to forecast (default: 30)
         top_n: Limit to top N products (optional)
+        model: Model type (default: 'simple')
+        time_budget: Seconds allowed per product fit + predict when model is 'auto' (optional)
+        format: 'rows' (one list of daily records per product) or 'columnar'
+                (shared date axis plus per-product value arrays) (default: 'rows')
+        async: Run as a background job and return its id (default: false)
     """
     try:
         params = request.get_json() or {}
-        periods = params.get('periods', 30)
-        top_n = params.get('top_n')
+        run_async = params.pop('async', False)
         
-        # Get transaction data
-        dashboard_data = data_api.get_dashboard_data()
-        transactions = pd.DataFrame(dashboard_data['transactions'])
-        
-        # Initialize forecaster
-        forecaster = InventoryForecaster(model_type='simple')  # Use simple for batch
-        
-        # Generate forecasts
-        forecasts = forecaster.forecast_all_products(
-            transactions,
-            periods=periods,
-            top_n=top_n,
-            product_col='Product_ID'
-        )
+        if params.get('format', 'rows') not in ('rows', 'columnar'):
+            return jsonify({
+                'success': False,
+                'error': "format must be 'rows' or 'columnar'"
+            }), 400
         
-        # Convert to serializable format
-        result = {}
-        for product_id, forecast in forecasts.items():
-            result[product_id] = forecaster.to_dict(forecast)
+        if run_async:
+            return _submit_job('batch', params)
         
-        return jsonify({
+        return _json_response({
             'success': True,
-            'data': {
-                'products_forecasted': len(result),
-                'periods': periods,
-                'forecasts': result
-            }
+            'data': _run_batch_forecast(params, _load_transactions())
         })
         
     except Exception as e:
@@ -177,3 +704,126 @@ def batch_forecast():
             'success': False,
             'error': str(e)
         }), 500
+
+
+@forecast_bp.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    Submit a background forecast job
+    
+    Request body:
+        type: Job type - 'demand' or 'batch'
+        params: Parameters of the matching synchronous endpoint
+    """
+    try:
+        body = request.get_json() or {}
+        kind = body.get('type')
+        
+        if kind not in ('demand', 'batch'):
+            return jsonify({
+                'success': False,
+                'error': "type must be 'demand' or 'batch'"
+            }), 400
+        
+        params = body.get('params') or {}
+        if kind == 'demand':
+            try:
+                params = _demand_params(params)
+            except (TypeError, ValueError) as e:
+                return jsonify({
+                    'success': False,
+                    'error': f"Invalid parameters: {e}"
+                }), 400
+        
+        return _submit_job(kind, params)
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@forecast_bp.route('/jobs/stats', methods=['GET'])
+def get_job_stats():
+    """Get background job queue statistics"""
+    return jsonify({
+        'success': True,
+        'data': job_queue.stats()
+    })
+
+
+@forecast_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id: str):
+    """Get status and progress of a background job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found or expired'
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'data': job.to_dict()
+    })
+
+
+@forecast_bp.route('/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id: str):
+    """Get the result of a completed background job (202 while still running)"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found or expired'
+        }), 404
+    
+    if job.status == 'failed':
+        return jsonify({
+            'success': False,
+            'error': job.error,
+            'data': job.to_dict()
+        }), 500
+    
+    if not job.is_done:
+        return jsonify({
+            'success': True,
+            'data': job.to_dict()
+        }), 202
+    
+    return _json_response({
+        'success': True,
+        'data': job.result
+    })
+
+
+@forecast_bp.route('/jobs/<job_id>/stream', methods=['GET'])
+def stream_job(job_id: str):
+    """
+    Stream job status updates as Server-Sent Events
+    
+    Emits a 'status' event on every change and a final 'done' event.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found or expired'
+        }), 404
+    
+    def generate():
+        version = -1
+        while True:
+            current = job.wait_for_change(version, timeout=15)
+            if current == version and not job.is_done:
+                yield ': keep-alive\n\n'
+                continue
+            version = current
+            event = 'done' if job.is_done else 'status'
+            yield f"event: {event}\ndata: {json.dumps(job.to_dict())}\n\n"
+            if job.is_done:
+                break
+    
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
@@ -0,0 +1,245 @@
+"""
+Backtesting Engine - Rolling-origin accuracy evaluation for forecasting models
+Runs folds in parallel and caches metrics per model configuration and data fingerprint
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .models import BaseModel, data_fingerprint
+
+
+def model_signature(model: BaseModel) -> str:
+    """Identify a model configuration (class + hyperparameters)"""
+    params = sorted(model.get_params().items())
+    return f"{model.__class__.__name__}:{params!r}"
+
+
+def calculate_errors(actual: np.ndarray, predicted: np.ndarray) -> Dict:
+    """Calculate MAE, RMSE and MAPE between actual and predicted values"""
+    actual = np.asarray(actual, dtype=np.float64)
+    predicted = np.asarray(predicted, dtype=np.float64)
+    errors = actual - predicted
+
+    return {
+        'mae': round(float(np.mean(np.abs(errors))), 2),
+        'rmse': round(float(np.sqrt(np.mean(errors ** 2))), 2),
+        'mape': round(float(np.mean(np.abs(errors / (actual + 1))) * 100), 2)
+    }
+
+
+class BacktestEngine:
+    """
+    Rolling-origin backtesting with parallel folds
+
+    The last `holdout_fraction` of the series is split into `n_folds` consecutive
+    test windows. Each fold trains a clone of the model on everything before its
+    window and forecasts the window, so every fold only ever sees the past.
+
+    Window ends are anchored to calendar days that are multiples of the window
+    length (up to window - 1 of the newest days are left out), so appending a
+    day keeps the cut points - and the fitted fold models - of the previous
+    evaluation until the window length itself changes.
+    """
+
+    def __init__(self,
+                 n_folds: int = 3,
+                 holdout_fraction: float = 0.2,
+                 min_train_size: int = 30,
+                 max_workers: int = 4,
+                 reuse_models: bool = True,
+                 cache_size: int = 512,
+                 model_cache_size: int = 64):
+        """
+        Initialize backtesting engine
+
+        Args:
+            n_folds: Number of rolling-origin folds
+            holdout_fraction: Share of the series used as test windows
+            min_train_size: Minimum data points required to backtest
+            max_workers: Maximum folds trained concurrently
+            reuse_models: Keep fitted fold models for identical training prefixes
+                          (e.g. re-evaluation after new days were appended)
+            cache_size: Maximum cached metric results
+            model_cache_size: Maximum fitted fold models kept for reuse
+        """
+        self.n_folds = n_folds
+        self.holdout_fraction = holdout_fraction
+        self.min_train_size = min_train_size
+        self.reuse_models = reuse_models
+        self.cache_size = cache_size
+        self.model_cache_size = model_cache_size
+
+        self._fold_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='backtest-fold')
+        self._background_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='backtest')
+        self._lock = threading.Lock()
+        self._metrics_cache = OrderedDict()
+        self._fold_models = OrderedDict()
+        self._pending = {}
+
+    def get_folds(self, n: int, horizon: Optional[int] = None,
+                  dates: Optional[pd.Series] = None) -> List[Tuple[int, int]]:
+        """
+        Compute fold boundaries for a series of length n
+
+        Args:
+            n: Series length
+            horizon: Test window per fold (default: holdout split evenly across folds)
+            dates: Sorted dates of the series; the last window then ends on the
+                   last calendar day that is a multiple of the horizon (optional)
+
+        Returns:
+            List of (train_end, test_end) index pairs, oldest origin first
+        """
+        if horizon is None:
+            horizon = max(1, int(n * self.holdout_fraction) // self.n_folds)
+
+        end = n
+        if dates is not None and n:
+            days = np.asarray(pd.to_datetime(dates).values.astype('datetime64[D]').astype(np.int64))
+            end = int(np.searchsorted(days, (days[-1] + 1) // horizon * horizon))
+
+        folds = []
+        for i in range(self.n_folds, 0, -1):
+            train_end = end - i * horizon
+            if train_end >= self.min_train_size:
+                folds.append((train_end, train_end + horizon))
+
+        return folds
+
+    def _cache_key(self, model: BaseModel, fingerprint: str, horizon: Optional[int]) -> Tuple:
+        return (model_signature(model), fingerprint, self.n_folds, self.holdout_fraction, horizon)
+
+    def _remember(self, cache: OrderedDict, key, value, max_size: int) -> None:
+        with self._lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > max_size:
+                cache.popitem(last=False)
+
+    def _run_fold(self, model: BaseModel, data: pd.DataFrame, train_end: int, test_end: int) -> Dict:
+        """Train on data[:train_end] and forecast data[train_end:test_end]"""
+        train = data.iloc[:train_end]
+        test = data.iloc[train_end:test_end]
+
+        fold_model = None
+        fold_key = None
+        if self.reuse_models:
+            fold_key = (model_signature(model), data_fingerprint(train))
+            with self._lock:
+                fold_model = self._fold_models.get(fold_key)
+
+        if fold_model is None:
+            fold_model = model.clone()
+            # Fold training sets are prefixes of the series, so their feature rows
+            # are slices of the shared store's rows (warm-start state is not shared)
+            fold_model.feature_key = model.feature_key
+            fold_model.fit(train)
+            if fold_key is not None:
+                self._remember(self._fold_models, fold_key, fold_model, self.model_cache_size)
+
+        predictions = fold_model.predict(len(test))
+
+        return {
+            'actual': test['y'].values,
+            'predicted': predictions['forecast'].values[:len(test)],
+            'train_size': train_end
+        }
+
+    def get_cached(self, model: BaseModel, data: pd.DataFrame, horizon: Optional[int] = None) -> Optional[Dict]:
+        """Get previously computed metrics without running a backtest"""
+        key = self._cache_key(model, data_fingerprint(data), horizon)
+        with self._lock:
+            return self._metrics_cache.get(key)
+
+    def evaluate(self, model: BaseModel, data: pd.DataFrame, horizon: Optional[int] = None) -> Dict:
+        """
+        Backtest a model configuration on a prepared series
+
+        Args:
+            model: Model whose configuration is evaluated (it is cloned, never refitted)
+            data: Prepared DataFrame with 'ds' and 'y' columns
+            horizon: Test window per fold (optional)
+
+        Returns:
+            Accuracy metrics pooled over all folds plus per-fold metrics
+        """
+        key = self._cache_key(model, data_fingerprint(data), horizon)
+        with self._lock:
+            if key in self._metrics_cache:
+                self._metrics_cache.move_to_end(key)
+                return self._metrics_cache[key]
+
+        folds = self.get_folds(len(data), horizon, dates=data['ds'])
+        if len(data) < self.min_train_size or not folds:
+            return {'note': 'Insufficient data for CV'}
+
+        try:
+            futures = [
+                self._fold_pool.submit(self._run_fold, model, data, train_end, test_end)
+                for train_end, test_end in folds
+            ]
+            results = [future.result() for future in futures]
+
+            actual = np.concatenate([r['actual'] for r in results])
+            predicted = np.concatenate([r['predicted'] for r in results])
+
+            metrics = calculate_errors(actual, predicted)
+            metrics.update({
+                'train_size': results[-1]['train_size'],
+                'test_size': len(actual),
+                'folds': len(results),
+                'fold_metrics': [
+                    {'train_size': r['train_size'], **calculate_errors(r['actual'], r['predicted'])}
+                    for r in results
+                ]
+            })
+        except Exception as e:
+            return {'error': str(e)}
+
+        self._remember(self._metrics_cache, key, metrics, self.cache_size)
+        return metrics
+
+    def submit(self, model: BaseModel, data: pd.DataFrame, horizon: Optional[int] = None) -> Future:
+        """
+        Run a backtest in the background
+
+        Identical in-flight requests share one Future.
+        """
+        key = self._cache_key(model, data_fingerprint(data), horizon)
+
+        with self._lock:
+            if key in self._metrics_cache:
+                future = Future()
+                future.set_result(self._metrics_cache[key])
+                return future
+            if key in self._pending:
+                return self._pending[key]
+
+            future = self._background_pool.submit(self.evaluate, model, data, horizon)
+            self._pending[key] = future
+
+        def _done(_):
+            with self._lock:
+                self._pending.pop(key, None)
+
+        future.add_done_callback(_done)
+        return future
+
+    def clear(self) -> None:
+        """Drop cached metrics and fold models"""
+        with self._lock:
+            self._metrics_cache.clear()
+            self._fold_models.clear()
+
+
+def get_backtest_engine() -> BacktestEngine:
+    """Get the shared backtesting engine"""
+    if not hasattr(get_backtest_engine, 'instance'):
+        get_backtest_engine.instance = BacktestEngine()
+    return get_backtest_engine.instance
@@ -0,0 +1,163 @@
+"""
+Forecast Result Cache
+In-memory cache of finished forecasts with single-flight computation,
+per-product invalidation and hit/saved-time statistics
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class ForecastCache:
+    """
+    LRU cache of forecast results
+
+    Keys end with a data version (the fingerprint of the product's prepared
+    series). When a request arrives with a new version for a product, entries
+    built from older versions of that product are dropped, so new transactions
+    invalidate a product's forecasts without touching other products.
+    Identical requests arriving while a result is being computed wait for that
+    single computation instead of starting their own.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = None):
+        """
+        Initialize cache
+
+        Args:
+            max_entries: Maximum cached results
+            ttl: Seconds a result stays valid (None = until invalidated or evicted)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._versions = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.coalesced = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.saved_seconds = 0.0
+        self.compute_seconds = 0.0
+
+    def _drop_product(self, product_id: Hashable) -> int:
+        """Remove every entry of a product (caller holds the lock)"""
+        stale = [key for key in self._entries if key[0] == product_id]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def get_or_compute(self,
+                       key: Tuple,
+                       version: str,
+                       compute: Callable[[], Any]) -> Tuple[Any, str]:
+        """
+        Get a cached result or compute it once
+
+        Args:
+            key: (product_id, ...request parameters); the product id must come first
+            version: Data version the result is computed from
+            compute: Callable producing the result
+
+        Returns:
+            (result, source) where source is 'hit', 'coalesced' or 'computed'
+        """
+        product_id = key[0]
+        full_key = key + (version,)
+
+        with self._lock:
+            if self._versions.get(product_id) != version:
+                if product_id in self._versions:
+                    self.invalidations += self._drop_product(product_id)
+                self._versions[product_id] = version
+
+            entry = self._entries.get(full_key)
+            if entry is not None and (self.ttl is None or time.time() - entry['created_at'] < self.ttl):
+                self._entries.move_to_end(full_key)
+                self.hits += 1
+                self.saved_seconds += entry['seconds']
+                return entry['value'], 'hit'
+
+            future = self._in_flight.get(full_key)
+            if future is None:
+                future = self._in_flight[full_key] = Future()
+                self.misses += 1
+                owner = True
+            else:
+                self.coalesced += 1
+                owner = False
+
+        if not owner:
+            value, seconds = future.result()
+            with self._lock:
+                self.saved_seconds += seconds
+            return value, 'coalesced'
+
+        start = time.perf_counter()
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                self._in_flight.pop(full_key, None)
+            future.set_exception(e)
+            raise
+
+        seconds = time.perf_counter() - start
+        with self._lock:
+            self._in_flight.pop(full_key, None)
+            self.compute_seconds += seconds
+            # Skip storing if the product was invalidated while computing
+            if self._versions.get(product_id) == version:
+                self._entries[full_key] = {'value': value, 'seconds': seconds, 'created_at': time.time()}
+                self._entries.move_to_end(full_key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        future.set_result((value, seconds))
+        return value, 'computed'
+
+    def invalidate(self, product_id: Optional[Hashable] = None) -> int:
+        """
+        Drop cached results of one product (or all products)
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if product_id is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._versions.clear()
+            else:
+                removed = self._drop_product(product_id)
+                self._versions.pop(product_id, None)
+            self.invalidations += removed
+            return removed
+
+    def stats(self) -> Dict:
+        """Get hit ratio and compute time saved"""
+        with self._lock:
+            requests = self.hits + self.coalesced + self.misses
+            return {
+                'entries': len(self._entries),
+                'in_flight': len(self._in_flight),
+                'requests': requests,
+                'hits': self.hits,
+                'coalesced': self.coalesced,
+                'misses': self.misses,
+                'hit_ratio': round((self.hits + self.coalesced) / requests, 4) if requests else 0.0,
+                'invalidations': self.invalidations,
+                'compute_seconds': round(self.compute_seconds, 3),
+                'saved_seconds': round(self.saved_seconds, 3)
+            }
+
+
+def get_forecast_cache() -> ForecastCache:
+    """Get the shared forecast result cache"""
+    if not hasattr(get_forecast_cache, 'instance'):
+        get_forecast_cache.instance = ForecastCache()
+    return get_forecast_cache.instance
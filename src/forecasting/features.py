@@ -0,0 +1,184 @@
+"""
+Time-Series Feature Store
+Computes calendar, lag and rolling features once per series, appends incrementally
+as new days arrive, and serves them as contiguous NumPy arrays
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+LAGS = [1, 7, 14, 30]
+WINDOWS = [7, 14, 30]
+
+FEATURE_COLUMNS = (
+    ['dayofweek', 'dayofmonth', 'month', 'quarter', 'year', 'weekofyear',
+     'is_weekend', 'is_month_start', 'is_month_end']
+    + [f'lag_{lag}' for lag in LAGS]
+    + [name for window in WINDOWS for name in (f'rolling_mean_{window}', f'rolling_std_{window}')]
+)
+
+
+def compute_features(dates: np.ndarray, y: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """
+    Compute feature rows for days at the given positions of a series
+
+    Features for day t only use y[:t], so a row never changes once computed
+    and a future day can be featurized before its demand is known. Lags reaching
+    before the series start use y[0]; rolling windows use the partial history.
+
+    Args:
+        dates: Date of each requested row
+        y: Demand history; must cover every position before the last requested one
+        positions: Index of each requested row in the series (<= len(y))
+
+    Returns:
+        (len(positions), len(FEATURE_COLUMNS)) float64 array
+    """
+    positions = np.asarray(positions, dtype=np.int64)
+    y = np.asarray(y, dtype=np.float64)
+    idx = pd.DatetimeIndex(dates)
+    X = np.empty((len(positions), len(FEATURE_COLUMNS)), dtype=np.float64)
+
+    # Calendar features
+    X[:, 0] = idx.dayofweek
+    X[:, 1] = idx.day
+    X[:, 2] = idx.month
+    X[:, 3] = idx.quarter
+    X[:, 4] = idx.year
+    X[:, 5] = idx.isocalendar().week.values.astype(np.float64)
+    X[:, 6] = idx.dayofweek >= 5
+    X[:, 7] = idx.is_month_start
+    X[:, 8] = idx.is_month_end
+
+    first = y[0] if len(y) else 0.0
+    col = 9
+
+    # Lag features
+    for lag in LAGS:
+        source = positions - lag
+        X[:, col] = np.where(source >= 0, y[np.clip(source, 0, None)] if len(y) else 0.0, first)
+        col += 1
+
+    # Rolling statistics over the days strictly before each row
+    cumsum = np.concatenate(([0.0], np.cumsum(y)))
+    cumsq = np.concatenate(([0.0], np.cumsum(y * y)))
+    for window in WINDOWS:
+        count = np.minimum(positions, window)
+        total = cumsum[positions] - cumsum[positions - count]
+        total_sq = cumsq[positions] - cumsq[positions - count]
+        safe_count = np.maximum(count, 1)
+        mean = np.where(count > 0, total / safe_count, first)
+        variance = (total_sq - total * total / safe_count) / np.maximum(count - 1, 1)
+        X[:, col] = mean
+        X[:, col + 1] = np.where(count > 1, np.sqrt(np.clip(variance, 0, None)), 0.0)
+        col += 2
+
+    return X
+
+
+def series_features(df: pd.DataFrame) -> np.ndarray:
+    """Compute the full feature matrix of a prepared ds/y series"""
+    y = df['y'].values.astype(np.float64)
+    return compute_features(df['ds'].values, y, np.arange(len(y)))
+
+
+class FeatureStore:
+    """
+    Shared per-series feature matrices
+
+    update() compares an incoming series with what is stored: an identical
+    series or a prefix of it (e.g. a backtest fold) is served as a slice of the
+    stored arrays, new days are featurized and appended, and a correction
+    recomputes only the rows from the first changed day on.
+    """
+
+    def __init__(self, max_series: int = 10000):
+        self.max_series = max_series
+        self._series = OrderedDict()
+        self._lock = threading.Lock()
+        self.rows_computed = 0
+        self.rows_served = 0
+
+    def update(self, key, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sync a series into the store and get its features
+
+        Args:
+            key: Series identifier (e.g. product id)
+            df: Prepared DataFrame with 'ds' and 'y' columns, sorted by date
+
+        Returns:
+            (X, y) contiguous arrays covering exactly the rows of df
+        """
+        dates = df['ds'].values.astype('datetime64[ns]')
+        y = df['y'].values.astype(np.float64)
+        n = len(y)
+
+        with self._lock:
+            entry = self._series.get(key)
+
+            if entry is None:
+                start = 0
+            else:
+                common = min(n, len(entry['y']))
+                same = (entry['dates'][:common] == dates[:common]) & (entry['y'][:common] == y[:common])
+                mismatch = np.flatnonzero(~same)
+                start = int(mismatch[0]) if len(mismatch) else common
+
+                if start == n:
+                    # Identical series or a prefix of the stored one
+                    self._series.move_to_end(key)
+                    self.rows_served += n
+                    return entry['X'][:n], entry['y'][:n]
+
+            new_rows = compute_features(dates[start:], y, np.arange(start, n))
+            X = new_rows if start == 0 else np.concatenate([entry['X'][:start], new_rows])
+            entry = {'dates': dates, 'y': y, 'X': np.ascontiguousarray(X)}
+
+            self._series[key] = entry
+            self._series.move_to_end(key)
+            while len(self._series) > self.max_series:
+                self._series.popitem(last=False)
+
+            self.rows_computed += n - start
+            self.rows_served += n
+            return entry['X'], entry['y']
+
+    def get(self, key, n_rows: Optional[int] = None) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Get stored (dates, X, y) for a series without modifying it
+
+        Args:
+            key: Series identifier
+            n_rows: Return only the first n rows (optional)
+        """
+        with self._lock:
+            entry = self._series.get(key)
+            if entry is None:
+                return None
+            n = len(entry['y']) if n_rows is None else n_rows
+            return entry['dates'][:n], entry['X'][:n], entry['y'][:n]
+
+    def invalidate(self, key) -> None:
+        """Drop a series"""
+        with self._lock:
+            self._series.pop(key, None)
+
+    def stats(self) -> Dict:
+        """Get store size and reuse counters"""
+        with self._lock:
+            return {
+                'series': len(self._series),
+                'rows_stored': int(sum(len(entry['y']) for entry in self._series.values())),
+                'rows_computed': self.rows_computed,
+                'rows_served': self.rows_served
+            }
+
+
+# Shared across models so training, backtesting and scoring reuse the same rows
+feature_store = FeatureStore()
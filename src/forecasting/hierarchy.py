@@ -0,0 +1,164 @@
+"""
+Hierarchical Forecast Reconciliation
+Fits the product x warehouse level once and aggregates it to product, category
+and total forecasts with a sparse summing matrix, so every level sums coherently
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from .reorder import fit_panel, last_complete_day
+
+
+LEVELS = ['total', 'category', 'product', 'product_warehouse']
+
+
+class ForecastHierarchy:
+    """
+    Total > category > product > product x warehouse hierarchy
+
+    The summing matrix S has one row per node (all levels stacked, top first)
+    and one column per bottom series, so any bottom-level matrix M is
+    aggregated to every level with a single sparse product S @ M.
+    """
+
+    def __init__(self, bottom: pd.DataFrame):
+        """
+        Build the hierarchy from bottom-level series
+
+        Args:
+            bottom: One row per product x warehouse with 'product_id', 'warehouse_id',
+                    'Category' and optional 'Product' / 'Warehouse' labels
+        """
+        self.bottom = bottom.reset_index(drop=True)
+        n = len(self.bottom)
+
+        category = self.bottom['Category'].fillna('Uncategorized').astype(str)
+        category_codes, category_keys = pd.factorize(category, sort=True)
+        product_codes, product_keys = pd.factorize(self.bottom['product_id'], sort=True)
+
+        product_labels = (self.bottom['Product'] if 'Product' in self.bottom
+                          else self.bottom['product_id']).astype(str)
+        warehouse_labels = (self.bottom['Warehouse'] if 'Warehouse' in self.bottom
+                            else self.bottom['warehouse_id']).astype(str)
+        product_names = product_labels.groupby(product_codes).first()
+
+        # level -> (first row in S, node keys, node names)
+        self.levels = OrderedDict()
+        codes = [np.zeros(n, dtype=np.int64), category_codes, product_codes, np.arange(n)]
+        nodes = [
+            (['total'], ['All Products']),
+            (category_keys.tolist(), category_keys.tolist()),
+            (product_keys.tolist(), product_names.tolist()),
+            ((self.bottom['product_id'].astype(str) + ':' + self.bottom['warehouse_id'].astype(str)).tolist(),
+             (product_labels + ' @ ' + warehouse_labels).tolist())
+        ]
+
+        offset = 0
+        rows = []
+        for level, level_codes, (keys, names) in zip(LEVELS, codes, nodes):
+            self.levels[level] = (offset, keys, names)
+            rows.append(level_codes + offset)
+            offset += len(keys)
+
+        self.n_nodes = offset
+        self.S = sparse.csr_matrix(
+            (np.ones(len(LEVELS) * n), (np.concatenate(rows), np.tile(np.arange(n), len(LEVELS)))),
+            shape=(self.n_nodes, n)
+        )
+
+    def aggregate(self, bottom_values: np.ndarray) -> np.ndarray:
+        """
+        Sum bottom-level values to every node
+
+        Args:
+            bottom_values: (n_bottom,) or (n_bottom, k) array
+
+        Returns:
+            (n_nodes,) or (n_nodes, k) array
+        """
+        return self.S @ bottom_values
+
+    def reconcile(self, forecast: np.ndarray, variance: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Bottom-up reconciliation
+
+        Args:
+            forecast: (n_bottom, periods) bottom-level forecasts
+            variance: (n_bottom,) or (n_bottom, periods) forecast variances (optional);
+                      bottom series are treated as independent
+
+        Returns:
+            Dict with 'forecast' and, if variance is given, 'lower_bound'/'upper_bound'
+            (95% intervals), each (n_nodes, periods)
+        """
+        reconciled = {'forecast': self.aggregate(forecast)}
+
+        if variance is not None:
+            std = np.sqrt(self.aggregate(variance))
+            if std.ndim == 1:
+                std = std[:, None]
+            reconciled['lower_bound'] = np.maximum(0, reconciled['forecast'] - 1.96 * std)
+            reconciled['upper_bound'] = reconciled['forecast'] + 1.96 * std
+
+        return reconciled
+
+    def to_records(self, reconciled: Dict[str, np.ndarray], levels: Optional[List[str]] = None) -> List[Dict]:
+        """Serialize reconciled forecasts node by node for the requested levels"""
+        records = []
+        for level in levels or LEVELS:
+            offset, keys, names = self.levels[level]
+            block = {name: values[offset:offset + len(keys)] for name, values in reconciled.items()}
+            for i, (key, name) in enumerate(zip(keys, names)):
+                record = {'level': level, 'key': key, 'name': name}
+                for column, values in block.items():
+                    record[column] = np.round(values[i], 2).tolist()
+                record['total'] = round(float(block['forecast'][i].sum()), 2)
+                records.append(record)
+        return records
+
+
+def forecast_hierarchy(positions: pd.DataFrame,
+                       demand: pd.DataFrame,
+                       periods: int = 30,
+                       history_days: int = 90,
+                       model: str = 'tsb',
+                       levels: Optional[List[str]] = None,
+                       end_date: Optional[pd.Timestamp] = None) -> Dict:
+    """
+    Coherent forecasts for every level of the hierarchy
+
+    Only the bottom level is fitted (one vectorized panel pass); upper levels
+    are sums of it, so the whole hierarchy costs about as much as the bottom.
+
+    Args:
+        positions: Bottom-level series (e.g. DashboardDataAPI.get_reorder_positions())
+        demand: Daily demand per product x warehouse
+        periods: Days to forecast
+        history_days: Days of history used for fitting
+        model: Panel model ('croston', 'sba' or 'tsb')
+        levels: Levels to return (default: all)
+        end_date: Last day of history (default: yesterday, the last complete day)
+
+    Returns:
+        Dict with forecast 'dates' and one record per node
+    """
+    end_date = pd.Timestamp(end_date or last_complete_day()).normalize()
+    hierarchy = ForecastHierarchy(positions)
+    _, rates, rmse = fit_panel(hierarchy.bottom, demand, history_days, model, end_date)
+
+    # Panel models forecast a flat daily rate per series
+    forecast = np.repeat(rates[:, None], periods, axis=1)
+    reconciled = hierarchy.reconcile(forecast, rmse ** 2)
+
+    dates = pd.date_range(start=end_date + pd.Timedelta(days=1), periods=periods)
+    return {
+        'dates': [d.isoformat() for d in dates],
+        'model': model,
+        'levels': {level: len(keys) for level, (_, keys, _) in hierarchy.levels.items()},
+        'nodes': hierarchy.to_records(reconciled, levels)
+    }
@@ -0,0 +1,211 @@
+"""
+Forecast Job Queue - Background execution of long-running forecasts
+In-process bounded worker pool with deduplication, progress tracking and result TTL
+"""
+
+import hashlib
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the job queue cannot accept more work"""
+    pass
+
+
+class ForecastJob:
+    """A single forecast job and its progress"""
+
+    TERMINAL_STATES = ('completed', 'failed')
+
+    def __init__(self, job_id: str, kind: str, params: Dict, key: str):
+        self.job_id = job_id
+        self.kind = kind
+        self.params = params
+        self.key = key
+        self.status = 'queued'
+        self.progress = 0.0
+        self.message = 'Queued'
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.version = 0
+        self._changed = threading.Condition()
+
+    @property
+    def is_done(self) -> bool:
+        return self.status in self.TERMINAL_STATES
+
+    def _touch(self) -> None:
+        with self._changed:
+            self.version += 1
+            self._changed.notify_all()
+
+    def update_progress(self, done: int, total: int, message: str = '') -> None:
+        """Report progress as `done` out of `total` steps"""
+        self.progress = round(done / total, 4) if total else 0.0
+        if message:
+            self.message = message
+        self._touch()
+
+    def wait_for_change(self, version: int, timeout: float) -> int:
+        """Block until the job version moves past `version` or timeout; returns current version"""
+        with self._changed:
+            if self.version == version and not self.is_done:
+                self._changed.wait(timeout)
+            return self.version
+
+    def to_dict(self, include_result: bool = False) -> Dict:
+        """Serialize job status"""
+        data = {
+            'job_id': self.job_id,
+            'type': self.kind,
+            'status': self.status,
+            'progress': self.progress,
+            'message': self.message,
+            'created_at': datetime.fromtimestamp(self.created_at).isoformat(),
+            'started_at': datetime.fromtimestamp(self.started_at).isoformat() if self.started_at else None,
+            'finished_at': datetime.fromtimestamp(self.finished_at).isoformat() if self.finished_at else None,
+            'version': self.version
+        }
+        if self.error:
+            data['error'] = self.error
+        if include_result and self.status == 'completed':
+            data['result'] = self.result
+        return data
+
+
+class ForecastJobQueue:
+    """
+    Background job subsystem for forecasts
+
+    Jobs run on a bounded thread pool inside the server process, so no external
+    broker is needed. Submitting a job identical to one still queued or running
+    returns the existing job. Finished jobs are kept for `result_ttl` seconds.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 50, result_ttl: int = 900):
+        """
+        Initialize job queue
+
+        Args:
+            max_workers: Jobs executed concurrently
+            max_pending: Maximum queued + running jobs before submissions are rejected
+            result_ttl: Seconds a finished job (and its result) is retained
+        """
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='forecast-job')
+        self._handlers = {}
+        self._jobs = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def register(self, kind: str, handler: Callable[[Dict, ForecastJob], Dict]) -> None:
+        """
+        Register a job type
+
+        Args:
+            kind: Job type name
+            handler: Callable(params, job) returning a JSON-serializable result.
+                     It may call job.update_progress() while running.
+        """
+        self._handlers[kind] = handler
+
+    @staticmethod
+    def job_key(kind: str, params: Dict) -> str:
+        """Deduplication key for a job type and its parameters"""
+        payload = json.dumps({'kind': kind, 'params': params}, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def submit(self, kind: str, params: Optional[Dict] = None) -> Tuple[ForecastJob, bool]:
+        """
+        Submit a job
+
+        Args:
+            kind: Registered job type
+            params: Job parameters
+
+        Returns:
+            (job, created) where created is False if an identical job was already in flight
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job type: {kind}")
+
+        params = params or {}
+        key = self.job_key(kind, params)
+
+        with self._lock:
+            self._purge_expired()
+
+            existing = self._in_flight.get(key)
+            if existing is not None:
+                return existing, False
+
+            if len(self._in_flight) >= self.max_pending:
+                raise QueueFullError(f"Job queue is full ({self.max_pending} jobs pending)")
+
+            job = ForecastJob(uuid.uuid4().hex, kind, params, key)
+            self._jobs[job.job_id] = job
+            self._in_flight[key] = job
+
+        self._executor.submit(self._run, job)
+        return job, True
+
+    def _run(self, job: ForecastJob) -> None:
+        job.status = 'running'
+        job.message = 'Running'
+        job.started_at = time.time()
+        job._touch()
+
+        try:
+            result, error = self._handlers[job.kind](job.params, job), None
+        except Exception as e:
+            result, error = None, str(e)
+
+        # Finish under the lock so pollers never see a terminal job without finished_at
+        with self._lock:
+            job.finished_at = time.time()
+            if error is None:
+                job.result = result
+                job.progress = 1.0
+                job.status, job.message = 'completed', 'Completed'
+            else:
+                job.error = error
+                job.status, job.message = 'failed', 'Failed'
+            self._in_flight.pop(job.key, None)
+        job._touch()
+
+    def _purge_expired(self) -> None:
+        """Drop finished jobs older than the TTL (caller holds the lock)"""
+        cutoff = time.time() - self.result_ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.is_done and job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[ForecastJob]:
+        """Get a job by id (None if unknown or expired)"""
+        with self._lock:
+            self._purge_expired()
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict:
+        """Get queue statistics"""
+        with self._lock:
+            self._purge_expired()
+            statuses = {}
+            for job in self._jobs.values():
+                statuses[job.status] = statuses.get(job.status, 0) + 1
+            return {
+                'jobs': len(self._jobs),
+                'in_flight': len(self._in_flight),
+                'by_status': statuses
+            }
@@ -8,10 +8,35 @@ import numpy as np
 from datetime import datetime, timedelta
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Tuple
+import hashlib
+import threading
+import time
 import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .features import FEATURE_COLUMNS, compute_features, series_features, feature_store
+
 warnings.filterwarnings('ignore')
 
 
+def data_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Compute a stable fingerprint of a prepared ds/y series
+    
+    Args:
+        df: DataFrame with 'ds' and 'y' columns
+    
+    Returns:
+        Hex digest identifying the exact series contents
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    dates = pd.to_datetime(df['ds']).values.astype('datetime64[ns]')
+    digest.update(dates.view(np.int64).tobytes())
+    digest.update(np.asarray(df['y'], dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
 class BaseModel(ABC):
     """Abstract base class for forecasting models"""
     
@@ -19,6 +44,8 @@ class BaseModel(ABC):
         self.name = name
         self.is_fitted = False
         self.model = None
+        self.series_id = None  # Identifies the series across refits (e.g. product id)
+        self.feature_key = None  # Feature store key; prefixes of the series (backtest folds) share it
     
     @abstractmethod
     def fit(self, df: pd.DataFrame) -> None:
@@ -30,6 +57,14 @@ class BaseModel(ABC):
         """Generate predictions for future periods"""
         pass
     
+    def get_params(self) -> Dict:
+        """Get constructor parameters used to build an identical unfitted model"""
+        return {}
+    
+    def clone(self) -> 'BaseModel':
+        """Create an unfitted copy of this model with the same hyperparameters"""
+        return self.__class__(**self.get_params())
+    
     def validate_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Validate and prepare input data"""
         required_cols = ['ds', 'y']
@@ -46,26 +81,131 @@ class BaseModel(ABC):
         return df
 
 
+class ProphetWarmStartStore:
+    """
+    Per-series Prophet state shared across refits
+    
+    Keeps the last fitted model, its data fingerprint and its optimized
+    parameters for each series, plus fit/predict wall times. Bounded LRU.
+    """
+    
+    def __init__(self, max_series: int = 1000):
+        self.max_series = max_series
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Tuple) -> Optional[Dict]:
+        """Get stored state for a (series_id, configuration) key"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+    
+    def record_fit(self, key: Tuple, mode: str, seconds: float, **state) -> None:
+        """Store fitted state and account a 'cold', 'warm' or 'skipped' fit"""
+        with self._lock:
+            entry = self._entries.setdefault(key, {
+                'fits': {'cold': 0, 'warm': 0, 'skipped': 0},
+                'fit_seconds': {'cold': 0.0, 'warm': 0.0, 'skipped': 0.0},
+                'last_predict_seconds': None
+            })
+            entry.update(state)
+            entry['fits'][mode] += 1
+            entry['fit_seconds'][mode] += seconds
+            entry['last_fit_mode'] = mode
+            entry['last_fit_seconds'] = seconds
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_series:
+                self._entries.popitem(last=False)
+    
+    def record_predict(self, key: Tuple, seconds: float) -> None:
+        """Account predict wall time for a series"""
+        with self._lock:
+            if key in self._entries:
+                self._entries[key]['last_predict_seconds'] = seconds
+    
+    def stats(self) -> Dict:
+        """Get per-series timings and fit counts"""
+        with self._lock:
+            return {
+                str(series_id): {
+                    'fits': dict(entry['fits']),
+                    'fit_seconds': {mode: round(t, 4) for mode, t in entry['fit_seconds'].items()},
+                    'last_fit_mode': entry['last_fit_mode'],
+                    'last_fit_seconds': round(entry['last_fit_seconds'], 4),
+                    'last_predict_seconds': (round(entry['last_predict_seconds'], 4)
+                                             if entry['last_predict_seconds'] is not None else None)
+                }
+                for (series_id, _), entry in self._entries.items()
+            }
+
+
+# Shared across ProphetModel instances so daily refits find yesterday's state
+prophet_state = ProphetWarmStartStore()
+
+
 class ProphetModel(BaseModel):
     """
     Facebook Prophet Model
     Best for: Daily data with strong seasonality, holidays, trend changes
     Handles missing data and outliers well
+    
+    With incremental refits enabled and a series_id set, an unchanged series
+    reuses its previous fit and a changed one starts Stan's optimizer from the
+    previously fitted parameters instead of from scratch.
     """
     
     def __init__(self, seasonality_mode: str = 'multiplicative', 
                  yearly_seasonality: bool = True,
                  weekly_seasonality: bool = True,
-                 daily_seasonality: bool = False):
+                 daily_seasonality: bool = False,
+                 incremental: bool = True):
         super().__init__('Prophet')
         self.seasonality_mode = seasonality_mode
         self.yearly_seasonality = yearly_seasonality
         self.weekly_seasonality = weekly_seasonality
         self.daily_seasonality = daily_seasonality
+        self.incremental = incremental
         self.training_data = None
     
+    def get_params(self) -> Dict:
+        """Get Prophet configuration"""
+        return {
+            'seasonality_mode': self.seasonality_mode,
+            'yearly_seasonality': self.yearly_seasonality,
+            'weekly_seasonality': self.weekly_seasonality,
+            'daily_seasonality': self.daily_seasonality,
+            'incremental': self.incremental
+        }
+    
+    def _state_key(self) -> Optional[Tuple]:
+        if not self.incremental or self.series_id is None:
+            return None
+        config = tuple(sorted((k, v) for k, v in self.get_params().items() if k != 'incremental'))
+        return (self.series_id, config)
+    
+    def _build_prophet(self):
+        from prophet import Prophet
+        
+        return Prophet(
+            seasonality_mode=self.seasonality_mode,
+            yearly_seasonality=self.yearly_seasonality,
+            weekly_seasonality=self.weekly_seasonality,
+            daily_seasonality=self.daily_seasonality,
+            interval_width=0.95
+        )
+    
+    def _stan_init(self) -> Dict:
+        """Extract fitted parameters in the form Stan accepts as an initial point"""
+        params = self.model.params
+        init = {name: float(params[name][0][0]) for name in ['k', 'm', 'sigma_obs']}
+        for name in ['delta', 'beta']:
+            init[name] = np.asarray(params[name][0], dtype=np.float64)
+        return init
+    
     def fit(self, df: pd.DataFrame) -> None:
-        """Train Prophet model"""
+        """Train Prophet model, warm-starting from the previous fit of the same series"""
         try:
             from prophet import Prophet
         except ImportError:
@@ -74,32 +214,58 @@ class ProphetModel(BaseModel):
         df = self.validate_data(df)
         self.training_data = df
         
-        self.model = Prophet(
-            seasonality_mode=self.seasonality_mode,
-            yearly_seasonality=self.yearly_seasonality,
-            weekly_seasonality=self.weekly_seasonality,
-            daily_seasonality=self.daily_seasonality,
-            interval_width=0.95
-        )
+        key = self._state_key()
+        state = prophet_state.get(key) if key else None
+        fingerprint = data_fingerprint(df) if key else None
+        start = time.perf_counter()
+        
+        if state is not None and state['fingerprint'] == fingerprint:
+            self.model = state['model']
+            self.is_fitted = True
+            prophet_state.record_fit(key, 'skipped', time.perf_counter() - start)
+            return
+        
+        mode = 'cold'
+        self.model = self._build_prophet()
         
         # Suppress Prophet's verbose output
-        self.model.fit(df)
+        if state is not None:
+            try:
+                self.model.fit(df, init=state['init'])
+                mode = 'warm'
+            except Exception:
+                # Parameter shapes change with changepoints/seasonalities; refit cold
+                self.model = self._build_prophet()
+                self.model.fit(df)
+        else:
+            self.model.fit(df)
+        
         self.is_fitted = True
+        
+        if key:
+            prophet_state.record_fit(key, mode, time.perf_counter() - start,
+                                     fingerprint=fingerprint, model=self.model, init=self._stan_init())
     
     def predict(self, periods: int) -> pd.DataFrame:
         """Generate forecast for future periods"""
         if not self.is_fitted:
             raise ValueError("Model must be fitted before prediction")
         
-        future = self.model.make_future_dataframe(periods=periods)
+        start = time.perf_counter()
+        
+        # Only future rows; predicting (and sampling uncertainty for) the history is wasted work
+        future = self.model.make_future_dataframe(periods=periods).tail(periods)
         forecast = self.model.predict(future)
         
-        # Return only future predictions
         result = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].tail(periods)
         result.columns = ['date', 'forecast', 'lower_bound', 'upper_bound']
         result['forecast'] = result['forecast'].clip(lower=0)  # No negative forecasts
         result['lower_bound'] = result['lower_bound'].clip(lower=0)
         
+        key = self._state_key()
+        if key:
+            prophet_state.record_predict(key, time.perf_counter() - start)
+        
         return result.reset_index(drop=True)
     
     def get_components(self) -> Dict:
@@ -125,49 +291,51 @@ class XGBoostModel(BaseModel):
     """
     
     def __init__(self, n_estimators: int = 100, max_depth: int = 6, 
-                 learning_rate: float = 0.1, lookback_days: int = 30):
+                 learning_rate: float = 0.1, lookback_days: int = 30,
+                 min_child_weight: float = 1, subsample: float = 1.0,
+                 colsample_bytree: float = 1.0):
         super().__init__('XGBoost')
         self.n_estimators = n_estimators
         self.max_depth = max_depth
         self.learning_rate = learning_rate
         self.lookback_days = lookback_days
+        self.min_child_weight = min_child_weight
+        self.subsample = subsample
+        self.colsample_bytree = colsample_bytree
         self.feature_cols = []
         self.training_data = None
     
+    def get_params(self) -> Dict:
+        """Get XGBoost hyperparameters"""
+        return {
+            'n_estimators': self.n_estimators,
+            'max_depth': self.max_depth,
+            'learning_rate': self.learning_rate,
+            'lookback_days': self.lookback_days,
+            'min_child_weight': self.min_child_weight,
+            'subsample': self.subsample,
+            'colsample_bytree': self.colsample_bytree
+        }
+    
     def _create_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Create time-based features for XGBoost"""
         df = df.copy()
         df['ds'] = pd.to_datetime(df['ds'])
         
-        # Time features
-        df['dayofweek'] = df['ds'].dt.dayofweek
-        df['dayofmonth'] = df['ds'].dt.day
-        df['month'] = df['ds'].dt.month
-        df['quarter'] = df['ds'].dt.quarter
-        df['year'] = df['ds'].dt.year
-        df['weekofyear'] = df['ds'].dt.isocalendar().week.astype(int)
-        df['is_weekend'] = (df['dayofweek'] >= 5).astype(int)
-        df['is_month_start'] = df['ds'].dt.is_month_start.astype(int)
-        df['is_month_end'] = df['ds'].dt.is_month_end.astype(int)
-        
-        # Lag features
-        for lag in [1, 7, 14, 30]:
-            if lag <= len(df):
-                df[f'lag_{lag}'] = df['y'].shift(lag)
-        
-        # Rolling statistics
-        for window in [7, 14, 30]:
-            if window <= len(df):
-                df[f'rolling_mean_{window}'] = df['y'].rolling(window=window).mean()
-                df[f'rolling_std_{window}'] = df['y'].rolling(window=window).std()
-        
-        # Fill NaN values from lagging
-        df = df.fillna(method='bfill').fillna(0)
-        
-        self.feature_cols = [col for col in df.columns if col not in ['ds', 'y']]
+        features = pd.DataFrame(series_features(df), columns=FEATURE_COLUMNS, index=df.index)
+        df = pd.concat([df, features], axis=1)
+        
+        self.feature_cols = list(FEATURE_COLUMNS)
         
         return df
     
+    def _training_matrix(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Get (X, y) for a validated series, from the shared feature store when keyed"""
+        if self.feature_key is not None:
+            return feature_store.update(self.feature_key, df)
+        y = df['y'].values.astype(np.float64)
+        return series_features(df), y
+    
     def fit(self, df: pd.DataFrame) -> None:
         """Train XGBoost model"""
         try:
@@ -176,16 +344,17 @@ class XGBoostModel(BaseModel):
             raise ImportError("XGBoost not installed. Run: pip install xgboost")
         
         df = self.validate_data(df)
-        df = self._create_features(df)
+        X, y = self._training_matrix(df)
         self.training_data = df
-        
-        X = df[self.feature_cols]
-        y = df['y']
+        self.feature_cols = list(FEATURE_COLUMNS)
         
         self.model = xgb.XGBRegressor(
             n_estimators=self.n_estimators,
             max_depth=self.max_depth,
             learning_rate=self.learning_rate,
+            min_child_weight=self.min_child_weight,
+            subsample=self.subsample,
+            colsample_bytree=self.colsample_bytree,
             objective='reg:squarederror',
             random_state=42
         )
@@ -201,28 +370,25 @@ class XGBoostModel(BaseModel):
         last_date = self.training_data['ds'].max()
         future_dates = pd.date_range(start=last_date + timedelta(days=1), periods=periods)
         
-        predictions = []
-        current_data = self.training_data.copy()
-        
-        for date in future_dates:
-            # Create row for prediction
-            new_row = pd.DataFrame({'ds': [date], 'y': [0]})
-            temp_df = pd.concat([current_data[['ds', 'y']], new_row], ignore_index=True)
-            temp_df = self._create_features(temp_df)
-            
-            # Predict
-            X_pred = temp_df[self.feature_cols].iloc[-1:].fillna(0)
-            pred = max(0, self.model.predict(X_pred)[0])
-            predictions.append(pred)
-            
-            # Update for next iteration
-            current_data = pd.concat([current_data, pd.DataFrame({'ds': [date], 'y': [pred]})], ignore_index=True)
+        # Recursive forecast: each step's features only need the history before it,
+        # so a single row is computed per step from a preallocated buffer
+        n = len(self.training_data)
+        history = np.empty(n + periods, dtype=np.float64)
+        history[:n] = self.training_data['y'].values
+        predictions = np.empty(periods, dtype=np.float64)
+        
+        for step, date in enumerate(future_dates.values):
+            position = n + step
+            X_pred = compute_features(np.array([date]), history[:position], np.array([position]))
+            pred = max(0.0, float(self.model.predict(X_pred)[0]))
+            predictions[step] = pred
+            history[position] = pred
         
         result = pd.DataFrame({
             'date': future_dates,
             'forecast': predictions,
-            'lower_bound': [max(0, p * 0.85) for p in predictions],
-            'upper_bound': [p * 1.15 for p in predictions]
+            'lower_bound': np.maximum(0, predictions * 0.85),
+            'upper_bound': predictions * 1.15
         })
         
         return result
@@ -240,25 +406,50 @@ class EnsembleModel(BaseModel):
     """
     Ensemble of multiple models for robust predictions
     Combines Prophet and XGBoost for best results
+    Members are trained and predicted concurrently, each exactly once per horizon
     """
     
-    def __init__(self, weights: Optional[Dict[str, float]] = None):
+    def __init__(self, weights: Optional[Dict[str, float]] = None,
+                 member_params: Optional[Dict[str, Dict]] = None):
         super().__init__('Ensemble')
+        member_params = member_params or {}
         self.models = {
-            'prophet': ProphetModel(),
-            'xgboost': XGBoostModel()
+            'prophet': ProphetModel(**member_params.get('prophet', {})),
+            'xgboost': XGBoostModel(**member_params.get('xgboost', {}))
         }
         self.weights = weights or {'prophet': 0.5, 'xgboost': 0.5}
         self.available_models = []
+        self.member_forecasts = {}
+    
+    def get_params(self) -> Dict:
+        """Get ensemble weights and member hyperparameters"""
+        return {
+            'weights': dict(self.weights),
+            'member_params': {name: model.get_params() for name, model in self.models.items()}
+        }
+    
+    def clone(self) -> 'EnsembleModel':
+        """Create an unfitted copy, preserving member model hyperparameters"""
+        ensemble = EnsembleModel(**self.get_params())
+        ensemble.models = {name: model.clone() for name, model in self.models.items()}
+        return ensemble
     
     def fit(self, df: pd.DataFrame) -> None:
-        """Train all models in ensemble"""
+        """Train all models in ensemble concurrently"""
         df = self.validate_data(df)
         self.available_models = []
+        self.member_forecasts = {}
+        
+        for model in self.models.values():
+            model.series_id = self.series_id
+            model.feature_key = self.feature_key
         
-        for name, model in self.models.items():
+        with ThreadPoolExecutor(max_workers=len(self.models)) as executor:
+            futures = {name: executor.submit(model.fit, df) for name, model in self.models.items()}
+        
+        for name, future in futures.items():
             try:
-                model.fit(df)
+                future.result()
                 self.available_models.append(name)
                 print(f"  ✓ {name} trained successfully")
             except ImportError as e:
@@ -271,40 +462,65 @@ class EnsembleModel(BaseModel):
         
         self.is_fitted = True
     
-    def predict(self, periods: int) -> pd.DataFrame:
-        """Generate ensemble prediction"""
+    def get_member_forecasts(self, periods: int) -> Dict[str, pd.DataFrame]:
+        """
+        Get each member's forecast, predicting at most once per member and horizon
+        
+        Forecasts are cached until the next fit, and a cached longer horizon
+        is reused for shorter requests.
+        """
         if not self.is_fitted:
             raise ValueError("Model must be fitted before prediction")
         
-        predictions = {}
+        cached = [p for p in self.member_forecasts if p >= periods]
+        if cached:
+            forecasts = self.member_forecasts[min(cached)]
+            return {name: pred.head(periods) for name, pred in forecasts.items()}
         
-        for name in self.available_models:
+        def _predict(name):
             try:
-                pred = self.models[name].predict(periods)
-                predictions[name] = pred['forecast'].values
+                return self.models[name].predict(periods)
             except Exception as e:
                 print(f"Warning: {name} prediction failed: {e}")
+                return None
+        
+        with ThreadPoolExecutor(max_workers=len(self.available_models)) as executor:
+            results = dict(zip(self.available_models, executor.map(_predict, self.available_models)))
+        
+        forecasts = {name: pred for name, pred in results.items() if pred is not None}
+        self.member_forecasts[periods] = forecasts
+        return forecasts
+    
+    def predict(self, periods: int) -> pd.DataFrame:
+        """Generate ensemble prediction"""
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted before prediction")
+        
+        forecasts = self.get_member_forecasts(periods)
         
-        if not predictions:
+        if not forecasts:
             raise ValueError("No predictions could be generated")
         
         # Weighted average
-        total_weight = sum(self.weights.get(m, 1.0) for m in predictions.keys())
+        total_weight = sum(self.weights.get(m, 1.0) for m in forecasts.keys())
         ensemble_forecast = np.zeros(periods)
         
-        for name, pred in predictions.items():
+        for name, pred in forecasts.items():
             weight = self.weights.get(name, 1.0) / total_weight
-            ensemble_forecast += weight * pred
+            ensemble_forecast += weight * pred['forecast'].values
+        
+        # Bounds cover both the ±10% band and the spread of member forecasts
+        member_lower = np.min([pred['lower_bound'].values for pred in forecasts.values()], axis=0)
+        member_upper = np.max([pred['upper_bound'].values for pred in forecasts.values()], axis=0)
         
-        # Get date range from first successful model
-        first_model = self.available_models[0]
-        dates = self.models[first_model].predict(periods)['date'].values
+        # Date range from first successful model
+        dates = next(iter(forecasts.values()))['date'].values
         
         result = pd.DataFrame({
             'date': dates,
             'forecast': ensemble_forecast,
-            'lower_bound': ensemble_forecast * 0.9,
-            'upper_bound': ensemble_forecast * 1.1
+            'lower_bound': np.clip(np.minimum(ensemble_forecast * 0.9, member_lower), 0, None),
+            'upper_bound': np.maximum(ensemble_forecast * 1.1, member_upper)
         })
         
         return result
@@ -322,6 +538,10 @@ class SimpleMovingAverage(BaseModel):
         self.last_values = None
         self.last_date = None
     
+    def get_params(self) -> Dict:
+        """Get moving average window"""
+        return {'window': self.window}
+    
     def fit(self, df: pd.DataFrame) -> None:
         """Fit by storing recent values"""
         df = self.validate_data(df)
@@ -350,3 +570,286 @@ class SimpleMovingAverage(BaseModel):
             'lower_bound': [p * 0.8 for p in predictions],
             'upper_bound': [p * 1.2 for p in predictions]
         })
+
+
+# Syntetos-Boylan demand classification thresholds
+ADI_THRESHOLD = 1.32
+CV2_THRESHOLD = 0.49
+
+
+def classify_demand(y: np.ndarray) -> Dict:
+    """
+    Classify a daily demand series by intermittency (Syntetos-Boylan)
+    
+    Args:
+        y: Daily demand values
+    
+    Returns:
+        dict with zero_ratio, adi (average inter-demand interval),
+        cv2 (squared coefficient of variation of non-zero demand) and
+        demand_class: 'smooth', 'erratic', 'intermittent', 'lumpy' or 'none'
+    """
+    y = np.asarray(y, dtype=np.float64)
+    nonzero_idx = np.flatnonzero(y > 0)
+    
+    if len(y) == 0 or len(nonzero_idx) == 0:
+        return {'zero_ratio': 1.0, 'adi': float('inf'), 'cv2': 0.0, 'demand_class': 'none'}
+    
+    zero_ratio = 1 - len(nonzero_idx) / len(y)
+    intervals = np.diff(np.concatenate(([-1], nonzero_idx)))
+    adi = float(intervals.mean())
+    sizes = y[nonzero_idx]
+    cv2 = float((sizes.std() / sizes.mean()) ** 2) if len(sizes) > 1 else 0.0
+    
+    if adi < ADI_THRESHOLD:
+        demand_class = 'smooth' if cv2 < CV2_THRESHOLD else 'erratic'
+    else:
+        demand_class = 'intermittent' if cv2 < CV2_THRESHOLD else 'lumpy'
+    
+    return {
+        'zero_ratio': round(zero_ratio, 4),
+        'adi': round(adi, 4),
+        'cv2': round(cv2, 4),
+        'demand_class': demand_class
+    }
+
+
+def _smoothing_weights(mask: np.ndarray, alpha: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Closed-form weights of exponential smoothing applied at masked positions
+    
+    A value updated into the level with k later updates keeps alpha * (1 - alpha)^k
+    of its influence, so the final level is a weighted row sum and no time loop is needed.
+    
+    Returns:
+        (weights, later_updates) arrays shaped like mask
+    """
+    later = np.cumsum(mask[:, ::-1], axis=1)[:, ::-1] - mask
+    return np.where(mask, alpha * (1 - alpha) ** later, 0.0), later
+
+
+def croston_batch(Y: np.ndarray, alpha: float = 0.1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fit Croston's method to many series at once
+    
+    Args:
+        Y: (n_series, n_days) demand matrix; NaN marks days outside a series
+        alpha: Smoothing constant for demand size and interval
+    
+    Returns:
+        (size, interval) arrays of shape (n_series,); both NaN for series
+        that never had demand
+    """
+    Y = np.atleast_2d(np.asarray(Y, dtype=np.float64))
+    n_series, n_days = Y.shape
+    observed = ~np.isnan(Y)
+    demand = observed & (np.nan_to_num(Y) > 0)
+    n_demand = demand.sum(axis=1)
+    
+    # Interval = days since the previous demand (or since the series started)
+    positions = np.arange(n_days)
+    start = np.argmax(observed, axis=1)
+    last_demand = np.maximum.accumulate(np.where(demand, positions, -1), axis=1)
+    previous = np.concatenate([np.full((n_series, 1), -1), last_demand[:, :-1]], axis=1)
+    intervals = positions - np.maximum(previous, start[:, None] - 1)
+    
+    # The first demand initializes the level instead of being smoothed in
+    weights, later = _smoothing_weights(demand, alpha)
+    first = demand & (later == (n_demand - 1)[:, None])
+    weights = np.where(first, (1 - alpha) ** later, weights)
+    
+    size = (weights * np.where(demand, Y, 0.0)).sum(axis=1)
+    interval = (weights * np.where(demand, intervals, 0)).sum(axis=1)
+    
+    never = n_demand == 0
+    size[never] = np.nan
+    interval[never] = np.nan
+    return size, interval
+
+
+def tsb_batch(Y: np.ndarray, alpha: float = 0.1, beta: float = 0.1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fit Teunter-Syntetos-Babai (TSB) to many series at once
+    
+    Args:
+        Y: (n_series, n_days) demand matrix; NaN marks days outside a series
+        alpha: Smoothing constant for demand size (updated on demand days)
+        beta: Smoothing constant for demand probability (updated every day)
+    
+    Returns:
+        (probability, size) arrays of shape (n_series,)
+    """
+    Y = np.atleast_2d(np.asarray(Y, dtype=np.float64))
+    observed = ~np.isnan(Y)
+    demand = observed & (np.nan_to_num(Y) > 0)
+    n_observed = observed.sum(axis=1)
+    n_demand = demand.sum(axis=1)
+    
+    # Initialize from the sample, then smooth through the whole history
+    initial_probability = n_demand / np.maximum(n_observed, 1)
+    initial_size = np.where(demand, Y, 0.0).sum(axis=1) / np.maximum(n_demand, 1)
+    
+    probability_weights, _ = _smoothing_weights(observed, beta)
+    probability = initial_probability * (1 - beta) ** n_observed + (probability_weights * demand).sum(axis=1)
+    
+    size_weights, _ = _smoothing_weights(demand, alpha)
+    size = initial_size * (1 - alpha) ** n_demand + (size_weights * np.where(demand, Y, 0.0)).sum(axis=1)
+    
+    return probability, size
+
+
+class IntermittentDemandModel(BaseModel):
+    """
+    Base class for lightweight intermittent-demand models
+    Pure NumPy, no external dependencies; forecasts a flat demand rate
+    """
+    
+    def __init__(self, name: str, alpha: float = 0.1):
+        super().__init__(name)
+        self.alpha = alpha
+        self.demand_rate = 0.0
+        self.rmse = 0.0
+        self.last_date = None
+    
+    def get_params(self) -> Dict:
+        """Get smoothing parameters"""
+        return {'alpha': self.alpha}
+    
+    @abstractmethod
+    def _demand_rates(self, Y: np.ndarray) -> np.ndarray:
+        """Fit a (n_series, n_days) demand matrix, returning the demand rate per series"""
+        pass
+    
+    def _fit_rates(self, Y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Fit a demand matrix, returning (demand_rate, residual rmse) per series"""
+        rates = np.nan_to_num(self._demand_rates(Y))
+        residuals = np.where(np.isnan(Y), 0.0, Y - rates[:, None])
+        n_observed = np.maximum((~np.isnan(Y)).sum(axis=1), 1)
+        return rates, np.sqrt((residuals ** 2).sum(axis=1) / n_observed)
+    
+    def fit(self, df: pd.DataFrame) -> None:
+        """Fit smoothing recursions on the daily series"""
+        df = self.validate_data(df)
+        rates, rmse = self._fit_rates(df['y'].values.astype(np.float64)[None, :])
+        self.demand_rate = float(rates[0])
+        self.rmse = float(rmse[0])
+        self.last_date = df['ds'].max()
+        self.is_fitted = True
+    
+    @classmethod
+    def fit_many(cls, series: Dict[str, pd.DataFrame], **params) -> Dict[str, 'IntermittentDemandModel']:
+        """
+        Fit one model per series in a single vectorized pass
+        
+        Args:
+            series: Mapping of series id -> DataFrame with 'ds' and 'y' columns
+            **params: Model parameters shared by all series
+        
+        Returns:
+            Mapping of series id -> fitted model
+        """
+        keys = list(series.keys())
+        if not keys:
+            return {}
+        
+        # Validate all series together instead of one DataFrame at a time
+        lengths = [len(series[key]) for key in keys]
+        combined = pd.DataFrame({
+            'row': np.repeat(np.arange(len(keys)), lengths),
+            'ds': pd.to_datetime(np.concatenate([series[key]['ds'].values for key in keys])),
+            'y': pd.to_numeric(np.concatenate([series[key]['y'].values for key in keys]), errors='coerce')
+        }).dropna()
+        if combined.empty:
+            return {}
+        
+        rows = combined['row'].values
+        first_day = combined['ds'].min()
+        columns = (combined['ds'] - first_day).dt.days.values
+        
+        # Common day axis; NaN outside each series' own date range
+        Y = np.full((len(keys), columns.max() + 1), np.nan)
+        Y[rows, columns] = combined['y'].values
+        series_start = np.full(len(keys), Y.shape[1])
+        series_end = np.full(len(keys), -1)
+        np.minimum.at(series_start, rows, columns)
+        np.maximum.at(series_end, rows, columns)
+        days = np.arange(Y.shape[1])
+        in_range = (days >= series_start[:, None]) & (days <= series_end[:, None])
+        Y[in_range & np.isnan(Y)] = 0.0
+        
+        rates, rmse = cls(**params)._fit_rates(Y)
+        
+        models = {}
+        for row in np.unique(rows):
+            model = cls(**params)
+            model.demand_rate = float(rates[row])
+            model.rmse = float(rmse[row])
+            model.last_date = first_day + timedelta(days=int(series_end[row]))
+            model.is_fitted = True
+            models[keys[row]] = model
+        
+        return models
+    
+    def predict(self, periods: int) -> pd.DataFrame:
+        """Predict a flat demand rate with residual-based bounds"""
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted before prediction")
+        
+        dates = pd.date_range(start=self.last_date + timedelta(days=1), periods=periods)
+        forecast = np.full(periods, max(0.0, self.demand_rate))
+        
+        return pd.DataFrame({
+            'date': dates,
+            'forecast': forecast,
+            'lower_bound': np.clip(forecast - 1.96 * self.rmse, 0, None),
+            'upper_bound': forecast + 1.96 * self.rmse
+        })
+
+
+class CrostonModel(IntermittentDemandModel):
+    """
+    Croston's Method
+    Best for: Intermittent demand with stable sizes between sporadic sales
+    Smooths demand size and inter-demand interval separately
+    """
+    
+    def __init__(self, alpha: float = 0.1):
+        super().__init__('Croston', alpha)
+    
+    def _demand_rates(self, Y: np.ndarray) -> np.ndarray:
+        size, interval = croston_batch(Y, self.alpha)
+        return size / interval
+
+
+class SBAModel(CrostonModel):
+    """
+    Syntetos-Boylan Approximation
+    Best for: Lumpy demand; Croston with its upward bias corrected
+    """
+    
+    def __init__(self, alpha: float = 0.1):
+        super().__init__(alpha)
+        self.name = 'SBA'
+    
+    def _demand_rates(self, Y: np.ndarray) -> np.ndarray:
+        return (1 - self.alpha / 2) * super()._demand_rates(Y)
+
+
+class TSBModel(IntermittentDemandModel):
+    """
+    Teunter-Syntetos-Babai Method
+    Best for: Very sparse demand and items at risk of obsolescence
+    Updates demand probability every day, so forecasts decay when sales stop
+    """
+    
+    def __init__(self, alpha: float = 0.1, beta: float = 0.1):
+        super().__init__('TSB', alpha)
+        self.beta = beta
+    
+    def get_params(self) -> Dict:
+        """Get smoothing parameters"""
+        return {'alpha': self.alpha, 'beta': self.beta}
+    
+    def _demand_rates(self, Y: np.ndarray) -> np.ndarray:
+        probability, size = tsb_batch(Y, self.alpha, self.beta)
+        return probability * size
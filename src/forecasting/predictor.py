@@ -6,8 +6,35 @@ Handles data preparation, model selection, and forecast generation
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Union
-from .models import ProphetModel, XGBoostModel, EnsembleModel, SimpleMovingAverage
+from functools import partial
+from typing import Callable, Dict, List, Optional, Union
+from .models import (BaseModel, ProphetModel, SimpleMovingAverage,
+                     CrostonModel, SBAModel, TSBModel, classify_demand)
+from .backtest import BacktestEngine, get_backtest_engine
+from .selection import CostAwareSelector, get_model_selector
+from .tuning import tuned_ensemble, tuned_xgboost
+from .sketches import get_demand_sketches
+from .serialization import forecast_records
+from ..config import FORECAST_CONFIG
+
+
+# Share of zero-demand days above which sporadic series use TSB instead of Croston/SBA
+TSB_ZERO_RATIO = 0.9
+
+
+def build_model(name: str, category: Optional[str] = None) -> BaseModel:
+    """Construct a model type as forecasts use it (XGBoost tuned for the category; unknown types get XGBoost)"""
+    models = {
+        'prophet': ProphetModel,
+        'xgboost': lambda: tuned_xgboost(category),
+        'ensemble': lambda: tuned_ensemble(category),
+        'simple': SimpleMovingAverage,
+        'croston': CrostonModel,
+        'sba': SBAModel,
+        'tsb': TSBModel
+    }
+    
+    return models.get(name, models['xgboost'])()
 
 
 class InventoryForecaster:
@@ -16,47 +43,89 @@ class InventoryForecaster:
     Optimized for medium-sized datasets (1000-100000 records)
     """
     
-    def __init__(self, model_type: str = 'auto'):
+    def __init__(self, model_type: str = 'auto',
+                 metrics_mode: str = 'lazy',
+                 backtest_engine: Optional[BacktestEngine] = None,
+                 time_budget: Optional[float] = None,
+                 selector: Optional[CostAwareSelector] = None):
         """
         Initialize forecaster
         
         Args:
-            model_type: 'prophet', 'xgboost', 'ensemble', 'simple', or 'auto'
+            model_type: 'prophet', 'xgboost', 'ensemble', 'simple',
+                        'croston', 'sba', 'tsb', or 'auto'
+            metrics_mode: 'lazy' (backtest on first get_metrics call),
+                          'background' (backtest starts right after fit) or
+                          'inline' (backtest during fit)
+            backtest_engine: Engine used for accuracy metrics (default: shared engine)
+            time_budget: Seconds allowed for fit + predict. With model_type 'auto'
+                         the cost-aware selector picks the most accurate model
+                         within this budget once the series' demand profile has
+                         been measured (default: FORECAST_CONFIG setting)
+            selector: Cost-aware selector (default: shared selector)
         """
         self.model_type = model_type
+        self.metrics_mode = metrics_mode
+        self.backtest_engine = backtest_engine or get_backtest_engine()
         self.model = None
         self.data = None
         self.product_id = None
+        self.category = None
         self.metrics = {}
+        self._metrics_future = None
+        self.time_budget = time_budget if time_budget is not None else FORECAST_CONFIG['default_time_budget']
+        self.selector = selector
+        self.selection = {}
+        self._selection_sample = None
     
-    def _select_model(self, data_size: int) -> object:
+    def _select_model(self, data: pd.DataFrame) -> object:
         """Auto-select best model based on data characteristics"""
         if self.model_type == 'auto':
+            if self.time_budget is not None:
+                selector = self.selector or get_model_selector()
+                # Candidates are measured as this forecaster would build them
+                name, self.selection = selector.select(data, self.time_budget, sample=self._selection_sample,
+                                                       build=partial(build_model, category=self.category))
+                if name is not None:
+                    model = build_model(name, self.category)
+                    print(f"📊 Auto-selected: {model.name} (profile {self.selection['profile']}, "
+                          f"~{self.selection['expected_seconds']}s within {self.time_budget}s budget)")
+                    return model
+                # Profile still being measured: rule-based choice below
+            
+            data_size = len(data)
+            profile = classify_demand(data['y'].values)
+            
+            # Sporadic demand goes to intermittent-demand models regardless of length
+            if profile['demand_class'] in ('intermittent', 'lumpy'):
+                if profile['zero_ratio'] >= TSB_ZERO_RATIO:
+                    print(f"📊 Auto-selected: TSB (very sparse demand, {profile['zero_ratio']:.0%} zero days)")
+                    return TSBModel()
+                if profile['demand_class'] == 'lumpy':
+                    print(f"📊 Auto-selected: SBA (lumpy demand, ADI {profile['adi']:.2f})")
+                    return SBAModel()
+                print(f"📊 Auto-selected: Croston (intermittent demand, ADI {profile['adi']:.2f})")
+                return CrostonModel()
+            
             if data_size < 30:
                 print("📊 Auto-selected: Simple Moving Average (small dataset)")
                 return SimpleMovingAverage(window=min(7, data_size))
             elif data_size < 365:
                 print("📊 Auto-selected: XGBoost (medium dataset)")
-                return XGBoostModel()
+                return tuned_xgboost(self.category)
             else:
                 print("📊 Auto-selected: Ensemble (large dataset)")
-                return EnsembleModel()
+                return tuned_ensemble(self.category)
         
-        models = {
-            'prophet': ProphetModel,
-            'xgboost': XGBoostModel,
-            'ensemble': EnsembleModel,
-            'simple': SimpleMovingAverage
-        }
-        
-        return models.get(self.model_type, XGBoostModel)()
+        return build_model(self.model_type, self.category)
     
     def prepare_data(self, 
                      transactions: pd.DataFrame,
                      product_id: Optional[str] = None,
                      date_col: str = 'Date',
                      quantity_col: str = 'Quantity',
-                     product_col: str = 'Product_ID') -> pd.DataFrame:
+                     product_col: str = 'product_id',
+                     category_col: str = 'Category') -> pd.DataFrame:
         """
         Prepare transaction data for forecasting
         
@@ -66,16 +135,22 @@ class InventoryForecaster:
             date_col: Name of date column
             quantity_col: Name of quantity column
             product_col: Name of product ID column
+            category_col: Name of category column (selects tuned model settings)
         
         Returns:
             Prepared DataFrame with 'ds' and 'y' columns
         """
         df = transactions.copy()
+        self.category = None
         
         # Filter by product if specified
         if product_id and product_col in df.columns:
-            df = df[df[product_col] == product_id]
+            # Ids arrive as strings from JSON bodies and URLs
+            df = df[df[product_col].astype(str) == str(product_id)]
             self.product_id = product_id
+            
+            if category_col in df.columns and not df.empty:
+                self.category = df[category_col].mode().iloc[0]
         
         # Ensure date column exists
         if date_col not in df.columns:
@@ -122,11 +197,18 @@ class InventoryForecaster:
         print(f"   Data points: {len(self.data)}")
         print(f"   Date range: {self.data['ds'].min()} to {self.data['ds'].max()}")
         
-        self.model = self._select_model(len(self.data))
+        self.model = self._select_model(self.data)
+        self.model.series_id = self.product_id if self.product_id is not None else '__all__'
+        self.model.feature_key = self.model.series_id
         self.model.fit(self.data)
         
-        # Calculate training metrics
-        self._calculate_metrics()
+        # Accuracy metrics come from the backtesting engine, not a second inline fit
+        self.metrics = {}
+        self._metrics_future = None
+        if self.metrics_mode == 'inline':
+            self._calculate_metrics()
+        elif self.metrics_mode == 'background':
+            self._metrics_future = self.backtest_engine.submit(self.model, self.data)
         
         print(f"   ✅ Model trained successfully")
         
@@ -159,50 +241,46 @@ class InventoryForecaster:
         return forecast
     
     def _calculate_metrics(self) -> Dict:
-        """Calculate model accuracy metrics using cross-validation"""
-        if len(self.data) < 30:
-            self.metrics = {'note': 'Insufficient data for CV'}
+        """Calculate model accuracy metrics using rolling-origin backtesting"""
+        self.metrics = self.backtest_engine.evaluate(self.model, self.data)
+        return self.metrics
+    
+    def get_metrics(self, wait: bool = True) -> Dict:
+        """
+        Get model performance metrics
+        
+        Args:
+            wait: Block until metrics are available. If False and the backtest
+                  is still running, returns {'status': 'pending'}
+        
+        Returns:
+            Accuracy metrics dictionary
+        """
+        if self.metrics or self.model is None:
             return self.metrics
         
-        # Simple holdout validation
-        train_size = int(len(self.data) * 0.8)
-        train = self.data.iloc[:train_size]
-        test = self.data.iloc[train_size:]
+        if self._metrics_future is not None:
+            if wait or self._metrics_future.done():
+                self.metrics = self._metrics_future.result()
+                return self.metrics
+            return {'status': 'pending'}
         
-        try:
-            temp_model = self.model.__class__()
-            temp_model.fit(train)
-            predictions = temp_model.predict(len(test))
-            
-            actual = test['y'].values
-            predicted = predictions['forecast'].values[:len(actual)]
-            
-            # Calculate metrics
-            mae = np.mean(np.abs(actual - predicted))
-            rmse = np.sqrt(np.mean((actual - predicted) ** 2))
-            mape = np.mean(np.abs((actual - predicted) / (actual + 1))) * 100
-            
-            self.metrics = {
-                'mae': round(mae, 2),
-                'rmse': round(rmse, 2),
-                'mape': round(mape, 2),
-                'train_size': train_size,
-                'test_size': len(test)
-            }
-        except Exception as e:
-            self.metrics = {'error': str(e)}
+        cached = self.backtest_engine.get_cached(self.model, self.data)
+        if cached is not None:
+            self.metrics = cached
+            return self.metrics
         
-        return self.metrics
-    
-    def get_metrics(self) -> Dict:
-        """Get model performance metrics"""
-        return self.metrics
+        if not wait:
+            return {'status': 'not_computed'}
+        
+        return self._calculate_metrics()
     
     def forecast_all_products(self, 
                               transactions: pd.DataFrame,
                               periods: int = 30,
                               top_n: Optional[int] = None,
-                              product_col: str = 'Product_ID') -> Dict[str, pd.DataFrame]:
+                              product_col: str = 'product_id',
+                              progress_callback: Optional[Callable[[int, int, str], None]] = None) -> Dict[str, pd.DataFrame]:
         """
         Generate forecasts for multiple products
         
@@ -211,6 +289,7 @@ class InventoryForecaster:
             periods: Days to forecast
             top_n: Limit to top N products by transaction volume
             product_col: Product identifier column
+            progress_callback: Called as (done, total, product_id) after each product
         
         Returns:
             Dictionary of product_id -> forecast DataFrame
@@ -222,9 +301,17 @@ class InventoryForecaster:
         
         print(f"\n🔮 Forecasting {len(products)} products...")
         
+        # Unknown demand profiles are measured on a sample in the background
+        if self.model_type == 'auto' and self.time_budget is not None:
+            selector = self.selector or get_model_selector()
+            self._selection_sample = [
+                self.prepare_data(transactions, product_id=product_id, product_col=product_col)
+                for product_id in products.index[:selector.sample_size]
+            ]
+        
         forecasts = {}
         
-        for product_id in products.index:
+        for done, product_id in enumerate(products.index, start=1):
             try:
                 self.prepare_data(transactions, product_id=product_id, product_col=product_col)
                 self.fit()
@@ -233,6 +320,9 @@ class InventoryForecaster:
                 print(f"   ✓ {product_id}")
             except Exception as e:
                 print(f"   ✗ {product_id}: {e}")
+            
+            if progress_callback:
+                progress_callback(done, len(products), str(product_id))
         
         return forecasts
     
@@ -240,7 +330,9 @@ class InventoryForecaster:
                                     forecast: pd.DataFrame,
                                     current_stock: int,
                                     lead_time_days: int = 7,
-                                    safety_stock_multiplier: float = 1.5) -> Dict:
+                                    safety_stock_multiplier: float = 1.5,
+                                    service_level: Optional[float] = None,
+                                    sketch_key: Optional[str] = None) -> Dict:
         """
         Get reorder recommendations based on forecast
         
@@ -249,6 +341,10 @@ class InventoryForecaster:
             current_stock: Current inventory level
             lead_time_days: Supplier lead time in days
             safety_stock_multiplier: Safety stock factor
+            service_level: Target probability of no stockout during lead time (optional)
+            sketch_key: Demand sketch of the stock position ('<product_id>:<warehouse_id>');
+                        with service_level, safety stock is a quantile lookup instead
+                        of the multiplier
         
         Returns:
             Reorder recommendation dictionary
@@ -263,6 +359,11 @@ class InventoryForecaster:
         avg_daily = forecast['forecast'].mean()
         safety_stock = avg_daily * safety_stock_multiplier * np.sqrt(lead_time_days)
         
+        if sketch_key and service_level:
+            quantile_stock = get_demand_sketches().safety_stock([sketch_key], service_level, lead_time_days)[0]
+            if not np.isnan(quantile_stock):
+                safety_stock = quantile_stock
+        
         # Reorder point
         reorder_point = demand_during_lead + safety_stock
         
@@ -271,7 +372,7 @@ class InventoryForecaster:
         days_until_stockout = len(cumulative_demand[cumulative_demand <= current_stock])
         
         # Recommendation
-        should_reorder = current_stock <= reorder_point
+        should_reorder = bool(current_stock <= reorder_point)
         order_quantity = max(0, reorder_point - current_stock + (avg_daily * 14))  # 2 weeks buffer
         
         return {
@@ -287,12 +388,4 @@ class InventoryForecaster:
     
     def to_dict(self, forecast: pd.DataFrame) -> List[Dict]:
         """Convert forecast DataFrame to JSON-serializable format"""
-        result = []
-        for _, row in forecast.iterrows():
-            result.append({
-                'date': row['date'].isoformat() if hasattr(row['date'], 'isoformat') else str(row['date']),
-                'forecast': round(row['forecast'], 2),
-                'lower_bound': round(row['lower_bound'], 2),
-                'upper_bound': round(row['upper_bound'], 2)
-            })
-        return result
+        return forecast_records(forecast)
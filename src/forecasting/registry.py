@@ -0,0 +1,90 @@
+"""
+Model Registry - Persistent store for learned forecasting choices
+Keeps model selections and tuned hyperparameters in a small JSON file
+"""
+
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from ..config import FORECAST_CONFIG
+
+
+class ModelRegistry:
+    """
+    JSON-backed registry of learned forecasting settings
+
+    Entries are grouped in sections (e.g. 'selection', 'xgboost_params') and
+    keyed by a profile or category name. Writes are atomic so a crash never
+    leaves a half-written file behind.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize registry
+
+        Args:
+            path: JSON file location (default: FORECAST_CONFIG['registry_path'])
+        """
+        self.path = path or FORECAST_CONFIG['registry_path']
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self) -> Dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable model registry {self.path}: {e}")
+            return {}
+
+    def _save(self) -> None:
+        # A temporary file per write, so processes sharing the registry never collide
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='.registry-', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self._data, f, indent=2, default=str)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def get(self, section: str, key: str) -> Optional[Dict]:
+        """Get an entry (None if not registered)"""
+        with self._lock:
+            entry = self._data.get(section, {}).get(key)
+            return dict(entry) if entry is not None else None
+
+    def set(self, section: str, key: str, value: Dict) -> None:
+        """Store an entry and persist the registry"""
+        with self._lock:
+            self._data.setdefault(section, {})[key] = {
+                **value,
+                'updated_at': datetime.now().isoformat()
+            }
+            self._save()
+
+    def remove(self, section: str, key: str) -> None:
+        """Delete an entry if present"""
+        with self._lock:
+            if self._data.get(section, {}).pop(key, None) is not None:
+                self._save()
+
+    def section(self, section: str) -> Dict:
+        """Get a copy of all entries in a section"""
+        with self._lock:
+            return json.loads(json.dumps(self._data.get(section, {})))
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get the shared model registry"""
+    if not hasattr(get_model_registry, 'instance'):
+        get_model_registry.instance = ModelRegistry()
+    return get_model_registry.instance
@@ -0,0 +1,221 @@
+"""
+Catalog-Wide Reorder Planning
+Joins on-hand stock, supplier lead times and panel demand forecasts to compute
+reorder recommendations for every SKU x warehouse in one array pass
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .models import CrostonModel, SBAModel, TSBModel
+from .sketches import DemandSketchStore, get_demand_sketches
+
+
+PANEL_MODELS = {
+    'croston': CrostonModel,
+    'sba': SBAModel,
+    'tsb': TSBModel
+}
+
+SORT_KEYS = {
+    'urgency': (['slack_days', 'order_value'], [True, False]),
+    'days_until_stockout': (['days_until_stockout', 'order_value'], [True, False]),
+    'order_value': (['order_value'], [False]),
+    'order_qty': (['recommended_order_qty'], [False])
+}
+
+
+def last_complete_day(now: Optional[pd.Timestamp] = None) -> pd.Timestamp:
+    """
+    Yesterday: the newest day whose sales are complete
+
+    Today's partial sales must not end a panel, since the intermittent models
+    weight the newest day most and would read it as a demand drop.
+    """
+    return pd.Timestamp(now or pd.Timestamp.now()).normalize() - pd.Timedelta(days=1)
+
+
+def demand_panel(positions: pd.DataFrame,
+                 demand: pd.DataFrame,
+                 history_days: int,
+                 end_date: pd.Timestamp) -> np.ndarray:
+    """
+    Build a dense daily demand matrix aligned with `positions`
+
+    Args:
+        positions: One row per SKU x warehouse with 'product_id' and 'warehouse_id'
+        demand: Daily demand rows with 'product_id', 'warehouse_id', 'Date', 'Quantity'
+        history_days: Days of history (matrix width)
+        end_date: Last day of the history window
+
+    Returns:
+        (len(positions), history_days) array; days without sales are zero
+    """
+    Y = np.zeros((len(positions), history_days), dtype=np.float64)
+    if demand.empty or not len(positions):
+        return Y
+
+    index = pd.MultiIndex.from_frame(positions[['product_id', 'warehouse_id']])
+    rows = index.get_indexer(pd.MultiIndex.from_frame(demand[['product_id', 'warehouse_id']]))
+    start_date = end_date - pd.Timedelta(days=history_days - 1)
+    cols = (pd.to_datetime(demand['Date']).dt.normalize() - start_date).dt.days.values
+
+    valid = (rows >= 0) & (cols >= 0) & (cols < history_days)
+    np.add.at(Y, (rows[valid], cols[valid]), demand['Quantity'].values[valid].astype(np.float64))
+    return Y
+
+
+def position_keys(positions: pd.DataFrame) -> List[str]:
+    """Demand sketch key per stock position ('<product_id>:<warehouse_id>')"""
+    return (positions['product_id'].astype(str) + ':' + positions['warehouse_id'].astype(str)).tolist()
+
+
+def sync_sketches(positions: pd.DataFrame,
+                  demand: pd.DataFrame,
+                  history_days: int,
+                  default_lead_time: int = 7,
+                  sketches: Optional[DemandSketchStore] = None,
+                  end_date: Optional[pd.Timestamp] = None) -> int:
+    """
+    Ingest the complete days of a demand history into the per-position sketches
+
+    Args:
+        end_date: Last day of the history window (default: last_complete_day())
+
+    Returns:
+        Number of position-days ingested
+    """
+    end_date = pd.Timestamp(end_date or last_complete_day()).normalize()
+    sketches = sketches or get_demand_sketches()
+    lead_time = positions['Lead_Time'].fillna(default_lead_time).values.astype(np.float64)
+    Y = demand_panel(positions, demand, history_days, end_date)
+    return sketches.sync(position_keys(positions), lead_time, Y, end_date)
+
+
+def fit_panel(positions: pd.DataFrame,
+              demand: pd.DataFrame,
+              history_days: int,
+              model: str,
+              end_date: pd.Timestamp) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fit a panel model on the daily demand of every position
+
+    Returns:
+        (demand matrix, daily demand rate, residual rmse) aligned with `positions`
+    """
+    if model not in PANEL_MODELS:
+        raise ValueError(f"Unknown panel model: {model}. Choose from {list(PANEL_MODELS)}")
+
+    Y = demand_panel(positions, demand, history_days, end_date)
+    rates, rmse = PANEL_MODELS[model]()._fit_rates(Y)
+    return Y, rates, rmse
+
+
+def reorder_plan(positions: pd.DataFrame,
+                 demand: pd.DataFrame,
+                 history_days: int = 90,
+                 model: str = 'tsb',
+                 safety_stock_multiplier: float = 1.5,
+                 review_days: int = 14,
+                 default_lead_time: int = 7,
+                 service_level: Optional[float] = None,
+                 sketches: Optional[DemandSketchStore] = None,
+                 end_date: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """
+    Compute reorder recommendations for every stock position
+
+    Demand is forecast per position with a vectorized intermittent-demand model
+    fitted on the whole panel at once; the reorder math mirrors
+    InventoryForecaster.get_reorder_recommendations on flat daily rates.
+
+    Args:
+        positions: Stock positions from DashboardDataAPI.get_reorder_positions()
+        demand: Daily demand from DashboardDataAPI.get_daily_demand()
+        history_days: Days of demand history used for the forecast
+        model: Panel model ('croston', 'sba' or 'tsb')
+        safety_stock_multiplier: Safety stock factor
+        review_days: Days of demand covered beyond the reorder point
+        default_lead_time: Lead time for positions without a supplier
+        service_level: Target probability of no stockout during lead time. When set,
+                       safety stock comes from per-position demand quantile sketches
+                       instead of the multiplier (optional)
+        sketches: Sketch store synced with the panel (default: shared store)
+        end_date: Last day of history (default: yesterday, the last complete day)
+
+    Returns:
+        One row per position, in the order of `positions`
+    """
+    end_date = pd.Timestamp(end_date or last_complete_day()).normalize()
+    Y, avg_daily, demand_std = fit_panel(positions, demand, history_days, model, end_date)
+
+    on_hand = positions['Quantity'].values.astype(np.float64)
+    reserved = positions['Reserved'].values.astype(np.float64)
+    available = on_hand - reserved
+    lead_time = positions['Lead_Time'].fillna(default_lead_time).values.astype(np.float64)
+    unit_price = positions['Unit_Price'].fillna(0).values.astype(np.float64)
+
+    demand_during_lead = avg_daily * lead_time
+    safety_stock = avg_daily * safety_stock_multiplier * np.sqrt(lead_time)
+
+    if service_level is not None:
+        sketches = sketches or get_demand_sketches()
+        keys = position_keys(positions)
+        sketches.sync(keys, lead_time, Y, end_date)
+        quantile_stock = sketches.safety_stock(keys, service_level)
+        safety_stock = np.where(np.isnan(quantile_stock), safety_stock, quantile_stock)
+
+    reorder_point = demand_during_lead + safety_stock
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        days_until_stockout = np.where(
+            available <= 0, 0.0,
+            np.where(avg_daily > 0, np.floor(available / avg_daily), np.inf)
+        )
+
+    should_reorder = available <= reorder_point
+    order_qty = np.where(
+        should_reorder,
+        np.ceil(np.maximum(0, reorder_point - available + avg_daily * review_days)),
+        0.0
+    )
+
+    # Slack: days of cover left after a replenishment ordered today would arrive
+    slack_days = days_until_stockout - lead_time
+    status = np.select(
+        [available <= 0, slack_days < 0, should_reorder],
+        ['stockout', 'critical', 'reorder'],
+        default='ok'
+    )
+
+    return pd.DataFrame({
+        'product_id': positions['product_id'].values,
+        'sku': positions['sku'].values,
+        'product': positions['Product'].values,
+        'category': positions['Category'].values,
+        'warehouse_id': positions['warehouse_id'].values,
+        'warehouse': positions['Warehouse'].values,
+        'supplier': positions['Supplier'].values,
+        'current_stock': available,
+        'lead_time_days': lead_time,
+        'avg_daily_demand': np.round(avg_daily, 2),
+        'demand_std': np.round(demand_std, 2),
+        'demand_during_lead_time': np.round(demand_during_lead),
+        'safety_stock': np.round(safety_stock),
+        'reorder_point': np.round(reorder_point),
+        'days_until_stockout': days_until_stockout,
+        'slack_days': slack_days,
+        'should_reorder': should_reorder,
+        'recommended_order_qty': order_qty,
+        'order_value': np.round(order_qty * unit_price, 2),
+        'status': status
+    })
+
+
+def sort_plan(plan: pd.DataFrame, sort: str = 'urgency') -> pd.DataFrame:
+    """Sort a reorder plan (most urgent first by default)"""
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key: {sort}. Choose from {list(SORT_KEYS)}")
+    columns, ascending = SORT_KEYS[sort]
+    return plan.sort_values(columns, ascending=ascending, kind='stable').reset_index(drop=True)
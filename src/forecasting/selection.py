@@ -0,0 +1,280 @@
+"""
+Cost-Aware Model Selection
+Profiles candidate models for accuracy against fit/predict time and picks
+the most accurate one that fits a per-request latency budget
+"""
+
+import hashlib
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .backtest import model_signature
+from .models import (BaseModel, ProphetModel, XGBoostModel, EnsembleModel, SimpleMovingAverage,
+                     CrostonModel, SBAModel, TSBModel, classify_demand)
+from .registry import ModelRegistry, get_model_registry
+from ..config import FORECAST_CONFIG
+
+
+CANDIDATE_MODELS = {
+    'simple': SimpleMovingAverage,
+    'croston': CrostonModel,
+    'sba': SBAModel,
+    'tsb': TSBModel,
+    'xgboost': XGBoostModel,
+    'prophet': ProphetModel,
+    'ensemble': EnsembleModel
+}
+
+# Builds a candidate model from its type name
+ModelBuilder = Callable[[str], BaseModel]
+
+
+def default_builder(name: str) -> BaseModel:
+    """Candidate with its class defaults"""
+    return CANDIDATE_MODELS[name]()
+
+
+def profile_key(data: pd.DataFrame) -> str:
+    """
+    Group series that should behave alike for model selection
+
+    Returns:
+        '<demand class>:<length bucket>', e.g. 'lumpy:medium'
+    """
+    demand_class = classify_demand(data['y'].values)['demand_class']
+    n = len(data)
+    length = 'short' if n < 30 else 'medium' if n < 365 else 'long'
+    return f"{demand_class}:{length}"
+
+
+class CostAwareSelector:
+    """
+    Model selector that trades accuracy against fit/predict time
+
+    For each demand profile, candidates are fitted on a holdout split of a
+    few sample series. Candidates come from the caller's model builder, so the
+    measured model is the one that would be served (e.g. with XGBoost settings
+    tuned for the category). Scaled MAE and wall time are stored in the model
+    registry per demand profile and candidate configuration, so later requests
+    with the same profile and configuration skip the profiling and only apply
+    their own time budget to the stored measurements. Profiling an
+    unknown profile runs in the background (or offline via learn()); until it
+    is registered, select() returns no choice and callers use their rule-based
+    selection. Profiles where no candidate could run are registered empty, so
+    they are not profiled again.
+    """
+
+    SECTION = 'selection'
+
+    def __init__(self,
+                 registry: Optional[ModelRegistry] = None,
+                 candidates: Optional[List[str]] = None,
+                 holdout_days: int = 14,
+                 sample_size: Optional[int] = None):
+        """
+        Initialize selector
+
+        Args:
+            registry: Where measurements are kept (default: shared registry)
+            candidates: Model types to consider (default: all CANDIDATE_MODELS)
+            holdout_days: Maximum holdout length for scoring
+            sample_size: Series profiled per demand profile
+        """
+        self.registry = registry or get_model_registry()
+        self.candidates = candidates or list(CANDIDATE_MODELS.keys())
+        self.holdout_days = holdout_days
+        self.sample_size = sample_size or FORECAST_CONFIG['selection_sample_size']
+
+        self._background_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='model-profiling')
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    def _evaluate(self, name: str, data: pd.DataFrame, build: ModelBuilder = default_builder) -> Optional[Dict]:
+        """Fit one candidate on a holdout split; None if it cannot run"""
+        holdout = min(self.holdout_days, len(data) // 4)
+        if holdout < 1:
+            return None
+
+        train = data.iloc[:-holdout]
+        actual = data['y'].values[-holdout:].astype(np.float64)
+        model = build(name)
+
+        try:
+            start = time.perf_counter()
+            model.fit(train)
+            predicted = model.predict(holdout)['forecast'].values
+            seconds = time.perf_counter() - start
+        except ImportError:
+            return None
+        except Exception as e:
+            print(f"   ✗ {name} failed during profiling: {e}")
+            return None
+
+        mae = float(np.mean(np.abs(actual - predicted)))
+        scale = float(np.mean(np.abs(train['y'].values)))
+        return {
+            'error': mae / scale if scale > 0 else mae,
+            'seconds': seconds
+        }
+
+    def profile(self, series: List[pd.DataFrame], build: ModelBuilder = default_builder) -> Dict[str, Dict]:
+        """
+        Measure every candidate on a sample of series
+
+        Args:
+            series: Prepared series of one demand profile
+            build: Constructs each candidate (default: class defaults)
+
+        Returns:
+            Mapping of model type -> {'error', 'seconds', 'samples'}
+        """
+        sample = series[:self.sample_size]
+        stats = {}
+
+        for name in self.candidates:
+            results = [r for r in (self._evaluate(name, data, build) for data in sample) if r is not None]
+            if results:
+                stats[name] = {
+                    'error': round(float(np.mean([r['error'] for r in results])), 4),
+                    'seconds': round(float(np.mean([r['seconds'] for r in results])), 4),
+                    'samples': len(results)
+                }
+
+        return stats
+
+    def configuration(self, build: ModelBuilder = default_builder) -> str:
+        """Short hash of the candidates' settings as `build` constructs them"""
+        signatures = '|'.join(f"{name}={model_signature(build(name))}" for name in self.candidates)
+        return hashlib.sha1(signatures.encode('utf-8')).hexdigest()[:12]
+
+    def _learn_profile(self, key: str, group: List[pd.DataFrame], build: ModelBuilder) -> Dict[str, Dict]:
+        """Profile candidates for one registry key and register the measurements"""
+        entry = self.registry.get(self.SECTION, key)
+        if entry is None:
+            print(f"⏱️ Profiling {len(self.candidates)} models for profile '{key}'...")
+            # An empty entry records that no candidate could run on this profile
+            entry = {'candidates': self.profile(group, build)}
+            self.registry.set(self.SECTION, key, entry)
+        return entry['candidates']
+
+    @staticmethod
+    def _group(series: List[pd.DataFrame], configuration: str) -> Dict[str, List[pd.DataFrame]]:
+        """Series by registry key: '<demand profile>@<candidate configuration>'"""
+        groups = {}
+        for data in series:
+            groups.setdefault(f"{profile_key(data)}@{configuration}", []).append(data)
+        return groups
+
+    def learn(self, series: List[pd.DataFrame], build: ModelBuilder = default_builder) -> Dict[str, Dict]:
+        """
+        Profile candidates for every demand profile in `series` not yet registered
+
+        Runs in the calling thread (offline warm-up); see submit() for requests.
+
+        Args:
+            series: Prepared series
+            build: Constructs each candidate (default: class defaults)
+
+        Returns:
+            Mapping of registry key -> candidate measurements
+        """
+        groups = self._group(series, self.configuration(build))
+        return {key: self._learn_profile(key, group, build) for key, group in groups.items()}
+
+    def submit(self, series: List[pd.DataFrame], build: ModelBuilder = default_builder) -> Dict[str, Future]:
+        """
+        Profile unregistered demand profiles of `series` in the background
+
+        Profiles already being profiled share the in-flight Future.
+
+        Args:
+            series: Prepared series
+            build: Constructs each candidate (default: class defaults)
+
+        Returns:
+            Mapping of unregistered registry key -> Future of its candidate measurements
+        """
+        futures = {}
+        for key, group in self._group(series, self.configuration(build)).items():
+            if self.registry.get(self.SECTION, key) is not None:
+                continue
+            with self._lock:
+                future = self._pending.get(key)
+                if future is None:
+                    future = self._background_pool.submit(self._learn_profile, key, group, build)
+                    self._pending[key] = future
+                    future.add_done_callback(lambda _, key=key: self._forget(key))
+            futures[key] = future
+        return futures
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+
+    @staticmethod
+    def choose(stats: Dict[str, Dict], time_budget: Optional[float]) -> str:
+        """
+        Pick the most accurate candidate within the time budget
+
+        Falls back to the fastest candidate when nothing fits the budget.
+        """
+        affordable = {name: s for name, s in stats.items()
+                      if time_budget is None or s['seconds'] <= time_budget}
+        if not affordable:
+            return min(stats, key=lambda name: stats[name]['seconds'])
+        return min(affordable, key=lambda name: (affordable[name]['error'], affordable[name]['seconds']))
+
+    def select(self,
+               data: pd.DataFrame,
+               time_budget: Optional[float],
+               sample: Optional[List[pd.DataFrame]] = None,
+               build: ModelBuilder = default_builder) -> Tuple[Optional[str], Dict]:
+        """
+        Select a model type for a series
+
+        Never profiles in the calling thread: an unknown profile is queued for
+        background profiling and no choice is returned for it yet.
+
+        Args:
+            data: Prepared series to forecast
+            time_budget: Seconds allowed for fit + predict
+            sample: Series profiled if this profile is unknown (default: [data])
+            build: Constructs each candidate as the caller would serve it, so
+                   measurements describe the model actually run (default: class defaults)
+
+        Returns:
+            (model type or None if the profile has no usable measurements yet, selection info)
+        """
+        key = profile_key(data)
+        configuration = self.configuration(build)
+        entry = self.registry.get(self.SECTION, f"{key}@{configuration}")
+        if entry is None:
+            # Sample series of other profiles are queued under their own keys
+            self.submit([data] if sample is None else [data] + list(sample), build)
+            return None, {'profile': key, 'configuration': configuration, 'status': 'profiling'}
+
+        stats = entry['candidates']
+        if not stats:
+            return None, {'profile': key, 'configuration': configuration, 'status': 'no_candidates'}
+
+        name = self.choose(stats, time_budget)
+        return name, {
+            'profile': key,
+            'configuration': configuration,
+            'model': name,
+            'time_budget': time_budget,
+            'expected_seconds': stats[name]['seconds'],
+            'expected_error': stats[name]['error']
+        }
+
+
+def get_model_selector() -> CostAwareSelector:
+    """Get the shared cost-aware selector"""
+    if not hasattr(get_model_selector, 'instance'):
+        get_model_selector.instance = CostAwareSelector()
+    return get_model_selector.instance
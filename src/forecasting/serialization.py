@@ -0,0 +1,88 @@
+"""
+Forecast Serialization
+Columnar forecast payloads built with vectorized rounding, and a fast JSON
+encoder (orjson when installed, standard library otherwise)
+"""
+
+import json
+from typing import Dict, Hashable, List
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+VALUE_COLUMNS = ['forecast', 'lower_bound', 'upper_bound']
+
+
+def forecast_records(forecast: pd.DataFrame) -> List[Dict]:
+    """
+    Row-oriented forecast: one {'date', 'forecast', 'lower_bound', 'upper_bound'} per day
+
+    Dates are ISO formatted and values rounded to 2 decimals in whole-column operations.
+    """
+    dates = np.datetime_as_string(pd.to_datetime(forecast['date']).values, unit='s').tolist()
+    values = [np.round(forecast[column].values.astype(np.float64), 2).tolist() for column in VALUE_COLUMNS]
+    return [
+        {'date': date, 'forecast': f, 'lower_bound': lower, 'upper_bound': upper}
+        for date, f, lower, upper in zip(dates, *values)
+    ]
+
+
+def columnar_forecasts(forecasts: Dict[Hashable, pd.DataFrame]) -> Dict:
+    """
+    Column-oriented payload for many forecasts
+
+    All products share one daily date axis. Each product's values start at
+    dates[offsets[i]] and run for as many days as its forecast has, so
+    product i's forecast for dates[offsets[i] + j] is forecast[i][j].
+
+    Returns:
+        {'dates', 'products', 'offsets', 'forecast', 'lower_bound', 'upper_bound'}
+    """
+    if not forecasts:
+        return {'dates': [], 'products': [], 'offsets': [],
+                **{column: [] for column in VALUE_COLUMNS}}
+
+    products = list(forecasts.keys())
+    starts = np.array([pd.Timestamp(forecasts[p]['date'].iloc[0]).value for p in products], dtype='datetime64[ns]')
+    lengths = np.array([len(forecasts[p]) for p in products])
+
+    first = starts.min()
+    offsets = ((starts - first) // np.timedelta64(1, 'D')).astype(np.int64)
+    axis = first + np.arange((offsets + lengths).max()) * np.timedelta64(1, 'D')
+
+    payload = {
+        'dates': np.datetime_as_string(axis, unit='s').tolist(),
+        'products': [p.item() if isinstance(p, np.generic) else p for p in products],
+        'offsets': offsets.tolist()
+    }
+
+    for column in VALUE_COLUMNS:
+        values = [forecasts[p][column].values for p in products]
+        if (lengths == lengths[0]).all():
+            payload[column] = np.round(np.vstack(values).astype(np.float64), 2).tolist()
+        else:
+            payload[column] = [np.round(v.astype(np.float64), 2).tolist() for v in values]
+
+    return payload
+
+
+def _default(obj):
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return str(obj)
+
+
+def dumps(payload) -> bytes:
+    """Encode JSON with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, separators=(',', ':'), default=_default).encode('utf-8')
@@ -0,0 +1,383 @@
+"""
+Streaming Demand Quantile Sketches
+Mergeable t-digests of daily and lead-time demand per stock position, updated
+on ingest and persisted compactly, for service-level safety stock lookups
+"""
+
+import base64
+import json
+import os
+import tempfile
+import threading
+from statistics import NormalDist
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..config import FORECAST_CONFIG
+
+
+class TDigest:
+    """
+    Merging t-digest
+
+    Values are buffered and periodically merged into at most ~compression
+    centroids, sized so that tails stay precise. Digests of disjoint streams
+    can be merged. The interpolation table used by quantile() is cached until
+    the next update, so repeated lookups are a binary search over a few dozen points.
+    """
+
+    def __init__(self, compression: int = 100, buffer_size: int = 500):
+        self.compression = compression
+        self.buffer_size = buffer_size
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.count = 0.0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self._buffer = []
+        self._buffered = 0
+        self._table = None
+
+    def add(self, values, weights=None) -> None:
+        """Add values (optionally weighted)"""
+        values = np.atleast_1d(np.asarray(values, dtype=np.float64))
+        if not len(values):
+            return
+        weights = np.ones(len(values)) if weights is None else np.asarray(weights, dtype=np.float64)
+
+        self.count += weights.sum()
+        self.total += (values * weights).sum()
+        self.total_sq += (values * values * weights).sum()
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+        self._buffer.append((values, weights))
+        self._buffered += len(values)
+        self._table = None
+        if self._buffered >= self.buffer_size:
+            self._compress()
+
+    def merge(self, other: 'TDigest') -> None:
+        """Merge another digest into this one"""
+        other._compress()
+        if not len(other.means):
+            return
+        self._buffer.append((other.means, other.weights))
+        self._buffered += len(other.means)
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._table = None
+        self._compress()
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+
+        means = np.concatenate([self.means] + [v for v, _ in self._buffer])
+        weights = np.concatenate([self.weights] + [w for _, w in self._buffer])
+        self._buffer = []
+        self._buffered = 0
+
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+
+        # k1 scale function: centroid size limits shrink towards both tails
+        delta = self.compression
+        def q_limit(q):
+            k = delta / (2 * np.pi) * np.arcsin(2 * q - 1) + 1
+            return (np.sin(min(k, delta / 4) * 2 * np.pi / delta) + 1) / 2
+
+        merged_means, merged_weights = [], []
+        current_mean, current_weight = means[0], weights[0]
+        so_far = 0.0
+        limit = q_limit(0.0) * total
+
+        for mean, weight in zip(means[1:], weights[1:]):
+            if so_far + current_weight + weight <= limit:
+                current_mean += (mean - current_mean) * weight / (current_weight + weight)
+                current_weight += weight
+            else:
+                merged_means.append(current_mean)
+                merged_weights.append(current_weight)
+                so_far += current_weight
+                limit = q_limit(so_far / total) * total
+                current_mean, current_weight = mean, weight
+
+        merged_means.append(current_mean)
+        merged_weights.append(current_weight)
+        self.means = np.asarray(merged_means)
+        self.weights = np.asarray(merged_weights)
+
+    def _quantile_table(self):
+        if self._table is None:
+            self._compress()
+            centers = np.cumsum(self.weights) - self.weights / 2
+            self._table = (
+                np.concatenate(([0.0], centers, [self.count])) / self.count,
+                np.concatenate(([self.min], self.means, [self.max]))
+            )
+        return self._table
+
+    def quantile(self, q):
+        """Estimate the q-quantile(s) (nan if empty)"""
+        if not self.count:
+            return np.nan
+        positions, values = self._quantile_table()
+        return np.interp(q, positions, values)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else np.nan
+
+    @property
+    def std(self) -> float:
+        if self.count < 2:
+            return 0.0
+        variance = (self.total_sq - self.total ** 2 / self.count) / (self.count - 1)
+        return float(np.sqrt(max(variance, 0.0)))
+
+    def to_dict(self) -> Dict:
+        """Compact serialization (centroids as base64 float32 pairs)"""
+        self._compress()
+        centroids = np.column_stack([self.means, self.weights]).astype(np.float32)
+        return {
+            'compression': self.compression,
+            'count': self.count,
+            'sum': self.total,
+            'sum_sq': self.total_sq,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+            'centroids': base64.b64encode(centroids.tobytes()).decode('ascii')
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'TDigest':
+        """Restore a digest from to_dict() output"""
+        digest = cls(compression=data['compression'])
+        centroids = np.frombuffer(base64.b64decode(data['centroids']), dtype=np.float32).reshape(-1, 2)
+        digest.means = centroids[:, 0].astype(np.float64)
+        digest.weights = centroids[:, 1].astype(np.float64)
+        digest.count = data['count']
+        digest.total = data['sum']
+        digest.total_sq = data['sum_sq']
+        digest.min = data['min'] if data['min'] is not None else np.inf
+        digest.max = data['max'] if data['max'] is not None else -np.inf
+        return digest
+
+
+class DemandSketch:
+    """Daily and lead-time demand digests for one stock position"""
+
+    # Lead-time windows needed before the lead-time digest is trusted
+    MIN_LEAD_SAMPLES = 30
+
+    def __init__(self, lead_time: int, compression: int):
+        self.lead_time = lead_time
+        self.daily = TDigest(compression)
+        self.lead = TDigest(compression)
+        self.window = np.empty(0)  # Last lead_time - 1 days, to continue lead-time sums
+        self.last_date = None
+
+    def ingest(self, daily_demand: np.ndarray, last_date: pd.Timestamp) -> None:
+        """Add consecutive complete days following self.last_date"""
+        self.daily.add(daily_demand)
+
+        history = np.concatenate([self.window, daily_demand])
+        if len(history) >= self.lead_time:
+            sums = np.convolve(history, np.ones(self.lead_time), mode='valid')
+            self.lead.add(sums)
+        self.window = history[-(self.lead_time - 1):] if self.lead_time > 1 else np.empty(0)
+        self.last_date = last_date
+
+    def set_lead_time(self, lead_time: int) -> None:
+        """Change the lead time; lead-time sums restart from the next ingest"""
+        if lead_time != self.lead_time:
+            self.lead_time = lead_time
+            self.lead = TDigest(self.lead.compression)
+            self.window = self.window[-(lead_time - 1):] if lead_time > 1 else np.empty(0)
+
+    def safety_stock(self, service_level: float, lead_time: Optional[int] = None) -> float:
+        """
+        Stock above expected lead-time demand needed to meet `service_level`
+
+        Uses the empirical lead-time demand quantile once enough windows were
+        seen, otherwise (or for a different lead time) a normal approximation
+        from the daily digest.
+        """
+        lead_time = lead_time or self.lead_time
+        if lead_time == self.lead_time and self.lead.count >= self.MIN_LEAD_SAMPLES:
+            return max(0.0, float(self.lead.quantile(service_level)) - self.lead.mean)
+        if not self.daily.count:
+            return 0.0
+        z = NormalDist().inv_cdf(service_level)
+        return max(0.0, z * self.daily.std * np.sqrt(lead_time))
+
+    def to_dict(self) -> Dict:
+        return {
+            'lead_time': self.lead_time,
+            'daily': self.daily.to_dict(),
+            'lead': self.lead.to_dict(),
+            'window': self.window.tolist(),
+            'last_date': self.last_date.isoformat() if self.last_date is not None else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'DemandSketch':
+        sketch = cls(data['lead_time'], data['daily']['compression'])
+        sketch.daily = TDigest.from_dict(data['daily'])
+        sketch.lead = TDigest.from_dict(data['lead'])
+        sketch.window = np.asarray(data['window'], dtype=np.float64)
+        sketch.last_date = pd.Timestamp(data['last_date']) if data['last_date'] else None
+        return sketch
+
+
+class DemandSketchStore:
+    """
+    Per-position demand sketches, persisted to a JSON file
+
+    sync() only ingests complete days after each sketch's last ingested day,
+    so repeated calls over the same history window cost almost nothing and
+    full history is never rescanned. Days between a sketch's last ingested day
+    and the start of a later panel cannot be recovered; they are counted as
+    missed and lead-time sums restart after the gap (backlog_days() tells
+    callers how much history to pass to avoid that).
+
+    Sketches are only read and updated under the store lock (t-digest lookups
+    compress buffered values in place).
+    """
+
+    def __init__(self, path: Optional[str] = None, compression: Optional[int] = None):
+        """
+        Initialize store
+
+        Args:
+            path: JSON file location (default: FORECAST_CONFIG['sketch_path'])
+            compression: t-digest compression (default: FORECAST_CONFIG['sketch_compression'])
+        """
+        self.path = path or FORECAST_CONFIG['sketch_path']
+        self.compression = compression or FORECAST_CONFIG['sketch_compression']
+        self._lock = threading.Lock()
+        self._sketches = self._load()
+        self.missed_days = 0
+
+    def _load(self) -> Dict[str, DemandSketch]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                return {key: DemandSketch.from_dict(data) for key, data in json.load(f).items()}
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Ignoring unreadable demand sketches {self.path}: {e}")
+            return {}
+
+    def save(self) -> None:
+        """
+        Persist all sketches atomically
+
+        Writes hold the store lock, so concurrent syncs in this process save in
+        turn; each write goes to its own temporary file, so processes sharing
+        the path (gunicorn workers) never interleave.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            payload = {key: sketch.to_dict() for key, sketch in self._sketches.items()}
+            fd, tmp_path = tempfile.mkstemp(prefix='.sketches-', suffix='.tmp', dir=directory)
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(payload, f, separators=(',', ':'))
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+    def backlog_days(self, today: Optional[pd.Timestamp] = None) -> Optional[int]:
+        """Complete days not yet ingested by the least recently synced sketch (None if empty)"""
+        today = pd.Timestamp(today or pd.Timestamp.now()).normalize()
+        with self._lock:
+            last_dates = [s.last_date for s in self._sketches.values() if s.last_date is not None]
+        if not last_dates:
+            return None
+        return max(0, (today - pd.Timedelta(days=1) - min(last_dates)).days)
+
+    def sync(self,
+             keys: List[str],
+             lead_times: np.ndarray,
+             panel: np.ndarray,
+             end_date: pd.Timestamp,
+             save: bool = True) -> int:
+        """
+        Ingest new complete days from a daily demand panel
+
+        Args:
+            keys: Position key per panel row
+            lead_times: Lead time in days per panel row
+            panel: (len(keys), n_days) daily demand ending at end_date
+            end_date: Date of the panel's last column (only days before today are ingested)
+            save: Persist when anything was ingested
+
+        Returns:
+            Number of position-days ingested
+        """
+        end_date = pd.Timestamp(end_date).normalize()
+        last_complete = min(end_date, pd.Timestamp.now().normalize() - pd.Timedelta(days=1))
+        complete_days = panel.shape[1] - (end_date - last_complete).days
+        if complete_days <= 0:
+            return 0
+        first_date = end_date - pd.Timedelta(days=panel.shape[1] - 1)
+
+        ingested = 0
+        with self._lock:
+            for row, key in enumerate(keys):
+                lead_time = max(1, int(lead_times[row]))
+                sketch = self._sketches.get(key)
+                if sketch is None:
+                    sketch = self._sketches[key] = DemandSketch(lead_time, self.compression)
+                    start = 0
+                else:
+                    sketch.set_lead_time(lead_time)
+                    start = (sketch.last_date - first_date).days + 1
+                    if start < 0:
+                        # Days before the panel are lost; lead-time sums must not span the gap
+                        self.missed_days += -start
+                        sketch.window = np.empty(0)
+                        start = 0
+
+                if start < complete_days:
+                    sketch.ingest(panel[row, start:complete_days], last_complete)
+                    ingested += complete_days - start
+
+        if ingested and save:
+            self.save()
+        return ingested
+
+    def safety_stock(self, keys: List[str], service_level: float, lead_time: Optional[int] = None) -> np.ndarray:
+        """Safety stock per key at a service level (nan for unknown keys)"""
+        with self._lock:
+            return np.array([
+                self._sketches[key].safety_stock(service_level, lead_time) if key in self._sketches else np.nan
+                for key in keys
+            ])
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'positions': len(self._sketches),
+                'days_ingested': int(sum(s.daily.count for s in self._sketches.values())),
+                'days_missed': self.missed_days
+            }
+
+
+def get_demand_sketches() -> DemandSketchStore:
+    """Get the shared demand sketch store"""
+    if not hasattr(get_demand_sketches, 'instance'):
+        get_demand_sketches.instance = DemandSketchStore()
+    return get_demand_sketches.instance
@@ -0,0 +1,269 @@
+"""
+XGBoost Hyperparameter Tuning
+Time-boxed successive halving with parallel trials; winning settings are kept
+per category in the model registry
+"""
+
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .features import series_features
+from .models import EnsembleModel, XGBoostModel
+from .registry import ModelRegistry, get_model_registry
+
+
+PARAM_SPACE = {
+    'max_depth': [3, 4, 6, 8],
+    'learning_rate': [0.03, 0.05, 0.1, 0.2],
+    'min_child_weight': [1, 3, 5, 10],
+    'subsample': [0.7, 0.85, 1.0],
+    'colsample_bytree': [0.7, 0.85, 1.0]
+}
+
+ALL_CATEGORIES = '__all__'
+
+
+def _deadline_callback(deadline: float):
+    """xgboost training callback that stops boosting once perf_counter() passes `deadline`"""
+    import xgboost as xgb
+
+    class DeadlineCallback(xgb.callback.TrainingCallback):
+        def __init__(self):
+            super().__init__()
+            self.expired = False
+
+        def after_iteration(self, model, epoch, evals_log) -> bool:
+            self.expired = time.perf_counter() >= deadline
+            return self.expired
+
+    return DeadlineCallback()
+
+
+class XGBoostTuner:
+    """
+    Successive-halving search over XGBoostModel hyperparameters
+
+    Every series is split in time: its last `validation_days` rows are the
+    validation set, everything before is training data. Trials of one rung run
+    in parallel with early stopping on the validation set; the best 1/eta of
+    them move on to a rung with eta times more boosting rounds. At the wall-clock
+    budget, queued trials are dropped and running ones stop after their current
+    boosting round; the best trial completed so far is kept.
+    """
+
+    SECTION = 'xgboost_params'
+
+    def __init__(self,
+                 registry: Optional[ModelRegistry] = None,
+                 param_space: Optional[Dict[str, List]] = None,
+                 n_configs: int = 18,
+                 eta: int = 3,
+                 min_rounds: int = 50,
+                 max_rounds: int = 800,
+                 validation_days: int = 28,
+                 early_stopping_rounds: int = 20,
+                 max_workers: int = 4,
+                 random_state: int = 42):
+        """
+        Initialize tuner
+
+        Args:
+            registry: Where winning settings are stored (default: shared registry)
+            param_space: Candidate values per hyperparameter (default: PARAM_SPACE)
+            n_configs: Configurations in the first rung (defaults are always included)
+            eta: Halving rate
+            min_rounds: Boosting rounds in the first rung
+            max_rounds: Maximum boosting rounds
+            validation_days: Trailing days of each series used for validation
+            early_stopping_rounds: Rounds without improvement before a trial stops
+            max_workers: Trials trained concurrently
+            random_state: Seed for sampling configurations
+        """
+        self.registry = registry or get_model_registry()
+        self.param_space = param_space or PARAM_SPACE
+        self.n_configs = n_configs
+        self.eta = eta
+        self.min_rounds = min_rounds
+        self.max_rounds = max_rounds
+        self.validation_days = validation_days
+        self.early_stopping_rounds = early_stopping_rounds
+        self.max_workers = max_workers
+        self.random_state = random_state
+
+    def _sample_configs(self) -> List[Dict]:
+        """Draw distinct configurations, starting with XGBoostModel's defaults"""
+        names = list(self.param_space.keys())
+        grid = list(itertools.product(*(self.param_space[name] for name in names)))
+        rng = np.random.default_rng(self.random_state)
+        picks = rng.choice(len(grid), size=min(self.n_configs, len(grid)), replace=False)
+
+        defaults = XGBoostModel().get_params()
+        configs = [{name: defaults[name] for name in names}]
+        for i in picks:
+            config = dict(zip(names, grid[i]))
+            if config not in configs:
+                configs.append(config)
+        return configs[:max(self.n_configs, 1)]
+
+    def _split(self, series: List[pd.DataFrame]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Stack time-ordered train/validation feature rows of all usable series"""
+        train_X, train_y, val_X, val_y = [], [], [], []
+        min_length = self.validation_days + 30
+
+        for data in series:
+            data = XGBoostModel().validate_data(data)
+            if len(data) < min_length:
+                continue
+            X = series_features(data)
+            y = data['y'].values.astype(np.float64)
+            cut = len(data) - self.validation_days
+            train_X.append(X[:cut])
+            train_y.append(y[:cut])
+            val_X.append(X[cut:])
+            val_y.append(y[cut:])
+
+        if not train_X:
+            raise ValueError(f"No series with at least {min_length} days of history to tune on")
+
+        return np.vstack(train_X), np.concatenate(train_y), np.vstack(val_X), np.concatenate(val_y)
+
+    def _trial(self, config: Dict, rounds: int, split: Tuple, deadline: float) -> Dict:
+        """
+        Train one configuration with early stopping; returns validation MAE
+
+        Training stops after the boosting round that passes `deadline`; such a
+        trial is returned with complete=False and is not ranked.
+        """
+        import xgboost as xgb
+
+        X_train, y_train, X_val, y_val = split
+        start = time.perf_counter()
+        stop = _deadline_callback(deadline)
+        model = xgb.XGBRegressor(
+            n_estimators=rounds,
+            objective='reg:squarederror',
+            eval_metric='mae',
+            early_stopping_rounds=self.early_stopping_rounds,
+            callbacks=[stop],
+            random_state=42,
+            n_jobs=1,
+            **config
+        )
+        model.fit(X_train, y_train, eval_set=[(X_val, y_val)], verbose=False)
+
+        return {
+            'config': config,
+            'rounds': rounds,
+            'score': float(model.best_score),
+            'best_iteration': int(model.best_iteration),
+            'complete': not stop.expired,
+            'seconds': time.perf_counter() - start
+        }
+
+    def search(self, series: List[pd.DataFrame], time_budget: float = 60.0) -> Dict:
+        """
+        Run successive halving on a set of series
+
+        Args:
+            series: Prepared DataFrames with 'ds' and 'y' columns
+            time_budget: Wall-clock seconds for the whole search
+
+        Returns:
+            Best parameters (including the early-stopped n_estimators) and search stats
+        """
+        try:
+            import xgboost  # noqa: F401
+        except ImportError:
+            raise ImportError("XGBoost not installed. Run: pip install xgboost")
+
+        start = time.perf_counter()
+        deadline = start + time_budget
+        split = self._split(series)
+
+        configs = self._sample_configs()
+        rounds = self.min_rounds
+        completed = []
+        rung = 0
+        timed_out = False
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='xgb-tune')
+        try:
+            while configs:
+                rung += 1
+                futures = [executor.submit(self._trial, config, rounds, split, deadline) for config in configs]
+                done, not_done = wait(futures, timeout=max(0.0, deadline - time.perf_counter()))
+
+                if not_done:
+                    # Queued trials are dropped; running ones stop at their next boosting round
+                    for future in not_done:
+                        future.cancel()
+                    done |= wait(not_done)[0]
+
+                finished = [f.result() for f in done if not f.cancelled() and f.exception() is None]
+                results = [r for r in finished if r['complete']]
+                completed.extend(results)
+                print(f"   Rung {rung}: {len(results)}/{len(configs)} trials at {rounds} rounds")
+
+                if not_done or len(results) < len(finished):
+                    timed_out = True
+                    break
+
+                if len(results) <= 1 or rounds >= self.max_rounds:
+                    break
+
+                results.sort(key=lambda r: r['score'])
+                configs = [r['config'] for r in results[:max(1, len(results) // self.eta)]]
+                rounds = min(rounds * self.eta, self.max_rounds)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        if not completed:
+            raise TimeoutError(f"No tuning trial finished within {time_budget}s")
+
+        best = min(completed, key=lambda r: r['score'])
+        return {
+            'params': {**best['config'], 'n_estimators': best['best_iteration'] + 1},
+            'score': round(best['score'], 4),
+            'trials': len(completed),
+            'rungs': rung,
+            'timed_out': timed_out,
+            'train_rows': len(split[1]),
+            'validation_rows': len(split[3]),
+            'seconds': round(time.perf_counter() - start, 2)
+        }
+
+    def tune(self, category: Optional[str], series: List[pd.DataFrame], time_budget: float = 60.0) -> Dict:
+        """Search and store the winning settings for a category"""
+        key = category or ALL_CATEGORIES
+        print(f"🎛️ Tuning XGBoost for '{key}' on {len(series)} series ({time_budget}s budget)...")
+        result = self.search(series, time_budget)
+        self.registry.set(self.SECTION, key, result)
+        print(f"   ✓ Best MAE {result['score']} with {result['params']}")
+        return result
+
+    def get_params(self, category: Optional[str]) -> Optional[Dict]:
+        """Tuned parameters for a category, falling back to the all-category entry"""
+        for key in (category, ALL_CATEGORIES):
+            if key is None:
+                continue
+            entry = self.registry.get(self.SECTION, key)
+            if entry is not None:
+                return entry['params']
+        return None
+
+
+def tuned_xgboost(category: Optional[str] = None, registry: Optional[ModelRegistry] = None) -> XGBoostModel:
+    """Build an XGBoostModel with the registered settings for a category (defaults if untuned)"""
+    params = XGBoostTuner(registry=registry).get_params(category)
+    return XGBoostModel(**params) if params else XGBoostModel()
+
+
+def tuned_ensemble(category: Optional[str] = None, registry: Optional[ModelRegistry] = None) -> EnsembleModel:
+    """Build an EnsembleModel whose XGBoost member uses the registered settings for a category"""
+    params = XGBoostTuner(registry=registry).get_params(category)
+    return EnsembleModel(member_params={'xgboost': params} if params else None)
@@ -5,6 +5,7 @@ Comprehensive KPI calculations for inventory management dashboard
 
 import pandas as pd
 import numpy as np
+import zlib
 from datetime import datetime, timedelta
 
 
@@ -13,7 +14,7 @@ class InventoryKPICalculator:
     Calculate and analyze comprehensive inventory management KPIs
     """
     
-    def __init__(self, stock_df, transactions_df, cost_data=None):
+    def __init__(self, stock_df, transactions_df, cost_data=None, random_state=None):
         """
         Initialize KPI calculator with inventory and transaction data
         
@@ -21,11 +22,21 @@ class InventoryKPICalculator:
             stock_df: DataFrame with current stock information
             transactions_df: DataFrame with historical transactions
             cost_data: Optional dict with cost information
+            random_state: Seed for the simulated KPI terms. When set, the same data
+                          always yields the same KPIs (None = new draws every call)
         """
         self.stock_df = stock_df.copy() if not stock_df.empty else stock_df
         self.transactions_df = transactions_df.copy() if not transactions_df.empty else transactions_df
         self.cost_data = cost_data or {}
         self.is_empty = stock_df.empty or len(stock_df) == 0
+        self.random_state = random_state
+    
+    def _simulated_uniform(self, name, low, high):
+        """Draw a simulated KPI term; seeded per KPI name in deterministic mode"""
+        if self.random_state is None:
+            return np.random.uniform(low, high)
+        rng = np.random.default_rng([self.random_state, zlib.crc32(name.encode())])
+        return rng.uniform(low, high)
         
     def inventory_turnover(self, period_days=365):
         """
@@ -106,7 +117,7 @@ class InventoryKPICalculator:
         
         # Add random accuracy factor
         accuracy_rate = (accurate_items / total_items * 100) if total_items > 0 else 0
-        accuracy_rate = min(accuracy_rate + np.random.uniform(0, 5), 100)
+        accuracy_rate = min(accuracy_rate + self._simulated_uniform('stock_accuracy', 0, 5), 100)
         
         inaccurate_items = total_items - int(total_items * accuracy_rate / 100)
         
@@ -228,23 +239,27 @@ class InventoryKPICalculator:
             'status': 'Good' if carrying_cost_rate < 25 else 'Average' if carrying_cost_rate < 35 else 'High'
         }
     
-    def dead_stock_percentage(self, no_movement_days=90):
+    def _dead_stock_mask(self, no_movement_days=90):
+        """Items not restocked for more than `no_movement_days` (bool Series aligned with stock_df)"""
+        self.stock_df['Last_Restocked_Date'] = pd.to_datetime(self.stock_df['Last_Restocked'])
+        days_since_movement = (datetime.now() - self.stock_df['Last_Restocked_Date']).dt.days
+        return days_since_movement > no_movement_days
+    
+    def dead_stock_percentage(self, no_movement_days=90, top_k=5):
         """
         Calculate Dead Stock Percentage
         Formula: (Dead Stock Value / Total Inventory Value) * 100
         
         Args:
             no_movement_days: Days without movement to classify as dead stock
+            top_k: Number of highest-value dead items previewed (the full list
+                   comes from stock_classification)
             
         Returns:
             dict: Dead stock metrics
         """
-        # Check last restock date
-        self.stock_df['Last_Restocked_Date'] = pd.to_datetime(self.stock_df['Last_Restocked'])
-        days_since_movement = (datetime.now() - self.stock_df['Last_Restocked_Date']).dt.days
-        
         # Identify dead stock
-        dead_stock = self.stock_df[days_since_movement > no_movement_days].copy()
+        dead_stock = self.stock_df[self._dead_stock_mask(no_movement_days)]
         
         dead_stock_value = dead_stock['Total_Value'].sum()
         total_inventory_value = self.stock_df['Total_Value'].sum()
@@ -257,7 +272,9 @@ class InventoryKPICalculator:
             'dead_stock_value': round(dead_stock_value, 2),
             'total_inventory_value': round(total_inventory_value, 2),
             'no_movement_threshold_days': no_movement_days,
-            'products': dead_stock[['Product', 'Quantity', 'Total_Value', 'Last_Restocked']].to_dict('records'),
+            'top_products': dead_stock.nlargest(top_k, 'Total_Value')[
+                ['Product', 'Quantity', 'Total_Value', 'Last_Restocked']
+            ].to_dict('records'),
             'status': 'Excellent' if dead_stock_percentage < 5 else 'Good' if dead_stock_percentage < 10 else 'Critical'
         }
     
@@ -327,7 +344,7 @@ class InventoryKPICalculator:
         total_inventory_value = self.stock_df['Total_Value'].sum()
         
         # Simulate shrinkage (theft, damage, errors)
-        shrinkage_rate = np.random.uniform(0.5, 3.0)  # 0.5% to 3%
+        shrinkage_rate = self._simulated_uniform('inventory_shrinkage', 0.5, 3.0)  # 0.5% to 3%
         shrinkage_value = total_inventory_value * (shrinkage_rate / 100)
         
         actual_value = total_inventory_value - shrinkage_value
@@ -388,17 +405,41 @@ class InventoryKPICalculator:
             'status': 'Excellent' if overall_avg < 7 else 'Good' if overall_avg < 14 else 'Slow'
         }
     
-    def abc_analysis(self):
+    def _abc_classes(self):
+        """
+        ABC class of every item (Series aligned with stock_df)
+        
+        Items are ranked by value; A covers the first 80% of cumulative value,
+        B the next 15% and C the rest. None when there is no stock value.
+        """
+        total_value = self.stock_df['Total_Value'].sum() if not self.stock_df.empty else 0
+        if total_value == 0:
+            return pd.Series(None, index=self.stock_df.index, dtype=object)
+        
+        values = self.stock_df['Total_Value'].to_numpy(dtype=float)
+        ranked = np.argsort(-values, kind='stable')
+        cumulative_percentage = np.cumsum(values[ranked]) / total_value * 100
+        
+        classes = np.empty(len(values), dtype=object)
+        classes[ranked] = np.where(cumulative_percentage <= 80, 'A',
+                                   np.where(cumulative_percentage <= 95, 'B', 'C'))
+        return pd.Series(classes, index=self.stock_df.index)
+    
+    def abc_analysis(self, top_k=5):
         """
         Perform ABC Analysis
         A items: Top 20% of products, 80% of value
         B items: Next 30% of products, 15% of value
         C items: Bottom 50% of products, 5% of value
         
+        Args:
+            top_k: Number of highest-value items previewed per class (the full
+                   lists come from stock_classification)
+        
         Returns:
             dict: ABC classification
         """
-        df = self.stock_df.copy()
+        df = self.stock_df
         
         # Handle empty data
         if df.empty or df['Total_Value'].sum() == 0:
@@ -408,46 +449,35 @@ class InventoryKPICalculator:
                 'category_C': {'count': 0, 'percentage': 0, 'value': 0, 'value_percentage': 0}
             }
         
-        df = df.sort_values('Total_Value', ascending=False)
-        
         total_value = df['Total_Value'].sum()
-        df['Cumulative_Value'] = df['Total_Value'].cumsum()
-        df['Cumulative_Percentage'] = (df['Cumulative_Value'] / total_value * 100)
-        
-        # Classify
-        df['ABC_Category'] = 'C'
-        df.loc[df['Cumulative_Percentage'] <= 80, 'ABC_Category'] = 'A'
-        df.loc[(df['Cumulative_Percentage'] > 80) & (df['Cumulative_Percentage'] <= 95), 'ABC_Category'] = 'B'
+        classes = self._abc_classes()
+        
+        result = {}
+        for category in ['A', 'B', 'C']:
+            items = df[classes == category]
+            result[f'category_{category}'] = {
+                'count': len(items),
+                'percentage': round(len(items) / len(df) * 100, 1),
+                'value': round(items['Total_Value'].sum(), 2),
+                'value_percentage': round(items['Total_Value'].sum() / total_value * 100, 1),
+                'top_products': items.nlargest(top_k, 'Total_Value')[['Product', 'Total_Value', 'Quantity']].to_dict('records')
+            }
+        result['total_value'] = round(total_value, 2)
         
-        # Calculate statistics
-        a_items = df[df['ABC_Category'] == 'A']
-        b_items = df[df['ABC_Category'] == 'B']
-        c_items = df[df['ABC_Category'] == 'C']
+        return result
+    
+    def stock_classification(self, no_movement_days=90):
+        """
+        Per-item ABC class and dead stock flag, the full membership behind the
+        abc_analysis and dead_stock_percentage previews
         
-        return {
-            'category_A': {
-                'count': len(a_items),
-                'percentage': round(len(a_items) / len(df) * 100, 1),
-                'value': round(a_items['Total_Value'].sum(), 2),
-                'value_percentage': round(a_items['Total_Value'].sum() / total_value * 100, 1),
-                'products': a_items[['Product', 'Total_Value', 'Quantity']].to_dict('records')
-            },
-            'category_B': {
-                'count': len(b_items),
-                'percentage': round(len(b_items) / len(df) * 100, 1),
-                'value': round(b_items['Total_Value'].sum(), 2),
-                'value_percentage': round(b_items['Total_Value'].sum() / total_value * 100, 1),
-                'products': b_items[['Product', 'Total_Value', 'Quantity']].to_dict('records')
-            },
-            'category_C': {
-                'count': len(c_items),
-                'percentage': round(len(c_items) / len(df) * 100, 1),
-                'value': round(c_items['Total_Value'].sum(), 2),
-                'value_percentage': round(c_items['Total_Value'].sum() / total_value * 100, 1),
-                'products': c_items[['Product', 'Total_Value', 'Quantity']].to_dict('records')
-            },
-            'total_value': round(total_value, 2)
-        }
+        Returns:
+            DataFrame: 'ABC_Class' and 'Dead_Stock' columns, aligned with stock_df
+        """
+        return pd.DataFrame({
+            'ABC_Class': self._abc_classes(),
+            'Dead_Stock': self._dead_stock_mask(no_movement_days)
+        }, index=self.stock_df.index)
     
     def inventory_valuation(self):
         """
@@ -4,20 +4,48 @@
 const ApiService = {
   baseUrl: '',
 
-  async fetch(endpoint) {
+  async request(endpoint) {
     try {
       const response = await fetch(`${this.baseUrl}/api/${endpoint}`);
       const result = await response.json();
       if (!result.success) throw new Error(result.error || 'API request failed');
-      return result.data;
+      return result;
     } catch (error) {
       console.error(`❌ API Error (${endpoint}):`, error);
       throw error;
     }
   },
 
+  async fetch(endpoint) {
+    return (await this.request(endpoint)).data;
+  },
+
   async getDashboardData(refresh = false) {
-    return this.fetch(`dashboard${refresh ? '?refresh=true' : ''}`);
+    const result = await this.request(`dashboard${refresh ? '?refresh=true' : ''}`);
+    return { ...result.data, snapshot: result.snapshot };
+  },
+
+  // Row changes since a snapshot etag: { full, tables, snapshot } (full payload when `since` is too old)
+  async getDashboardDelta(since) {
+    return this.fetch(`dashboard/delta?since=${encodeURIComponent(since)}`);
+  },
+
+  // Data of one dashboard tab, tagged with the snapshot it was computed from
+  async getView(name) {
+    const result = await this.request(`views/${name}`);
+    return { ...result.data, snapshot: result.snapshot };
+  },
+
+  // One page of stock rows: { data, total, next_cursor, facets? }
+  async queryStock(params = {}) {
+    const query = new URLSearchParams(Object.entries(params).filter(([, v]) => v !== '' && v != null));
+    return this.request(`stock?${query}`);
+  },
+
+  // One page of the items behind a list KPI (abc_analysis needs params.class)
+  async getKpiProducts(kpiId, params = {}) {
+    const query = new URLSearchParams(Object.entries(params).filter(([, v]) => v !== '' && v != null));
+    return this.request(`kpi/${kpiId}/products?${query}`);
   },
 
   async getKpiDetails(kpiId) {
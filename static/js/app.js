@@ -2,9 +2,21 @@
 // Uses modular JS files: api.js, charts.js, components.js, table.js, modal.js
 // static/js/app.js
 
+// Server view behind each tab (the details table pages /api/stock itself)
+const TAB_VIEWS = {
+    'stock-overview': 'overview',
+    'kpis': 'kpis',
+    'analytics': 'analytics',
+    'forecasting': 'forecasting',
+    'details': null
+};
+
 class StockDashboardApp {
     constructor() {
-        this.data = null;
+        this.views = {};
+        this.snapshot = null;
+        this.stream = null;
+        this.pollTimer = null;
         this.activeTab = 'stock-overview';
         this.sidebarOpen = false;
         this.init();
@@ -13,11 +25,49 @@ class StockDashboardApp {
     async init() {
         console.log('🚀 Initializing Stock Dashboard...');
         this.setupEventListeners();
-        await this.loadDashboardData();
-        setInterval(() => this.refreshData(), 60000);
+        this.showLoading(true);
+        await this.renderCurrentTab();
+        this.showLoading(false);
+        this.connectStream();
         console.log('✅ Dashboard initialized');
     }
 
+    // Live updates: subscribe to server events, poll only while the stream is down
+    connectStream() {
+        if (!window.EventSource || !this.snapshot) {
+            this.startPolling();
+            return;
+        }
+
+        // Events only announce new versions; the open tab refetches its view, the
+        // details table applies the row changes to the rows it has loaded
+        this.stream = new EventSource(`/api/stream?since=${encodeURIComponent(this.snapshot.etag)}`);
+        this.stream.addEventListener('open', () => this.stopPolling());
+        this.stream.addEventListener('snapshot', (e) => this.onSnapshotEvent(JSON.parse(e.data)));
+        this.stream.addEventListener('reset', () => this.refreshData());
+        this.stream.addEventListener('hello', (e) => {
+            if (JSON.parse(e.data).etag !== this.snapshot?.etag) this.refreshData();
+        });
+        this.stream.addEventListener('error', () => {
+            // EventSource reconnects by itself (resuming from the last event id) unless closed
+            this.startPolling();
+            if (this.stream.readyState === EventSource.CLOSED) this.stream = null;
+        });
+    }
+
+    onSnapshotEvent(event) {
+        if (event.etag !== this.snapshot?.etag) this.refreshData();
+    }
+
+    startPolling() {
+        if (!this.pollTimer) this.pollTimer = setInterval(() => this.refreshData(), 60000);
+    }
+
+    stopPolling() {
+        clearInterval(this.pollTimer);
+        this.pollTimer = null;
+    }
+
     setupEventListeners() {
         document.getElementById('hamburger-btn')?.addEventListener('click', () => this.toggleSidebar());
         document.getElementById('sidebar-overlay')?.addEventListener('click', () => this.closeSidebar());
@@ -58,53 +108,72 @@ class StockDashboardApp {
     }
 
     // Data Loading
-    async loadDashboardData() {
-        this.showLoading(true);
-        try {
-            this.data = await ApiService.getDashboardData();
-            this.updateLastUpdated(this.data.summary.last_updated);
-            this.renderCurrentTab();
-        } catch (error) {
-            this.showError('Failed to load dashboard data');
-        } finally {
-            this.showLoading(false);
+    // Views are fetched per tab on first visit and kept until a newer snapshot shows up
+    async loadView(tab) {
+        const name = TAB_VIEWS[tab];
+        if (!name) return null;
+        const cached = this.views[name];
+        if (cached && cached.snapshot.etag === this.snapshot?.etag) return cached;
+        return this.storeView(name, await ApiService.getView(name));
+    }
+
+    storeView(name, view) {
+        if (!this.snapshot || view.snapshot.version > this.snapshot.version) {
+            this.snapshot = view.snapshot;
+            this.updateLastUpdated(view.snapshot.last_updated);
         }
+        this.views[name] = view;
+        return view;
     }
 
+    // Revalidate the open tab's view (a 304 when nothing changed) and redraw it if it did
     async refreshData() {
+        const name = TAB_VIEWS[this.activeTab];
         try {
-            this.data = await ApiService.getDashboardData(true);
-            this.updateLastUpdated(this.data.summary.last_updated);
-            this.renderCurrentTab();
+            if (!name) {
+                if (this.activeTab === 'details') await DataTable.sync();
+                return;
+            }
+            const previous = this.views[name]?.snapshot.etag;
+            const view = this.storeView(name, await ApiService.getView(name));
+            if (view.snapshot.etag !== previous) this.renderCurrentTab();
         } catch (error) {
             console.error('Refresh failed:', error);
         }
     }
 
     // Tab Rendering
-    renderCurrentTab() {
-        if (!this.data) return;
+    async renderCurrentTab() {
+        const tab = this.activeTab;
         const container = document.getElementById('tab-content');
-        switch (this.activeTab) {
-            case 'stock-overview': this.renderStockOverview(container); break;
-            case 'kpis': this.renderKPIMetrics(container); break;
-            case 'analytics': this.renderAnalytics(container); break;
-            case 'forecasting': this.renderForecasting(container); break;
+        let view;
+        try {
+            view = await this.loadView(tab);
+        } catch (error) {
+            this.showError('Failed to load dashboard data');
+            return;
+        }
+        if (tab !== this.activeTab) return;  // Navigated away while loading
+
+        switch (tab) {
+            case 'stock-overview': this.renderStockOverview(container, view); break;
+            case 'kpis': this.renderKPIMetrics(container, view); break;
+            case 'analytics': this.renderAnalytics(container, view); break;
+            case 'forecasting': this.renderForecasting(container, view); break;
             case 'details': this.renderDetails(container); break;
         }
     }
 
     // ===== STOCK OVERVIEW TAB =====
-    renderStockOverview(container) {
-        const { stock } = this.data;
-        const stats = this.calculateStats(stock);
+    renderStockOverview(container, view) {
+        const { stats } = view;
 
         container.innerHTML = `
             ${Components.section('📦 Quick Stats', `
                 <div class="kpi-row">
-                    ${Components.quickStatCard('Total Products', stock.length, `${stats.totalQuantity.toLocaleString()} Units`, '📦', '#58a6ff')}
-                    ${Components.quickStatCard('Total Value', `$${stats.totalValue.toLocaleString()}`, `Avg: $${Math.round(stats.totalValue / stock.length).toLocaleString()}`, '💰', '#3fb950')}
-                    ${Components.quickStatCard('Low Stock Items', stats.lowStockCount, `${stats.criticalCount} Critical`, '⚠️', '#d29922')}
+                    ${Components.quickStatCard('Total Products', stats.total_products, `${stats.total_quantity.toLocaleString()} Units`, '📦', '#58a6ff')}
+                    ${Components.quickStatCard('Total Value', `$${stats.total_value.toLocaleString()}`, `Avg: $${Math.round(stats.total_value / stats.total_products).toLocaleString()}`, '💰', '#3fb950')}
+                    ${Components.quickStatCard('Low Stock Items', stats.low_stock_count, `${stats.critical_count} Critical`, '⚠️', '#d29922')}
                     ${Components.quickStatCard('Warehouses', stats.warehouses, `${stats.suppliers} Suppliers`, '🏢', '#58a6ff')}
                 </div>
             `)}
@@ -117,27 +186,16 @@ class StockDashboardApp {
         `;
 
         setTimeout(() => {
-            ChartRenderer.renderStockStatus('chart-stock-status', stock);
-            ChartRenderer.renderCategory('chart-category', stock);
-            ChartRenderer.renderWarehouse('chart-warehouse', stock);
-            ChartRenderer.renderTopProducts('chart-top-products', stock);
+            ChartRenderer.renderStockStatus('chart-stock-status', view.status_counts);
+            ChartRenderer.renderCategory('chart-category', view.quantity_by_category);
+            ChartRenderer.renderWarehouse('chart-warehouse', view.value_by_warehouse);
+            ChartRenderer.renderTopProducts('chart-top-products', view.top_products);
         }, 0);
     }
 
-    calculateStats(stock) {
-        return {
-            lowStockCount: stock.filter(s => s.Stock_Status === 'Low' || s.Stock_Status === 'Critical').length,
-            criticalCount: stock.filter(s => s.Stock_Status === 'Critical').length,
-            totalValue: stock.reduce((sum, s) => sum + (parseFloat(s.Total_Value) || 0), 0),
-            totalQuantity: stock.reduce((sum, s) => sum + (parseFloat(s.Quantity) || 0), 0),
-            warehouses: [...new Set(stock.map(s => s.Warehouse))].length,
-            suppliers: [...new Set(stock.map(s => s.Supplier))].length
-        };
-    }
-
     // ===== KPI METRICS TAB =====
-    renderKPIMetrics(container) {
-        const { kpis } = this.data;
+    renderKPIMetrics(container, view) {
+        const { kpis } = view;
 
         container.innerHTML = `
             ${Components.section('💰 Financial KPIs', `
@@ -184,17 +242,16 @@ class StockDashboardApp {
 
         // Add KPI card click handlers
         document.querySelectorAll('.kpi-card').forEach(card => {
-            card.addEventListener('click', () => KpiModal.show(card.dataset.kpiId, this.data));
+            card.addEventListener('click', () => KpiModal.show(card.dataset.kpiId, view.totals));
         });
 
         setTimeout(() => ChartRenderer.renderCarryingCost('chart-carrying-cost', kpis.carrying_cost), 0);
     }
 
     // ===== ANALYTICS TAB =====
-    renderAnalytics(container) {
-        const { kpis, transactions } = this.data;
-        const abc = kpis.abc_analysis || {};
-        const valuation = kpis.inventory_valuation || {};
+    renderAnalytics(container, view) {
+        const abc = view.abc_analysis || {};
+        const valuation = view.inventory_valuation || {};
 
         container.innerHTML = `
             ${Components.section('📊 ABC Analysis', `
@@ -223,17 +280,14 @@ class StockDashboardApp {
         `;
 
         setTimeout(() => {
-            ChartRenderer.renderSupplierPerformance('chart-supplier-performance', kpis.supplier_performance);
-            ChartRenderer.renderAging('chart-aging-count', 'chart-aging-value', kpis.item_aging);
-            ChartRenderer.renderTrends('chart-trends', transactions);
+            ChartRenderer.renderSupplierPerformance('chart-supplier-performance', view.supplier_performance);
+            ChartRenderer.renderAging('chart-aging-count', 'chart-aging-value', view.item_aging);
+            ChartRenderer.renderTrends('chart-trends', view.transaction_trends);
         }, 0);
     }
 
     // ===== DETAILS TAB =====
     renderDetails(container) {
-        const { stock } = this.data;
-        const warehouses = [...new Set(stock.map(s => s.Warehouse))];
-
         container.innerHTML = `
             ${Components.section('📋 Detailed Stock Inventory', `
                 <div class="table-controls">
@@ -247,7 +301,6 @@ class StockDashboardApp {
                     </select>
                     <select id="warehouse-filter" class="table-filter">
                         <option value="">All Warehouses</option>
-                        ${warehouses.map(w => `<option value="${w}">${w}</option>`).join('')}
                     </select>
                     <button id="export-btn" class="export-btn">📥 Export CSV</button>
                 </div>
@@ -255,7 +308,7 @@ class StockDashboardApp {
                     <table id="stock-table" class="data-table">
                         <thead>
                             <tr>
-                                <th data-sort="SKU">SKU ↕</th>
+                                <th data-sort="sku">SKU ↕</th>
                                 <th data-sort="Product">Product ↕</th>
                                 <th data-sort="Category">Category ↕</th>
                                 <th data-sort="Quantity">Quantity ↕</th>
@@ -267,20 +320,21 @@ class StockDashboardApp {
                                 <th data-sort="Supplier">Supplier ↕</th>
                             </tr>
                         </thead>
-                        <tbody id="table-body">${DataTable.renderRows(stock)}</tbody>
+                        <tbody id="table-body"></tbody>
                     </table>
                 </div>
-                <p class="table-info">Showing ${stock.length} products</p>
+                <p class="table-info">Loading products...</p>
+                <button id="load-more-btn" class="export-btn" style="display: none;">Load more</button>
             `)}
         `;
 
-        DataTable.setupInteractions(stock, 'table-body', '.table-info');
+        DataTable.setupInteractions('table-body', '.table-info')
+            .catch(() => this.showError('Failed to load stock table'));
     }
 
     // ===== FORECASTING TAB =====
-    renderForecasting(container) {
-        const { stock } = this.data;
-        const products = stock.map(s => ({ id: s.SKU || s.Product_ID, name: s.Product }));
+    renderForecasting(container, view) {
+        const { products } = view;
 
         container.innerHTML = `
             ${Components.section('🔮 Demand Forecasting', `
@@ -309,6 +363,8 @@ class StockDashboardApp {
                             <option value="simple">Simple Moving Avg</option>
                             <option value="xgboost">XGBoost</option>
                             <option value="prophet">Prophet</option>
+                            <option value="sba">Croston/SBA (Intermittent)</option>
+                            <option value="tsb">TSB (Very Sparse)</option>
                         </select>
                     </div>
                     <button id="generate-forecast" class="export-btn">🔮 Generate Forecast</button>
@@ -342,7 +398,7 @@ class StockDashboardApp {
                 <div class="info-grid">
                     <div class="info-card">
                         <h4>🤖 Auto Model</h4>
-                        <p>Automatically selects the best model based on your data size and patterns.</p>
+                        <p>Automatically selects the best model based on your data size and demand patterns. Sporadic sellers use intermittent-demand models.</p>
                     </div>
                     <div class="info-card">
                         <h4>📊 Simple Moving Average</h4>
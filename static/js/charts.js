@@ -20,12 +20,7 @@ const ChartRenderer = {
   },
 
   // Stock Overview Charts
-  renderStockStatus(elementId, stock) {
-    const statusCounts = {};
-    stock.forEach(item => {
-      statusCounts[item.Stock_Status || 'Unknown'] = (statusCounts[item.Stock_Status] || 0) + 1;
-    });
-
+  renderStockStatus(elementId, statusCounts) {
     const colorMap = {
       'Overstocked': this.colors.success,
       'Adequate': this.colors.primary,
@@ -45,12 +40,7 @@ const ChartRenderer = {
     }, { responsive: true });
   },
 
-  renderCategory(elementId, stock) {
-    const catTotals = {};
-    stock.forEach(item => {
-      catTotals[item.Category || 'Unknown'] = (catTotals[item.Category] || 0) + (parseFloat(item.Quantity) || 0);
-    });
-
+  renderCategory(elementId, catTotals) {
     Plotly.newPlot(elementId, [{
       x: Object.keys(catTotals),
       y: Object.values(catTotals),
@@ -62,12 +52,7 @@ const ChartRenderer = {
     }, { responsive: true });
   },
 
-  renderWarehouse(elementId, stock) {
-    const whTotals = {};
-    stock.forEach(item => {
-      whTotals[item.Warehouse || 'Unknown'] = (whTotals[item.Warehouse] || 0) + (parseFloat(item.Total_Value) || 0);
-    });
-
+  renderWarehouse(elementId, whTotals) {
     Plotly.newPlot(elementId, [{
       x: Object.keys(whTotals),
       y: Object.values(whTotals),
@@ -79,9 +64,7 @@ const ChartRenderer = {
     }, { responsive: true });
   },
 
-  renderTopProducts(elementId, stock) {
-    const sorted = [...stock].sort((a, b) => (b.Total_Value || 0) - (a.Total_Value || 0)).slice(0, 10);
-
+  renderTopProducts(elementId, sorted) {
     Plotly.newPlot(elementId, [{
       y: sorted.map(p => p.Product),
       x: sorted.map(p => p.Total_Value),
@@ -168,13 +151,7 @@ const ChartRenderer = {
     }
   },
 
-  renderTrends(elementId, transactions) {
-    const dates = {};
-    transactions.forEach(t => {
-      const date = t.Date?.split('T')[0] || t.Date?.split(' ')[0] || 'Unknown';
-      dates[date] = (dates[date] || 0) + (parseFloat(t.Total_Value) || 0);
-    });
-
+  renderTrends(elementId, dates) {
     const sortedDates = Object.keys(dates).sort();
     Plotly.newPlot(elementId, [{
       x: sortedDates,
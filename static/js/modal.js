@@ -2,10 +2,13 @@
 // static/js/modal.js
 
 const KpiModal = {
-  // Show modal with KPI details
-  async show(kpiId, data) {
+  // Show modal with KPI details (totals: { total_items, total_value } of the KPI view)
+  async show(kpiId, totals) {
     try {
-      const kpiData = await ApiService.getKpiDetails(kpiId);
+      const [kpiData, related] = await Promise.all([
+        ApiService.getKpiDetails(kpiId),
+        this.fetchRelatedProducts(kpiId)
+      ]);
       const modal = document.getElementById('kpi-modal');
       const content = document.getElementById('kpi-modal-content');
 
@@ -28,7 +31,7 @@ const KpiModal = {
                         </div>
                     ` : ''}
 
-                    ${this.renderCalculationSteps(kpiId, kpiData, data)}
+                    ${this.renderCalculationSteps(kpiId, kpiData, totals)}
 
                     ${kpiData.interpretation ? `
                         <div class="modal-section">
@@ -44,7 +47,7 @@ const KpiModal = {
                         </div>
                     ` : ''}
 
-                    ${this.renderRelatedProducts(kpiId, data?.stock || [])}
+                    ${this.renderRelatedProducts(related)}
                 </div>
             `;
 
@@ -77,10 +80,9 @@ const KpiModal = {
   },
 
   // Render calculation steps
-  renderCalculationSteps(kpiId, kpiData, data) {
-    const stock = data?.stock || [];
-    const totalValue = stock.reduce((sum, s) => sum + (parseFloat(s.Total_Value) || 0), 0);
-    const totalItems = stock.length;
+  renderCalculationSteps(kpiId, kpiData, totals) {
+    const totalValue = totals?.total_value || 0;
+    const totalItems = totals?.total_items || 0;
 
     const stepsMap = {
       'inventory_turnover': [
@@ -112,18 +114,22 @@ const KpiModal = {
         `;
   },
 
-  // Render related products table
-  renderRelatedProducts(kpiId, stock) {
-    let products = [];
+  // Fetch the products shown under a KPI
+  async fetchRelatedProducts(kpiId) {
+    if (kpiId === 'dead_stock_percentage') {
+      return (await ApiService.getKpiProducts(kpiId, { limit: 5 })).data;
+    }
 
+    let params = { sort: '-Total_Value' };
     if (kpiId === 'stockout_rate' || kpiId === 'backorder_rate') {
-      products = stock.filter(s => s.Stock_Status === 'Critical' || s.Stock_Status === 'Low').slice(0, 5);
-    } else if (kpiId === 'dead_stock_percentage') {
-      products = stock.filter(s => s.Stock_Status === 'Overstocked').slice(0, 5);
-    } else {
-      products = [...stock].sort((a, b) => (b.Total_Value || 0) - (a.Total_Value || 0)).slice(0, 5);
+      params = { status: 'Critical,Low' };
     }
 
+    return (await ApiService.queryStock({ ...params, limit: 5 })).data;
+  },
+
+  // Render related products table
+  renderRelatedProducts(products) {
     if (products.length === 0) return '';
 
     return `
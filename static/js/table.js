@@ -2,6 +2,13 @@
 // static/js/table.js
 
 const DataTable = {
+  live: null,  // Delta sync of the table set up last
+
+  // Bring the details table up to the current snapshot
+  sync() {
+    return this.live ? this.live() : Promise.resolve();
+  },
+
   // Render table rows
   renderRows(data) {
     return data.map(row => {
@@ -10,7 +17,7 @@ const DataTable = {
           row.Stock_Status === 'Overstocked' ? 'status-overstocked' : '';
       return `
                 <tr class="${statusClass}">
-                    <td>${row.SKU || '-'}</td>
+                    <td>${row.sku || '-'}</td>
                     <td>${row.Product || '-'}</td>
                     <td>${row.Category || '-'}</td>
                     <td>${row.Quantity || 0}</td>
@@ -25,53 +32,137 @@ const DataTable = {
     }).join('');
   },
 
-  // Setup table interactions (filter, sort, export)
-  setupInteractions(stock, tbodyId, infoSelector) {
+  // Setup table interactions: search, filters, sort and paging run on the server
+  setupInteractions(tbodyId, infoSelector, pageSize = 100) {
     const search = document.getElementById('table-search');
     const statusFilter = document.getElementById('status-filter');
     const warehouseFilter = document.getElementById('warehouse-filter');
     const exportBtn = document.getElementById('export-btn');
+    const moreBtn = document.getElementById('load-more-btn');
     const tbody = document.getElementById(tbodyId);
+    const sort = [];  // [[column, ascending]], shift-click adds secondary columns
+    let rows = [];
+    let total = 0;
+    let etag = null;  // Snapshot the loaded rows are from
+    let nextCursor = null;
+    let request = 0;
+    let debounce = null;
 
-    const filterTable = () => {
-      const searchTerm = search?.value.toLowerCase() || '';
-      const statusVal = statusFilter?.value || '';
-      const warehouseVal = warehouseFilter?.value || '';
-
-      const filtered = stock.filter(row => {
-        const matchSearch = !searchTerm ||
-          row.Product?.toLowerCase().includes(searchTerm) ||
-          row.SKU?.toLowerCase().includes(searchTerm) ||
-          row.Category?.toLowerCase().includes(searchTerm);
-        const matchStatus = !statusVal || row.Stock_Status === statusVal;
-        const matchWarehouse = !warehouseVal || row.Warehouse === warehouseVal;
-        return matchSearch && matchStatus && matchWarehouse;
-      });
+    const params = () => ({
+      q: search?.value.trim() || '',
+      status: statusFilter?.value || '',
+      warehouse: warehouseFilter?.value || '',
+      sort: sort.map(([column, asc]) => (asc ? column : `-${column}`)).join(','),
+      limit: pageSize
+    });
 
-      tbody.innerHTML = this.renderRows(filtered);
+    const render = () => {
+      tbody.innerHTML = this.renderRows(rows);
+      if (moreBtn) moreBtn.style.display = nextCursor ? '' : 'none';
       const infoEl = document.querySelector(infoSelector);
-      if (infoEl) infoEl.textContent = `Showing ${filtered.length} of ${stock.length} products`;
+      if (infoEl) infoEl.textContent = `Showing ${rows.length} of ${total} products`;
+    };
+
+    const load = async (append = false, limit = pageSize) => {
+      const current = ++request;
+      const result = await ApiService.queryStock({ ...params(), limit, cursor: append ? nextCursor : '', facets: !warehouseFilter?.dataset.loaded });
+      if (current !== request) return;  // A newer query is already on its way
+
+      if (result.facets && warehouseFilter) {
+        warehouseFilter.insertAdjacentHTML('beforeend', result.facets.warehouse.map(w => `<option value="${w}">${w}</option>`).join(''));
+        warehouseFilter.dataset.loaded = 'true';
+      }
+      rows = append ? rows.concat(result.data) : result.data;
+      total = result.total;
+      nextCursor = result.next_cursor;
+      // Appended pages may be newer; the earlier rows catch up through the delta
+      const stale = append && etag && result.snapshot.etag !== etag;
+      if (!append) etag = result.snapshot.etag;
+      render();
+      if (stale) sync();
+    };
+
+    // Whether a row passes the current search and filters (as the server matches them)
+    const matches = (row) => {
+      const { q, status, warehouse } = params();
+      return (!status || row.Stock_Status === status) && (!warehouse || row.Warehouse === warehouse) &&
+        (!q || ['Product', 'sku', 'Category'].some(c => String(row[c] ?? '').toLowerCase().includes(q.toLowerCase())));
     };
 
-    search?.addEventListener('input', filterTable);
-    statusFilter?.addEventListener('change', filterTable);
-    warehouseFilter?.addEventListener('change', filterTable);
+    // Apply the stock changes since the loaded snapshot to the loaded rows. Rows
+    // are replaced or removed in place; changes that can move rows, or reach
+    // rows beyond the loaded pages, refetch the loaded range in server order.
+    const sync = async () => {
+      if (!etag) return;
+      const current = request;
+      const delta = await ApiService.getDashboardDelta(etag);
+      if (current !== request || delta.snapshot.etag === etag) return;
+
+      const changes = delta.full ? null : delta.tables.stock;
+      let refetch = !changes;
+      if (changes) {
+        const keyOf = row => changes.key.map(column => String(row[column])).join('|');
+        const loaded = new Map(rows.map((row, i) => [keyOf(row), i]));
+        const columns = [...sort.map(([column]) => column), ...changes.key, 'Stock_Status', 'Product', 'sku', 'Category'];
+        const complete = !nextCursor;  // Every matching row is loaded
+
+        refetch = changes.inserts.some(row => !complete || matches(row)) ||
+          changes.deletes.some(key => !loaded.has(key) && !complete) ||
+          changes.updates.some(row => {
+            const i = loaded.get(keyOf(row));
+            if (i === undefined) return !complete || matches(row);
+            return columns.some(column => String(row[column]) !== String(rows[i][column]));
+          });
+
+        if (!refetch) {
+          changes.updates.forEach(row => {
+            const i = loaded.get(keyOf(row));
+            if (i !== undefined) rows[i] = row;
+          });
+          const deleted = new Set(changes.deletes.filter(key => loaded.has(key)));
+          rows = rows.filter(row => !deleted.has(keyOf(row)));
+          total -= deleted.size;
+          etag = delta.snapshot.etag;
+          render();
+        }
+      }
+      if (refetch) await load(false, Math.min(Math.max(rows.length, pageSize), 1000));
+    };
+    this.live = sync;
 
-    // Sorting
+    search?.addEventListener('input', () => {
+      clearTimeout(debounce);
+      debounce = setTimeout(() => load(), 250);
+    });
+    statusFilter?.addEventListener('change', () => load());
+    warehouseFilter?.addEventListener('change', () => load());
+    moreBtn?.addEventListener('click', () => load(true));
+
+    // Sorting: click toggles direction, shift-click adds a secondary sort column
     document.querySelectorAll('th[data-sort]').forEach(th => {
-      th.addEventListener('click', () => {
+      th.addEventListener('click', (e) => {
         const field = th.dataset.sort;
-        const sorted = [...stock].sort((a, b) => {
-          const aVal = a[field] || '';
-          const bVal = b[field] || '';
-          return aVal > bVal ? 1 : -1;
-        });
-        tbody.innerHTML = this.renderRows(sorted);
+        const existing = sort.find(([column]) => column === field);
+        if (!e.shiftKey) sort.splice(0, sort.length, ...(existing ? [existing] : []));
+        if (existing) existing[1] = !existing[1];
+        else sort.push([field, true]);
+        load();
       });
     });
 
-    // Export
-    exportBtn?.addEventListener('click', () => this.exportToCSV(stock));
+    // Export all matching rows, page by page
+    exportBtn?.addEventListener('click', async () => {
+      const rows = [];
+      let cursor = '';
+      do {
+        const page = await ApiService.queryStock({ ...params(), limit: 1000, cursor });
+        rows.push(...page.data);
+        cursor = page.next_cursor;
+      } while (cursor);
+      this.exportToCSV(rows);
+    });
+
+    return load();
   },
 
   // Export to CSV
@@ -79,7 +170,7 @@ const DataTable = {
     const headers = ['SKU', 'Product', 'Category', 'Quantity', 'Reorder_Level', 'Unit_Price', 'Total_Value', 'Stock_Status', 'Warehouse', 'Supplier'];
     const csv = [headers.join(',')];
     data.forEach(row => {
-      csv.push(headers.map(h => `"${row[h] || ''}"`).join(','));
+      csv.push(headers.map(h => `"${(h === 'SKU' ? row.sku : row[h]) || ''}"`).join(','));
     });
     const blob = new Blob([csv.join('\n')], { type: 'text/csv' });
     const url = URL.createObjectURL(blob);
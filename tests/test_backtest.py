@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from src.forecasting.backtest import BacktestEngine, model_signature
+from src.forecasting.models import EnsembleModel, SimpleMovingAverage, XGBoostModel
+
+
+class CountingAverage(SimpleMovingAverage):
+    fits = 0
+
+    def fit(self, df: pd.DataFrame) -> None:
+        CountingAverage.fits += 1
+        super().fit(df)
+
+
+def _series(days: int) -> pd.DataFrame:
+    y = np.random.default_rng(0).poisson(20, 400)[:days]
+    return pd.DataFrame({'ds': pd.date_range('2024-01-01', periods=days), 'y': y})
+
+
+def test_ensemble_signature_includes_member_params():
+    tuned = EnsembleModel()
+    tuned.models['xgboost'] = XGBoostModel(max_depth=3)
+
+    assert model_signature(tuned) != model_signature(EnsembleModel())
+    assert model_signature(tuned.clone()) == model_signature(tuned)
+    assert tuned.clone().models['xgboost'].max_depth == 3
+
+
+def test_folds_are_anchored_to_calendar_days():
+    engine = BacktestEngine(n_folds=3, min_train_size=30)
+    data = _series(200)
+
+    folds = engine.get_folds(len(data), horizon=10, dates=data['ds'])
+    # Each window ends the day before a day number (since 1970-01-01) divisible by 10
+    for _, test_end in folds:
+        next_day = data['ds'].iloc[test_end - 1] + pd.Timedelta(days=1)
+        assert (next_day - pd.Timestamp('1970-01-01')).days % 10 == 0
+    assert len(data) - folds[-1][1] < 10
+
+    longer = _series(201)
+    assert engine.get_folds(len(longer), horizon=10, dates=longer['ds']) == folds
+
+
+def test_appended_day_reuses_fold_models():
+    engine = BacktestEngine(n_folds=3, min_train_size=30)
+    model = CountingAverage(window=7)
+
+    CountingAverage.fits = 0
+    first = engine.evaluate(model, _series(200), horizon=10)
+    assert CountingAverage.fits == 3
+
+    second = engine.evaluate(model, _series(201), horizon=10)
+    assert CountingAverage.fits == 3
+    assert second['fold_metrics'] == first['fold_metrics']
@@ -0,0 +1,78 @@
+import numpy as np
+
+from src.api.columnar import ColumnarTable
+from src.api.delta import DeltaHistory
+from src.api.snapshot import Snapshot
+
+
+def _snapshot(etag: str, quantities: dict) -> Snapshot:
+    stock = ColumnarTable({
+        'product_id': np.array(list(quantities), dtype=np.int64),
+        'Warehouse': np.array(['WH-A'] * len(quantities), dtype=object),
+        'Quantity': np.array(list(quantities.values()), dtype=np.int64)
+    })
+    return Snapshot({'stock': stock, 'kpis': {'etag': etag}, 'summary': {}}, 1, 0.0, etag=etag)
+
+
+def _apply(rows: dict, delta: dict) -> dict:
+    """Replay a delta onto key -> quantity as a client would"""
+    table = delta['tables']['stock']
+    rows = dict(rows)
+    for key in table['deletes']:
+        del rows[key]
+    for row in table['inserts'] + table['updates']:
+        rows[f"{row['product_id']}|{row['Warehouse']}"] = row['Quantity']
+    return rows
+
+
+STATES = {
+    'A': {1: 10, 2: 20},
+    'B': {1: 11, 2: 20},
+    'C': {1: 10, 3: 30},
+    'D': {1: 10, 2: 5, 3: 30},
+    'E': {2: 5, 3: 31}
+}
+
+
+def _rows(etag: str) -> dict:
+    return {f"{product_id}|WH-A": quantity for product_id, quantity in STATES[etag].items()}
+
+
+def _history(sequence, max_versions: int) -> DeltaHistory:
+    history = DeltaHistory(table_keys={'stock': ['product_id', 'Warehouse']}, max_versions=max_versions)
+    for etag in sequence:
+        history.record(_snapshot(etag, STATES[etag]))
+    return history
+
+
+def test_since_replays_to_current_state():
+    history = _history('ABCDE', max_versions=10)
+
+    for etag in 'ABCD':
+        delta = history.since(etag)
+        assert _apply(_rows(etag), delta) == _rows('E')
+        assert delta['kpis'] == {'etag': 'E'}
+    assert history.since('E') == {'tables': {'stock': {'key': ['product_id', 'Warehouse'],
+                                                       'inserts': [], 'updates': [], 'deletes': []}}}
+
+
+def test_since_unknown_or_evicted_version_needs_full_reload():
+    history = _history('ABCDE', max_versions=2)
+
+    assert history.since('A') is None
+    assert history.since('unknown') is None
+    assert _apply(_rows('C'), history.since('C')) == _rows('E')
+    assert [history.covers(etag) for etag in ['A', 'B', 'C', 'D', 'E', 'unknown']] == \
+        [False, False, True, True, True, False]
+
+
+def test_revisited_version_keeps_newest_link():
+    # A's link is replaced by A -> C and becomes the newest; the oldest link (B -> A) is evicted first
+    history = _history('ABACDE', max_versions=3)
+
+    assert history.since('B') is None
+    assert _apply(_rows('C'), history.since('C')) == _rows('E')
+
+    history = _history('ABACDE', max_versions=4)
+    assert _apply(_rows('B'), history.since('B')) == _rows('E')
+    assert _apply(_rows('A'), history.since('A')) == _rows('E')
@@ -0,0 +1,101 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from flask import Flask
+
+from src.forecasting import api as forecast_api
+from src.forecasting.cache import ForecastCache
+
+
+def _transactions(days: int = 60) -> pd.DataFrame:
+    """Daily sales of two products, shaped like the dashboard transactions table"""
+    rng = np.random.default_rng(0)
+    dates = pd.date_range('2024-01-01', periods=days)
+    return pd.concat([
+        pd.DataFrame({'Date': dates, 'product_id': product_id, 'Category': 'Tools',
+                      'Quantity': rng.poisson(10, days)})
+        for product_id in (5, 6)
+    ], ignore_index=True)
+
+
+def test_concurrent_identical_requests_compute_once():
+    cache = ForecastCache()
+    release = threading.Event()
+    calls, results = [], []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return 'forecast'
+
+    def request():
+        results.append(cache.get_or_compute(('5', 30), 'v1', compute))
+
+    threads = [threading.Thread(target=request) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while cache.stats()['coalesced'] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(source for _, source in results) == ['coalesced'] * 3 + ['computed']
+    assert cache.get_or_compute(('5', 30), 'v1', compute) == ('forecast', 'hit')
+
+
+def test_new_data_version_and_invalidate_drop_one_product():
+    cache = ForecastCache()
+    cache.get_or_compute(('5', 30), 'v1', lambda: 'a')
+    cache.get_or_compute(('5', 60), 'v1', lambda: 'b')
+    cache.get_or_compute(('6', 30), 'w1', lambda: 'c')
+
+    # New transactions for product 5 replace both of its entries
+    assert cache.get_or_compute(('5', 30), 'v2', lambda: 'a2') == ('a2', 'computed')
+    assert cache.stats()['entries'] == 2
+    assert cache.get_or_compute(('6', 30), 'w1', lambda: 'x') == ('c', 'hit')
+
+    assert cache.invalidate('6') == 1
+    assert cache.get_or_compute(('6', 30), 'w1', lambda: 'c2') == ('c2', 'computed')
+    assert cache.invalidate() == 2
+
+
+@pytest.fixture
+def client(monkeypatch):
+    cache = ForecastCache()
+    monkeypatch.setattr(forecast_api, 'forecast_cache', cache)
+    monkeypatch.setattr(forecast_api, '_load_transactions', _transactions)
+    app = Flask(__name__)
+    app.register_blueprint(forecast_api.forecast_bp)
+    return app.test_client(), cache
+
+
+def test_numeric_and_string_ids_share_cache_entries(client):
+    client, cache = client
+
+    sources = [
+        client.post('/api/forecast/demand', json=body).get_json()['data']['cache']
+        for body in ({'product_id': 5, 'periods': 7, 'model': 'simple'},
+                     {'product_id': '5', 'periods': '7', 'model': 'simple'},
+                     {'product_id': '5', 'periods': 7.0, 'model': 'simple'})
+    ]
+
+    assert sources == ['computed', 'hit', 'hit']
+    assert cache.stats()['entries'] == 1
+
+    removed = client.post('/api/forecast/cache/invalidate', json={'product_id': 5}).get_json()['data']['removed']
+    assert removed == 1
+    assert cache.stats()['entries'] == 0
+
+
+def test_invalid_periods_are_rejected(client):
+    client, _ = client
+
+    response = client.post('/api/forecast/demand', json={'product_id': 5, 'periods': 'soon'})
+
+    assert response.status_code == 400
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.forecasting.models import (CrostonModel, IntermittentDemandModel, SBAModel, TSBModel,
+                                    croston_batch, tsb_batch)
+
+
+def croston_loop(y, alpha):
+    """Textbook Croston recursion: level of size and interval updated on demand days"""
+    size = interval = None
+    days_since = 0
+    for value in y:
+        days_since += 1
+        if value > 0:
+            if size is None:
+                size, interval = value, days_since
+            else:
+                size += alpha * (value - size)
+                interval += alpha * (days_since - interval)
+            days_since = 0
+    return (np.nan, np.nan) if size is None else (size, interval)
+
+
+def tsb_loop(y, alpha, beta):
+    """Textbook TSB recursion initialized from the sample probability and mean size"""
+    demand = y > 0
+    probability = demand.mean()
+    size = y[demand].mean() if demand.any() else 0.0
+    for value in y:
+        probability += beta * ((value > 0) - probability)
+        if value > 0:
+            size += alpha * (value - size)
+    return probability, size
+
+
+def _series(seed, n_days=120, zero_ratio=0.8):
+    rng = np.random.default_rng(seed)
+    return np.where(rng.random(n_days) < zero_ratio, 0.0, rng.integers(1, 20, n_days).astype(float))
+
+
+SERIES = [_series(seed) for seed in range(5)] + [np.zeros(120), np.r_[np.zeros(119), 5.0], np.r_[7.0, np.zeros(119)]]
+
+
+@pytest.mark.parametrize('alpha', [0.1, 0.3])
+def test_croston_batch_matches_recursion(alpha):
+    size, interval = croston_batch(np.vstack(SERIES), alpha)
+
+    for row, y in enumerate(SERIES):
+        expected = croston_loop(y, alpha)
+        np.testing.assert_allclose([size[row], interval[row]], expected, equal_nan=True)
+
+
+@pytest.mark.parametrize('alpha,beta', [(0.1, 0.1), (0.2, 0.05)])
+def test_tsb_batch_matches_recursion(alpha, beta):
+    probability, size = tsb_batch(np.vstack(SERIES), alpha, beta)
+
+    for row, y in enumerate(SERIES):
+        np.testing.assert_allclose([probability[row], size[row]], tsb_loop(y, alpha, beta))
+
+
+def test_nan_padding_marks_days_outside_a_series():
+    short = SERIES[0][40:]
+    padded = np.r_[np.full(40, np.nan), short]
+
+    np.testing.assert_allclose(croston_batch(padded[None, :]), croston_batch(short[None, :]))
+    np.testing.assert_allclose(tsb_batch(padded[None, :]), tsb_batch(short[None, :]))
+
+
+@pytest.mark.parametrize('model_class', [CrostonModel, SBAModel, TSBModel])
+def test_fit_many_matches_individual_fits(model_class):
+    series = {
+        f"p{i}": pd.DataFrame({'ds': pd.date_range('2024-01-01', periods=len(y) - 10 * i) + pd.Timedelta(days=5 * i),
+                               'y': y[:len(y) - 10 * i]})
+        for i, y in enumerate(SERIES[:5])
+    }
+
+    fitted = model_class.fit_many(series)
+    for key, data in series.items():
+        model = model_class()
+        model.fit(data)
+        assert fitted[key].demand_rate == pytest.approx(model.demand_rate)
+        assert fitted[key].rmse == pytest.approx(model.rmse)
+        assert fitted[key].last_date == model.last_date
+
+
+def test_sba_corrects_croston_bias():
+    croston, sba = CrostonModel(alpha=0.2), SBAModel(alpha=0.2)
+    data = pd.DataFrame({'ds': pd.date_range('2024-01-01', periods=120), 'y': SERIES[1]})
+    croston.fit(data)
+    sba.fit(data)
+    assert sba.demand_rate == pytest.approx(0.9 * croston.demand_rate)
+
+
+def test_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        IntermittentDemandModel('base')
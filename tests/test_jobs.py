@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+
+from src.forecasting.jobs import ForecastJobQueue, QueueFullError
+
+
+def _wait(job, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    version = job.version
+    while not job.is_done and time.monotonic() < deadline:
+        version = job.wait_for_change(version, 0.1)
+    assert job.is_done
+    return job
+
+
+@pytest.fixture
+def gate():
+    """Event that blocking jobs wait on (released at teardown)"""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def test_identical_jobs_are_deduplicated_while_in_flight(gate):
+    queue = ForecastJobQueue(max_workers=1)
+    queue.register('forecast', lambda params, job: gate.wait(5) and {'product_id': params['product_id']})
+
+    first, created = queue.submit('forecast', {'product_id': 1})
+    second, duplicate = queue.submit('forecast', {'product_id': 1})
+    other, _ = queue.submit('forecast', {'product_id': 2})
+
+    assert created and not duplicate
+    assert second is first and other is not first
+
+    gate.set()
+    assert _wait(first).result == {'product_id': 1}
+    # Finished jobs no longer absorb submissions
+    third, created = queue.submit('forecast', {'product_id': 1})
+    assert created and third is not first
+    _wait(third)
+
+
+def test_full_queue_rejects_new_jobs(gate):
+    queue = ForecastJobQueue(max_workers=1, max_pending=2)
+    queue.register('forecast', lambda params, job: gate.wait(5))
+
+    queue.submit('forecast', {'product_id': 1})
+    queue.submit('forecast', {'product_id': 2})
+    with pytest.raises(QueueFullError):
+        queue.submit('forecast', {'product_id': 3})
+    with pytest.raises(ValueError):
+        queue.submit('unknown')
+
+
+def test_failed_job_reports_error():
+    queue = ForecastJobQueue(max_workers=1)
+
+    def fail(params, job):
+        raise RuntimeError('no data')
+
+    queue.register('forecast', fail)
+    job = _wait(queue.submit('forecast')[0])
+
+    assert job.status == 'failed' and job.error == 'no data'
+    assert job.finished_at is not None
+    assert queue.stats()['in_flight'] == 0
+
+
+def test_finished_jobs_expire_after_ttl(monkeypatch):
+    queue = ForecastJobQueue(max_workers=1, result_ttl=60)
+    queue.register('forecast', lambda params, job: {'ok': True})
+    job = _wait(queue.submit('forecast')[0])
+
+    assert queue.get(job.job_id) is job
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 61)
+    assert queue.get(job.job_id) is None
+    assert queue.stats()['jobs'] == 0
+
+
+def test_poll_while_job_finishes_never_fails(monkeypatch):
+    queue = ForecastJobQueue(max_workers=1, result_ttl=0)
+    queue.register('forecast', lambda params, job: {'ok': True})
+    clock, errors = time.time, []
+
+    def poll():
+        try:
+            queue.stats()
+        except Exception as e:
+            errors.append(e)
+
+    def time_with_poll():
+        # Poll from another thread whenever a worker reads the clock, i.e.
+        # when the job starts and in the middle of finishing it
+        if threading.current_thread().name.startswith('forecast-job'):
+            poller = threading.Thread(target=poll)
+            poller.start()
+            poller.join(0.2)
+        return clock()
+
+    monkeypatch.setattr(time, 'time', time_with_poll)
+    job = _wait(queue.submit('forecast')[0])
+    monkeypatch.setattr(time, 'time', clock)
+
+    assert job.status == 'completed' and job.finished_at is not None
+    assert errors == []
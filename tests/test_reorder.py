@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.forecasting.models import TSBModel
+from src.forecasting.reorder import demand_panel, fit_panel, last_complete_day, reorder_plan
+
+
+NOW = pd.Timestamp('2024-06-15 09:30')
+
+
+def _positions() -> pd.DataFrame:
+    """Stock positions shaped like DashboardDataAPI.get_reorder_positions()"""
+    return pd.DataFrame({
+        'product_id': [1, 1, 2],
+        'sku': ['SKU1', 'SKU1', 'SKU2'],
+        'Product': ['Drill', 'Drill', 'Saw'],
+        'Category': 'Tools',
+        'warehouse_id': [10, 20, 10],
+        'Warehouse': ['WH-A', 'WH-B', 'WH-A'],
+        'Quantity': [30.0, 500.0, 0.0],
+        'Reserved': [5.0, 0.0, 0.0],
+        'Unit_Price': [12.0, 12.0, 40.0],
+        'Supplier': 'Acme',
+        'Lead_Time': [4.0, np.nan, 9.0]
+    })
+
+
+def _steady_demand(days: int = 90, quantity: float = 5.0) -> pd.DataFrame:
+    """Daily sales of every position up to yesterday; nothing sold yet today"""
+    dates = pd.date_range(end=last_complete_day(NOW), periods=days)
+    return pd.concat([
+        pd.DataFrame({'product_id': product_id, 'warehouse_id': warehouse_id, 'Date': dates, 'Quantity': quantity})
+        for product_id, warehouse_id in [(1, 10), (1, 20), (2, 10)]
+    ], ignore_index=True)
+
+
+@pytest.fixture(autouse=True)
+def frozen_now(monkeypatch):
+    monkeypatch.setattr(pd.Timestamp, 'now', classmethod(lambda cls: NOW))
+
+
+def test_demand_panel_aligns_positions_and_days():
+    positions = _positions()
+    demand = pd.DataFrame({
+        'product_id': [1, 1, 1, 2, 3, 2],
+        'warehouse_id': [10, 10, 20, 10, 10, 10],
+        'Date': pd.to_datetime(['2024-06-14', '2024-06-14T18:00', '2024-06-10', '2024-06-12', '2024-06-14',
+                                '2024-06-01'], format='ISO8601'),
+        'Quantity': [2, 3, 7, 4, 100, 9]
+    })
+
+    Y = demand_panel(positions, demand, history_days=5, end_date=pd.Timestamp('2024-06-14'))
+
+    # Columns are 06-10 .. 06-14; unknown positions and days outside the window are dropped
+    assert Y.tolist() == [[0, 0, 0, 0, 5], [7, 0, 0, 0, 0], [0, 0, 4, 0, 0]]
+
+
+def test_default_history_ends_at_last_complete_day():
+    positions, demand = _positions(), _steady_demand()
+    assert last_complete_day() == pd.Timestamp('2024-06-14')
+
+    plan = reorder_plan(positions, demand, history_days=60)
+    today = reorder_plan(positions, demand, history_days=60, end_date=NOW)
+
+    # Steady demand keeps its rate; an empty partial day would pull it down
+    assert plan['avg_daily_demand'].tolist() == pytest.approx([5.0] * 3, abs=0.01)
+    assert (today['avg_daily_demand'] < plan['avg_daily_demand']).all()
+
+
+def test_reorder_math():
+    positions, demand = _positions(), _steady_demand()
+    Y, rates, rmse = fit_panel(positions, demand, 60, 'tsb', last_complete_day())
+    expected_rates, expected_rmse = TSBModel()._fit_rates(Y)
+    np.testing.assert_allclose(rates, expected_rates)
+    np.testing.assert_allclose(rmse, expected_rmse)
+
+    plan = reorder_plan(positions, demand, history_days=60, safety_stock_multiplier=1.5, review_days=14)
+
+    lead_time = np.array([4.0, 7.0, 9.0])  # Missing lead time -> default_lead_time
+    available = np.array([25.0, 500.0, 0.0])
+    reorder_point = rates * lead_time + rates * 1.5 * np.sqrt(lead_time)
+    assert plan['lead_time_days'].tolist() == lead_time.tolist()
+    assert plan['current_stock'].tolist() == available.tolist()
+    assert plan['reorder_point'].tolist() == np.round(reorder_point).tolist()
+    assert plan['should_reorder'].tolist() == [True, False, True]
+    assert plan['recommended_order_qty'].tolist() == [
+        np.ceil(reorder_point[0] - 25 + rates[0] * 14), 0.0, np.ceil(reorder_point[2] + rates[2] * 14)
+    ]
+    assert plan['days_until_stockout'].tolist() == [np.floor(25 / rates[0]), np.floor(500 / rates[1]), 0.0]
+    assert plan['status'].tolist() == ['reorder', 'ok', 'stockout']
+    assert plan['order_value'].tolist() == pytest.approx((plan['recommended_order_qty'] * [12, 12, 40]).tolist())
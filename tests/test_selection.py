@@ -0,0 +1,120 @@
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.forecasting import InventoryForecaster
+from src.forecasting.registry import ModelRegistry, get_model_registry
+from src.forecasting.predictor import build_model
+from src.forecasting.selection import CostAwareSelector, profile_key
+from src.forecasting.tuning import XGBoostTuner
+
+
+def _series(days: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'ds': pd.date_range('2024-01-01', periods=days), 'y': rng.poisson(20, days)})
+
+
+def _wait(selector: CostAwareSelector, data: pd.DataFrame) -> None:
+    for future in selector.submit([data]).values():
+        future.result()
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    registry = ModelRegistry(str(tmp_path / 'registry.json'))
+    monkeypatch.setattr(get_model_registry, 'instance', registry, raising=False)
+    return registry
+
+
+def test_unknown_profile_is_profiled_in_background(registry):
+    selector = CostAwareSelector(registry=registry, candidates=['simple', 'croston'])
+    data = _series(120)
+
+    name, info = selector.select(data, time_budget=1.0)
+    assert name is None
+    assert info['status'] == 'profiling'
+
+    _wait(selector, data)
+    name, info = selector.select(data, time_budget=1.0)
+    assert name in ('simple', 'croston')
+    assert info['profile'] == profile_key(data)
+
+
+def test_profile_without_candidates_is_not_profiled_again(registry, monkeypatch):
+    selector = CostAwareSelector(registry=registry, candidates=['simple'])
+    data = _series(3)  # too short for a holdout split
+
+    selector.select(data, time_budget=1.0)
+    _wait(selector, data)
+    key = f"{profile_key(data)}@{selector.configuration()}"
+    assert registry.get(CostAwareSelector.SECTION, key)['candidates'] == {}
+
+    monkeypatch.setattr(selector, 'profile', lambda series, build: pytest.fail('profiled again'))
+    name, info = selector.select(data, time_budget=1.0)
+    assert name is None
+    assert info['status'] == 'no_candidates'
+    assert selector.submit([data]) == {}
+
+
+def test_candidates_are_profiled_as_served(registry):
+    pytest.importorskip('xgboost')
+    days = 120
+    transactions = pd.DataFrame({
+        'Date': pd.date_range('2024-01-01', periods=days),
+        'product_id': 1,
+        'Category': 'Tools',
+        'Quantity': np.random.default_rng(0).poisson(20, days)
+    })
+    registry.set(XGBoostTuner.SECTION, 'Tools', {'params': {'max_depth': 3, 'n_estimators': 20}})
+
+    selector = CostAwareSelector(registry=registry, candidates=['xgboost'])
+    forecaster = InventoryForecaster(model_type='auto', time_budget=10.0, selector=selector)
+    data = forecaster.prepare_data(transactions, product_id=1)
+    forecaster.fit()
+    assert forecaster.selection['status'] == 'profiling'
+
+    # The background profile measured the tuned model, under its own configuration
+    tuned = partial(build_model, category='Tools')
+    for future in selector.submit([data], tuned).values():
+        future.result()
+    assert selector.configuration(tuned) != selector.configuration()
+    assert registry.get(CostAwareSelector.SECTION, f"{profile_key(data)}@{selector.configuration()}") is None
+
+    forecaster.fit()
+
+    assert forecaster.selection['model'] == 'xgboost'
+    assert forecaster.selection['configuration'] == selector.configuration(tuned)
+    assert forecaster.model.get_params()['max_depth'] == 3
+    assert forecaster.model.get_params()['n_estimators'] == 20
+
+    # Retuning the category invalidates the measurements
+    registry.set(XGBoostTuner.SECTION, 'Tools', {'params': {'max_depth': 4, 'n_estimators': 20}})
+    forecaster.fit()
+    assert forecaster.selection['status'] == 'profiling'
+
+
+def test_registries_sharing_a_file_write_concurrently(tmp_path):
+    import threading
+
+    path = str(tmp_path / 'registry.json')
+    registries = [ModelRegistry(path) for _ in range(2)]
+    errors = []
+
+    def write(registry, worker):
+        try:
+            for i in range(30):
+                registry.set('selection', f"{worker}-{i}", {'candidates': []})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(registry, worker)) for worker, registry in enumerate(registries)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [p.name for p in tmp_path.iterdir()] == ['registry.json']
+    assert ModelRegistry(path).get('selection', '0-29') or ModelRegistry(path).get('selection', '1-29')
@@ -0,0 +1,49 @@
+import os
+
+import numpy as np
+
+from src.api.columnar import ColumnarTable
+from src.api.shared_snapshot import CURRENT_FILE, SharedSnapshotReader, SnapshotPublisher
+from src.api.snapshot import Snapshot
+from src.api.views import ViewCache
+
+
+def _snapshot(version: int, quantity: int) -> Snapshot:
+    stock = ColumnarTable({'sku': np.array(['A', 'B'], dtype=object), 'Quantity': np.array([quantity, 1])})
+    return Snapshot({'stock': stock, 'kpis': {}}, version, 0.1, etag=f"etag{quantity}")
+
+
+def test_versions_keep_increasing_after_refresher_restart(tmp_path):
+    directory = str(tmp_path)
+    first = SnapshotPublisher(directory, keep=2)
+    for quantity in (1, 2, 3):
+        first.publish(_snapshot(quantity, quantity))
+
+    # A restarted refresher builds from version 1 again
+    restarted = SnapshotPublisher(directory, keep=2)
+    name = restarted.publish(_snapshot(1, 10))
+
+    assert name.startswith('v00000004-')
+    with open(os.path.join(directory, CURRENT_FILE)) as f:
+        assert f.read() == name
+    published = sorted(entry for entry in os.listdir(directory) if entry.startswith('v'))
+    assert published == ['v00000003-etag3', name]
+
+    reader = SharedSnapshotReader(directory, poll_interval=0)
+    assert reader.get().version == 4
+
+
+def test_view_cache_builds_once_per_snapshot_after_restart(tmp_path):
+    directory = str(tmp_path)
+    SnapshotPublisher(directory).publish(_snapshot(5, 1))
+    reader = SharedSnapshotReader(directory, poll_interval=0)
+    views = ViewCache()
+    builds = []
+
+    views.get('rows', reader.get(), lambda data: builds.append(1))
+    SnapshotPublisher(directory).publish(_snapshot(1, 2))
+    for _ in range(5):
+        views.get('rows', reader.get(), lambda data: builds.append(1))
+
+    assert len(builds) == 2
+    assert views.stats()['hits'] == 4
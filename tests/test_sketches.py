@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.forecasting.sketches import DemandSketchStore, TDigest
+
+
+QUANTILES = [0.01, 0.1, 0.5, 0.9, 0.95, 0.99]
+
+
+@pytest.mark.parametrize('values', [
+    np.random.default_rng(0).normal(50, 10, 100_000),
+    np.random.default_rng(1).exponential(5, 100_000)
+])
+def test_quantiles_within_rank_error(values):
+    digest = TDigest(compression=100)
+    for chunk in np.array_split(values, 37):
+        digest.add(chunk)
+
+    ordered = np.sort(values)
+    for q in QUANTILES:
+        rank = np.searchsorted(ordered, digest.quantile(q)) / len(values)
+        assert rank == pytest.approx(q, abs=0.005)
+    assert len(digest.means) <= 100
+    assert digest.mean == pytest.approx(values.mean())
+    assert digest.std == pytest.approx(values.std(ddof=1))
+
+
+def test_quantiles_of_count_data_within_one_unit():
+    values = np.random.default_rng(2).poisson(3, 100_000)
+    digest = TDigest(compression=100)
+    digest.add(values)
+
+    for q in QUANTILES:
+        assert abs(digest.quantile(q) - np.quantile(values, q)) <= 1
+
+
+def test_merged_and_restored_digests_match():
+    values = np.random.default_rng(3).gamma(2.0, 10.0, 50_000)
+    left, right, whole = TDigest(), TDigest(), TDigest()
+    left.add(values[:20_000])
+    right.add(values[20_000:])
+    whole.add(values)
+    left.merge(right)
+
+    restored = TDigest.from_dict(left.to_dict())
+    for q in QUANTILES:
+        exact = np.quantile(values, q)
+        assert left.quantile(q) == pytest.approx(exact, rel=0.05, abs=0.5)
+        assert restored.quantile(q) == pytest.approx(left.quantile(q), rel=1e-4)
+        assert whole.quantile(q) == pytest.approx(exact, rel=0.05, abs=0.5)
+    assert left.count == whole.count == len(values)
+
+
+def test_empty_digest():
+    assert np.isnan(TDigest().quantile(0.5))
+
+
+def _panel(days: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).poisson(4, (2, days)).astype(float)
+
+
+def test_sync_ingests_each_complete_day_once(tmp_path):
+    store = DemandSketchStore(path=str(tmp_path / 'sketches.json'), compression=50)
+    today = pd.Timestamp.now().normalize()
+    keys, lead_times = ['1:1', '2:1'], np.array([3, 5])
+
+    # The panel ends today; today is not complete yet
+    assert store.sync(keys, lead_times, _panel(30), today) == 2 * 29
+    assert store.sync(keys, lead_times, _panel(30), today) == 0
+    assert store.backlog_days(today) == 0
+    assert store.backlog_days(today + pd.Timedelta(days=10)) == 10
+    assert store.stats()['days_ingested'] == 2 * 29
+
+    restored = DemandSketchStore(path=str(tmp_path / 'sketches.json'))
+    assert restored.safety_stock(keys, 0.95, 3).tolist() == pytest.approx(store.safety_stock(keys, 0.95, 3).tolist())
+    assert np.isnan(store.safety_stock(['unknown'], 0.95)[0])
+
+
+def test_sync_after_gap_counts_missed_days(tmp_path):
+    store = DemandSketchStore(path=str(tmp_path / 'sketches.json'), compression=50)
+    today = pd.Timestamp.now().normalize()
+    store.sync(['1:1'], np.array([3]), _panel(10)[:1], today - pd.Timedelta(days=40), save=False)
+
+    # The later panel starts 20 days after the last ingested day
+    store.sync(['1:1'], np.array([3]), _panel(20)[:1], today, save=False)
+    assert store.missed_days == 20
+    assert store.stats()['days_ingested'] == 10 + 19
+
+
+def test_dashboard_build_backfills_days_since_last_sync(tmp_path, monkeypatch):
+    from src.api.data_api import DashboardDataAPI
+    from src.forecasting.sketches import get_demand_sketches
+
+    store = DemandSketchStore(path=str(tmp_path / 'sketches.json'), compression=50)
+    monkeypatch.setattr(get_demand_sketches, 'instance', store, raising=False)
+
+    positions = pd.DataFrame({'product_id': [1], 'warehouse_id': [1], 'Lead_Time': [3]})
+    requested = []
+
+    def daily_demand(days=90):
+        requested.append(days)
+        dates = pd.date_range(end=pd.Timestamp('2024-12-31'), periods=400)
+        return pd.DataFrame({'product_id': 1, 'warehouse_id': 1, 'Date': dates, 'Quantity': 2.0})
+
+    api = DashboardDataAPI()
+    monkeypatch.setattr(api, 'get_reorder_positions', lambda: positions)
+    monkeypatch.setattr(api, 'get_daily_demand', daily_demand)
+    def sync_on(day: str) -> int:
+        monkeypatch.setattr(pd.Timestamp, 'now', classmethod(lambda cls: pd.Timestamp(f"{day} 12:00")))
+        return api.sync_demand_sketches()
+
+    # The panel ends yesterday, so every fetched day is complete
+    assert sync_on('2024-06-01') == 90
+    assert sync_on('2024-06-01') == 0
+    assert requested == [90]
+
+    # 200 days later: the whole gap is fetched and ingested
+    assert sync_on('2024-12-18') == 200
+    assert requested[-1] == 200
+    assert store.missed_days == 0
+
+
+def test_concurrent_saves_leave_one_complete_file(tmp_path):
+    import threading
+
+    path = tmp_path / 'sketches.json'
+    stores = [DemandSketchStore(path=str(path), compression=50) for _ in range(2)]
+    for store in stores:
+        store.sync(['1|WH-A', '2|WH-A'], np.array([3, 5]), _panel(30), pd.Timestamp('2024-01-30'), save=False)
+    errors = []
+
+    def save(store):
+        try:
+            for _ in range(20):
+                store.save()
+        except Exception as e:
+            errors.append(e)
+
+    # Two threads per store (one process) and two stores (like two workers) on one path
+    threads = [threading.Thread(target=save, args=(store,)) for store in stores for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [p.name for p in tmp_path.iterdir()] == ['sketches.json']
+    assert DemandSketchStore(path=str(path)).stats()['days_ingested'] == 2 * 30
+
+
+def test_product_reorder_endpoint_uses_position_sketch(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    from flask import Flask
+
+    from src.api.columnar import ColumnarTable
+    from src.forecasting import api as forecast_api
+    from src.forecasting.sketches import get_demand_sketches
+
+    # Product 5 sells a steady 10 a day, but its sketch at warehouse 2 is bursty
+    store = DemandSketchStore(path=str(tmp_path / 'sketches.json'), compression=50)
+    bursty = np.where(np.arange(120) % 10 == 0, 100.0, 0.0)[None, :]
+    store.sync(['5:2'], np.array([7]), bursty, pd.Timestamp('2024-04-30'), save=False)
+    monkeypatch.setattr(get_demand_sketches, 'instance', store, raising=False)
+
+    transactions = pd.DataFrame({'Date': pd.date_range('2024-01-01', periods=120), 'product_id': 5,
+                                 'Category': 'Tools', 'Quantity': 10.0})
+    monkeypatch.setattr(forecast_api, 'data_api', SimpleNamespace(
+        get_dashboard_data=lambda: {'transactions': ColumnarTable.from_frame(transactions)}
+    ))
+    app = Flask(__name__)
+    app.register_blueprint(forecast_api.forecast_bp)
+    client = app.test_client()
+
+    def safety_stock(query: str) -> int:
+        response = client.get(f"/api/forecast/reorder/5?current_stock=20&{query}")
+        assert response.status_code == 200
+        return response.get_json()['data']['safety_stock']
+
+    assert safety_stock('service_level=0.95&warehouse_id=2') == round(store.safety_stock(['5:2'], 0.95, 7)[0])
+    assert safety_stock('service_level=0.95') == safety_stock('')
+    assert safety_stock('service_level=0.95&warehouse_id=9') == safety_stock('')
+    assert client.get('/api/forecast/reorder/5?current_stock=20&service_level=1.5').status_code == 400
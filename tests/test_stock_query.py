@@ -0,0 +1,124 @@
+import base64
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.api.columnar import ColumnarTable
+from src.api.stock_query import StockIndex, decode_cursor, encode_cursor, parse_sort, sort_keys
+
+
+def _stock(rows: int = 60, seed: int = 0) -> pd.DataFrame:
+    """Stock frame with heavy ties, nulls and dates, shaped like get_stock_summary()"""
+    rng = np.random.default_rng(seed)
+    restocked = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 5, rows), unit='D')
+    return pd.DataFrame({
+        'product_id': np.arange(rows) // 2,
+        'sku': [f"SKU{i // 2:03d}" for i in range(rows)],
+        'Product': [f"Prod {i // 2}" for i in range(rows)],
+        'Warehouse': np.where(np.arange(rows) % 2 == 0, 'WH-A', 'WH-B'),
+        'Quantity': rng.integers(0, 4, rows),
+        'Total_Value': np.round(rng.integers(0, 3, rows) * 12.5, 2),
+        'Category': rng.choice(['Food', 'Tools', None], rows),
+        'Last_Restocked': restocked.where(rng.random(rows) > 0.2),
+        'Stock_Status': rng.choice(['Critical', 'Low', 'Adequate'], rows)
+    })
+
+
+def _walk(index: StockIndex, limit: int, **kwargs) -> list:
+    """Row keys of every page, following next_cursor to the end"""
+    keys, cursor = [], None
+    while True:
+        page = index.query(limit=limit, cursor=cursor, **kwargs)
+        assert len(page['rows']) <= limit
+        keys += [(row['product_id'], row['Warehouse']) for row in page['rows']]
+        cursor = page['next_cursor']
+        if cursor is None:
+            return keys
+
+
+def _expected(frame: pd.DataFrame, sort) -> list:
+    """Row keys in pandas order (nulls last in either direction) for the full sort key"""
+    keys = sort_keys(sort)
+    ordered = frame.sort_values([c for c, _ in keys], ascending=[a for _, a in keys],
+                                kind='mergesort', na_position='last')
+    return list(zip(ordered['product_id'].tolist(), ordered['Warehouse'].tolist()))
+
+
+@pytest.mark.parametrize('sort', [
+    None,
+    '-Total_Value',
+    'Quantity,-Total_Value',
+    'Category,-Quantity',
+    '-Last_Restocked,Stock_Status',
+    'Last_Restocked'
+])
+@pytest.mark.parametrize('limit', [1, 7, 60, 100])
+def test_cursor_pages_cover_pandas_order(sort, limit):
+    frame = _stock()
+    index = StockIndex(ColumnarTable.from_frame(frame))
+
+    keys = _walk(index, limit, sort=parse_sort(sort))
+
+    assert keys == _expected(frame, parse_sort(sort))
+
+
+def test_cursor_pages_with_date_objects():
+    # Dates arrive from the database as datetime.date objects in an object column
+    frame = _stock()
+    dates = np.array([None if pd.isna(v) else v.date() for v in frame['Last_Restocked']], dtype=object)
+    table = ColumnarTable({**ColumnarTable.from_frame(frame.drop(columns='Last_Restocked')).columns,
+                           'Last_Restocked': dates})
+    sort = parse_sort('-Last_Restocked')
+
+    keys = _walk(StockIndex(table), 9, sort=sort)
+
+    assert keys == _expected(frame, sort)
+
+
+def test_cursor_pages_respect_search_and_filters():
+    frame = _stock()
+    index = StockIndex(ColumnarTable.from_frame(frame))
+    sort = parse_sort('-Quantity')
+
+    keys = _walk(index, 4, sort=sort, search='prod 1', filters={'warehouse': 'WH-B', 'status': 'Low,Critical'})
+
+    matching = frame[frame['Product'].str.lower().str.contains('prod 1')
+                     & (frame['Warehouse'] == 'WH-B')
+                     & frame['Stock_Status'].isin(['Low', 'Critical'])]
+    assert keys == _expected(matching, sort)
+    assert index.query(sort=sort, search='prod 1', filters={'warehouse': 'WH-B', 'status': 'Low,Critical'}
+                       )['total'] == len(matching)
+
+
+def test_cursor_resumes_after_row_is_removed():
+    # A cursor from an older snapshot whose last row no longer exists
+    frame = _stock()
+    sort = parse_sort('Total_Value')
+    first = StockIndex(ColumnarTable.from_frame(frame)).query(sort=sort, limit=10)
+    last = first['rows'][-1]
+
+    remaining = frame[~((frame['product_id'] == last['product_id']) & (frame['Warehouse'] == last['Warehouse']))]
+    second = StockIndex(ColumnarTable.from_frame(remaining.reset_index(drop=True)))
+    page = second.query(sort=sort, limit=10, cursor=first['next_cursor'])
+
+    expected = _expected(remaining, sort)
+    resume = expected.index(_expected(frame, sort)[10])
+    assert [(r['product_id'], r['Warehouse']) for r in page['rows']] == expected[resume:resume + 10]
+
+
+def test_invalid_cursors_and_sorts_are_rejected():
+    index = StockIndex(ColumnarTable.from_frame(_stock()))
+
+    with pytest.raises(ValueError):
+        index.query(cursor='not a cursor!')
+    with pytest.raises(ValueError):
+        index.query(cursor=encode_cursor(['SKU001']))
+    with pytest.raises(ValueError):
+        index.query(sort=parse_sort('Quantity'), cursor=encode_cursor(['many', 1, 'WH-A']))
+    with pytest.raises(ValueError):
+        index.query(filters={'colour': 'red'})
+    with pytest.raises(ValueError):
+        parse_sort('Quantity,password')
+    with pytest.raises(ValueError):
+        decode_cursor(base64.urlsafe_b64encode(b'{"sku": 1}').decode('ascii'))
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('xgboost')
+
+from src.forecasting import InventoryForecaster
+from src.forecasting.registry import ModelRegistry, get_model_registry
+from src.forecasting.tuning import XGBoostTuner
+
+
+def _transactions(days: int = 150) -> pd.DataFrame:
+    """Daily sales of two products in different categories, shaped like get_transaction_history()"""
+    rng = np.random.default_rng(0)
+    dates = pd.date_range('2024-01-01', periods=days)
+    frames = [
+        pd.DataFrame({
+            'transaction_id': np.arange(days) + offset,
+            'Date': dates,
+            'Type': 'Out',
+            'product_id': product_id,
+            'Product': name,
+            'Category': category,
+            'Quantity': rng.poisson(20, days)
+        })
+        for offset, (product_id, name, category) in enumerate([(1, 'Drill', 'Tools'), (2, 'Apple', 'Food')])
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    registry = ModelRegistry(str(tmp_path / 'registry.json'))
+    monkeypatch.setattr(get_model_registry, 'instance', registry, raising=False)
+    return registry
+
+
+def test_tuned_category_params_reach_fitted_model(registry):
+    transactions = _transactions()
+    tools = transactions[transactions['Category'] == 'Tools']
+    series = [InventoryForecaster().prepare_data(tools, product_id=1)]
+
+    tuner = XGBoostTuner(registry=registry, n_configs=3, min_rounds=10, max_rounds=30, max_workers=1)
+    result = tuner.tune('Tools', series, time_budget=60)
+
+    # Ids arrive as strings from request bodies and URLs
+    forecaster = InventoryForecaster(model_type='xgboost')
+    forecaster.prepare_data(transactions, product_id='1')
+    forecaster.fit()
+
+    assert forecaster.category == 'Tools'
+    params = forecaster.model.get_params()
+    for name, value in result['params'].items():
+        assert params[name] == value
+
+
+def test_untuned_category_uses_defaults(registry):
+    registry.set(XGBoostTuner.SECTION, 'Tools', {'params': {'max_depth': 3, 'n_estimators': 7}})
+
+    forecaster = InventoryForecaster(model_type='xgboost')
+    forecaster.prepare_data(_transactions(), product_id=2)
+    forecaster.fit()
+
+    assert forecaster.category == 'Food'
+    assert forecaster.model.get_params()['max_depth'] == 6
+
+
+def test_search_stops_running_trials_at_budget(registry):
+    import threading
+    import time
+
+    series = [InventoryForecaster().prepare_data(_transactions(400), product_id=product_id)
+              for product_id in (1, 2)]
+    tuner = XGBoostTuner(registry=registry, n_configs=4, min_rounds=50000, max_rounds=100000,
+                         eta=2, early_stopping_rounds=100000, max_workers=2)
+
+    # Each first-rung trial needs far longer than the budget
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        tuner.search(series, time_budget=1.0)
+
+    assert time.perf_counter() - start < 3.0
+    assert not [t for t in threading.enumerate() if t.name.startswith('xgb-tune')]